@@ -120,6 +120,7 @@ class TensorBlock:
 
         self._cached_dtype = data.array_dtype(values)
         self._cached_device = data.array_device(values)
+        self._cached_n_dimensions = len(values.shape)
 
         if not data.array_device_is_cpu(values):
             warnings.warn(
@@ -144,6 +145,7 @@ class TensorBlock:
         obj._actual_ptr = ptr
         obj._cached_dtype = None
         obj._cached_device = None
+        obj._cached_n_dimensions = None
         # keep a reference to the parent object (usually a TensorMap) to
         # prevent it from being garbage-collected & removing this block
         obj._parent = parent
@@ -293,7 +295,7 @@ class TensorBlock:
         The entries in these labels describe intermediate dimensions of the
         ``values`` array.
         """
-        n_components = len(self.values.shape) - 2
+        n_components = self._n_dimensions - 2
 
         result = []
         for axis in range(n_components):
@@ -310,9 +312,16 @@ class TensorBlock:
         ``values`` array. The properties are guaranteed to be the same for
         values and gradients in the same block.
         """
-        property_axis = len(self.values.shape) - 1
+        property_axis = self._n_dimensions - 1
         return self._labels(property_axis)
 
+    @property
+    def _n_dimensions(self) -> int:
+        """Get the number of dimensions of the values, without converting them"""
+        if self._cached_n_dimensions is None:
+            self._cached_n_dimensions = len(self.values.shape)
+        return self._cached_n_dimensions
+
     def _labels(self, axis) -> Labels:
         result = mts_labels_t()
         self._lib.mts_block_labels(self._ptr, axis, result)
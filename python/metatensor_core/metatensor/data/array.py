@@ -85,7 +85,7 @@ def array_dtype(array) -> DType:
 def array_change_dtype(array, dtype: DType):
     """Change the dtype of an array"""
     if _is_numpy_array(array):
-        return array.astype(dtype)
+        return array.astype(dtype, copy=False)
     elif _is_torch_array(array):
         return array.to(dtype=dtype)
     else:
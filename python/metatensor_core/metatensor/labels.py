@@ -458,6 +458,12 @@ class Labels:
                 f"can only compare between Labels for equality, got {type(other)}"
             )
 
+        if self._labels is not None and other._labels is not None:
+            # labels are shared between blocks and tensors without copies, so
+            # comparing with the same underlying labels is very common
+            if self._labels.internal_ptr_ == other._labels.internal_ptr_:
+                return True
+
         return (
             self._names == other._names
             and self.values.shape == other.values.shape
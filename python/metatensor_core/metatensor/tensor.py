@@ -1,6 +1,7 @@
 import copy
 import ctypes
 import pathlib
+import sys
 import warnings
 from pickle import PickleBuffer
 from typing import BinaryIO, Dict, List, Sequence, Union
@@ -256,16 +257,25 @@ class TensorMap:
     def __add__(self, other):
         from metatensor.operations import add
 
+        if _is_lazy_tensor_map(other):
+            return NotImplemented
+
         return add(self, other)
 
     def __sub__(self, other):
         from metatensor.operations import subtract
 
+        if _is_lazy_tensor_map(other):
+            return NotImplemented
+
         return subtract(self, other)
 
     def __mul__(self, other):
         from metatensor.operations import multiply
 
+        if _is_lazy_tensor_map(other):
+            return NotImplemented
+
         return multiply(self, other)
 
     def __matmul__(self, other):
@@ -276,6 +286,9 @@ class TensorMap:
     def __truediv__(self, other):
         from metatensor.operations import divide
 
+        if _is_lazy_tensor_map(other):
+            return NotImplemented
+
         return divide(self, other)
 
     def __pow__(self, other):
@@ -306,12 +319,15 @@ class TensorMap:
 
         :param index: index of the block to retrieve
         """
-        if index >= len(self):
+        return self._block_by_id(index, len(self))
+
+    def _block_by_id(self, index: int, n_blocks: int) -> TensorBlock:
+        if index >= n_blocks:
             # we need to raise IndexError to make sure TensorMap supports iterations
             # over blocks with `for block in tensor:` which calls `__getitem__` with
             # integers from 0 to whenever IndexError is raised.
             raise IndexError(
-                f"block index out of bounds: we have {len(self)} blocks but the "
+                f"block index out of bounds: we have {n_blocks} blocks but the "
                 f"index is {index}"
             )
 
@@ -325,7 +341,10 @@ class TensorMap:
 
         :param indices: indices of the block to retrieve
         """
-        return [self.block_by_id(i) for i in indices]
+        # only get the number of blocks once, instead of re-creating the keys for
+        # each block
+        n_blocks = len(self)
+        return [self._block_by_id(i, n_blocks) for i in indices]
 
     def blocks_matching(self, selection: Labels) -> List[int]:
         """
@@ -426,6 +445,18 @@ class TensorMap:
             return self.block(kwargs)
         elif isinstance(selection, int):
             return self.block_by_id(selection)
+        elif isinstance(selection, LabelsEntry) and selection.names == self.keys.names:
+            # a full key (for example when iterating over the keys of another
+            # TensorMap), look it up directly instead of going through all the keys
+            position = self.keys.position(selection)
+            if position is None:
+                if len(self.keys) == 0:
+                    raise ValueError("there are no blocks in this TensorMap")
+                else:
+                    raise ValueError(
+                        f"couldn't find any block matching {selection.print()}"
+                    )
+            return self.block_by_id(position)
         else:
             selection = _normalize_selection(selection)
 
@@ -705,6 +736,17 @@ class TensorMap:
         return TensorMap(self.keys, blocks)
 
 
+def _is_lazy_tensor_map(value) -> bool:
+    """
+    Check if ``value`` is a ``LazyTensorMap`` from metatensor-operations, which
+    implements the reflected arithmetic operators for expressions starting with a
+    :py:class:`TensorMap`.
+    """
+    operations = sys.modules.get("metatensor.operations")
+    lazy_class = getattr(operations, "LazyTensorMap", None)
+    return lazy_class is not None and isinstance(value, lazy_class)
+
+
 def _normalize_keys_to_move(keys_to_move: Union[str, Sequence[str], Labels]) -> Labels:
     if isinstance(keys_to_move, str):
         keys_to_move = (keys_to_move,)
@@ -421,6 +421,11 @@ def test_to():
     assert converted.dtype == np.float32
     assert converted.gradient("g").dtype == np.float32
 
+    # the data is not copied if the dtype does not change
+    converted = block.to(dtype=np.float64)
+    assert np.shares_memory(converted.values, block.values)
+    assert np.shares_memory(converted.gradient("g").values, block.gradient("g").values)
+
     # check that the code handles both positional and keyword arguments
     device = "cpu"
     moved = block.to(device, dtype=np.float32)
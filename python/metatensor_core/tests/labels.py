@@ -1,7 +1,7 @@
 import numpy as np
 import pytest
 
-from metatensor import Labels, MetatensorError
+from metatensor import Labels, MetatensorError, TensorBlock
 
 
 def test_constructor():
@@ -364,6 +364,19 @@ def test_eq():
     assert labels_1 != labels_3
     assert labels_1 != labels_4
 
+    # Labels sharing the same data, and views
+    block = TensorBlock(
+        values=np.zeros((2, 1)),
+        samples=labels_1,
+        components=[],
+        properties=Labels.range("p", 1),
+    )
+    assert block.samples == block.samples
+    assert block.samples == labels_2
+    assert block.samples != labels_3
+    assert labels_1.view("a") == labels_2.view("a")
+    assert labels_1.view("b") != labels_1.view("a")
+
     # LabelsEntry equality
     assert labels_1[0] == labels_1[0]
     assert labels_1[0] == labels_2[0]
@@ -151,6 +151,12 @@ def test_block(tensor):
     with pytest.raises(ValueError, match=msg):
         tensor.block(key_1=3)
 
+    # full key entry not in the tensor
+    entry = Labels(["key_1", "key_2"], np.array([[3, 0]]))[0]
+    msg = "couldn't find any block matching \\(key_1=3, key_2=0\\)"
+    with pytest.raises(ValueError, match=msg):
+        tensor.block(entry)
+
     # more than one block matching criteria
     msg = (
         "more than one block matched \\(key_2=0\\), use `TensorMap.blocks` "
@@ -7,15 +7,21 @@ __version__ = importlib.metadata.version("metatensor-operations")
 from ._utils import NotEqualError  # noqa
 from ._checks import checks_enabled, unsafe_disable_checks, unsafe_enable_checks  # noqa
 
-from .abs import abs  # noqa
-from .add import add  # noqa
+from .abs import abs, abs_  # noqa
+from .add import add, add_  # noqa
 from .allclose import (  # noqa
     allclose,
     allclose_block,
     allclose_block_raise,
     allclose_raise,
 )
+from .batched_dot import batched_dot  # noqa
 from .block_from_array import block_from_array  # noqa
+from .chunks import sample_chunks  # noqa
+from .components_to_properties import (  # noqa
+    components_to_properties,
+    properties_to_components,
+)
 from .detach import detach, detach_block  # noqa
 from .divide import divide  # noqa
 from .dot import dot  # noqa
@@ -34,7 +40,9 @@ from .is_contiguous import (  # noqa: F401
     is_contiguous_block,
 )
 from .join import join  # noqa
+from .lazy import LazyTensorMap, lazy  # noqa
 from .lstsq import lstsq  # noqa
+from .map_blocks import map_blocks, parallel_blocks  # noqa
 from .make_contiguous import (  # noqa: F401
     make_contiguous,
     make_contiguous_block,
@@ -46,11 +54,14 @@ from .manipulate_dimension import (  # noqa
     remove_dimension,
     rename_dimension,
 )
-from .multiply import multiply  # noqa
+from .multiply import multiply, multiply_  # noqa
 from .one_hot import one_hot  # noqa
 from .ones_like import ones_like, ones_like_block  # noqa
+from .online_reducer import OnlineReducer  # noqa
+from .pack import is_packed, pack, packed_to  # noqa
+from .plan import MetadataPlan  # noqa
 from .random_like import random_uniform_like, random_uniform_like_block  # noqa
-from .pow import pow  # noqa
+from .pow import pow, pow_  # noqa
 from .reduce_over_samples import (  # noqa
     mean_over_samples,
     mean_over_samples_block,
@@ -67,6 +78,6 @@ from .slice import slice, slice_block  # noqa
 from .solve import solve  # noqa
 from .sort import sort, sort_block  # noqa
 from .split import split, split_block  # noqa
-from .subtract import subtract  # noqa
+from .subtract import subtract, subtract_  # noqa
 from .unique_metadata import unique_metadata, unique_metadata_block  # noqa
 from .zeros_like import zeros_like, zeros_like_block  # noqa
@@ -1,10 +1,10 @@
 import re
 import warnings
-from typing import List, Optional, Tuple, Union
+from typing import List, Optional, Union
 
 import numpy as np
 
-from ._backend import torch_jit_is_scripting, torch_jit_script
+from ._backend import torch_jit_is_scripting
 
 
 def parse_version(version):
@@ -86,6 +86,20 @@ def abs(array):
         raise TypeError(UNKNOWN_ARRAY_TYPE)
 
 
+def abs_(array):
+    """
+    Replace the elements of the array by their absolute value, in-place.
+
+    It is equivalent of np.abs(array, out=array) and tensor.abs_()
+    """
+    if isinstance(array, TorchTensor):
+        return array.abs_()
+    elif isinstance(array, np.ndarray):
+        return np.abs(array, out=array)
+    else:
+        raise TypeError(UNKNOWN_ARRAY_TYPE)
+
+
 def all(a, axis: Optional[int] = None):
     """Test whether all array elements along a given axis evaluate to True.
 
@@ -105,6 +119,18 @@ def all(a, axis: Optional[int] = None):
         raise TypeError(UNKNOWN_ARRAY_TYPE)
 
 
+def _rows_per_chunk(shape: List[int]) -> int:
+    """
+    Number of entries along the first axis of an array with the given ``shape`` to
+    process together when comparing arrays chunk by chunk (around one million
+    elements at the time).
+    """
+    row_size = 1
+    for size in shape[1:]:
+        row_size *= size
+    return max(1, 1048576 // max(1, row_size))
+
+
 def allclose(
     a: TorchTensor,
     b: TorchTensor,
@@ -115,14 +141,85 @@ def allclose(
     """Compare two arrays using ``allclose``
 
     This function has the same behavior as
-    ``np.allclose(array1, array2, rtol, atol, equal_nan)``.
+    ``np.allclose(array1, array2, rtol, atol, equal_nan)``. Large arrays are compared
+    in chunks along the first axis, stopping at the first chunk with differences.
+    """
+    if isinstance(a, TorchTensor):
+        _check_all_torch_tensor([b])
+        if len(a.shape) == 0 or len(b.shape) == 0 or a.shape != b.shape:
+            return torch.allclose(a, b, rtol=rtol, atol=atol, equal_nan=equal_nan)
+
+        step = _rows_per_chunk(a.shape)
+        for start in range(0, a.shape[0], step):
+            if not torch.allclose(
+                a[start : start + step],
+                b[start : start + step],
+                rtol=rtol,
+                atol=atol,
+                equal_nan=equal_nan,
+            ):
+                return False
+        return True
+    elif isinstance(a, np.ndarray):
+        _check_all_np_ndarray([b])
+        if a.ndim == 0 or b.ndim == 0 or a.shape != b.shape:
+            return np.allclose(a, b, rtol=rtol, atol=atol, equal_nan=equal_nan)
+
+        step = _rows_per_chunk(list(a.shape))
+        for start in range(0, a.shape[0], step):
+            if not np.allclose(
+                a[start : start + step],
+                b[start : start + step],
+                rtol=rtol,
+                atol=atol,
+                equal_nan=equal_nan,
+            ):
+                return False
+        return True
+    else:
+        raise TypeError(UNKNOWN_ARRAY_TYPE)
+
+
+def array_equal(a, b) -> bool:
+    """Check if two arrays with the same shape have exactly the same values.
+
+    Large arrays are compared in chunks along the first axis, stopping at the first
+    chunk with differences.
     """
     if isinstance(a, TorchTensor):
         _check_all_torch_tensor([b])
-        return torch.allclose(a, b, rtol=rtol, atol=atol, equal_nan=equal_nan)
+        if len(a.shape) == 0:
+            return bool(torch.all(a == b))
+
+        step = _rows_per_chunk(a.shape)
+        for start in range(0, a.shape[0], step):
+            if not bool(torch.all(a[start : start + step] == b[start : start + step])):
+                return False
+        return True
     elif isinstance(a, np.ndarray):
         _check_all_np_ndarray([b])
-        return np.allclose(a, b, rtol=rtol, atol=atol, equal_nan=equal_nan)
+        if a.ndim == 0:
+            return bool(np.all(a == b))
+
+        step = _rows_per_chunk(list(a.shape))
+        for start in range(0, a.shape[0], step):
+            if not np.array_equal(a[start : start + step], b[start : start + step]):
+                return False
+        return True
+    else:
+        raise TypeError(UNKNOWN_ARRAY_TYPE)
+
+
+def max_abs_difference(a, b) -> float:
+    """Get the largest absolute difference between two arrays with the same shape"""
+    if isinstance(a, TorchTensor):
+        if a.numel() == 0:
+            return 0.0
+        return float(torch.max(torch.abs(a - b)))
+    elif isinstance(a, np.ndarray):
+        if a.size == 0:
+            return 0.0
+        return float(np.max(np.abs(a - b)))
     else:
         raise TypeError(UNKNOWN_ARRAY_TYPE)
 
@@ -130,7 +227,10 @@ def allclose(
 def argsort_labels_values(labels_values, reverse: bool = False):
     """
     Similar to :py:func:`np.argsort`, but sort the rows as one aggregated
-    tuple.
+    tuple (i.e. in lexicographic order of the rows).
+
+    The sort is stable, and works for any number of columns. For torch, it runs on the
+    device of ``labels_values``.
 
     :param labels_values: numpy.array or torch.Tensor
     :param reverse: if true, order is descending
@@ -138,148 +238,27 @@ def argsort_labels_values(labels_values, reverse: bool = False):
     :return: indices corresponding to the sorted values in ``labels_values``
     """
     if isinstance(labels_values, TorchTensor):
-        if labels_values.shape[1] == 1:
-            # Index is appended at the end to get
-            # the indices corresponding to the
-            # sorted values. Because we append the indices at
-            # the end and since metadata is unique, we do not affect
-            # the sorted order. Using `torch.argsort` is not an option
-            # because only on Tensors and sorting a Tensor is
-            # different than sorting a List(Tuple)
-            data = [(int(row[0]), i) for i, row in enumerate(labels_values)]
-            return torch.tensor(
-                [i[-1] for i in sort_list_2(data, reverse=reverse)],
-                dtype=torch.int64,
-                device=labels_values.device,
-            )
-        if labels_values.shape[1] == 2:
-            data = [
-                (int(row[0]), int(row[1]), i) for i, row in enumerate(labels_values)
-            ]
-            return torch.tensor(
-                [i[-1] for i in sort_list_3(data, reverse=reverse)],
-                dtype=torch.int64,
-                device=labels_values.device,
-            )
-        if labels_values.shape[1] == 3:
-            data = [
-                (int(row[0]), int(row[1]), int(row[2]), i)
-                for i, row in enumerate(labels_values)
-            ]
-            return torch.tensor(
-                [i[-1] for i in sort_list_4(data, reverse=reverse)],
-                dtype=torch.int64,
-                device=labels_values.device,
-            )
-        if labels_values.shape[1] == 4:
-            data = [
-                (int(row[0]), int(row[1]), int(row[2]), int(row[3]), i)
-                for i, row in enumerate(labels_values)
-            ]
-            return torch.tensor(
-                [i[-1] for i in sort_list_5(data, reverse=reverse)],
-                dtype=torch.int64,
-                device=labels_values.device,
-            )
-        if labels_values.shape[1] == 5:
-            data = [
-                (int(row[0]), int(row[1]), int(row[2]), int(row[3]), int(row[4]), i)
-                for i, row in enumerate(labels_values)
-            ]
-            return torch.tensor(
-                [i[-1] for i in sort_list_6(data, reverse=reverse)],
-                dtype=torch.int64,
-                device=labels_values.device,
-            )
-        if labels_values.shape[1] == 6:
-            data = [
-                (
-                    int(row[0]),
-                    int(row[1]),
-                    int(row[2]),
-                    int(row[3]),
-                    int(row[4]),
-                    int(row[5]),
-                    i,
-                )
-                for i, row in enumerate(labels_values)
-            ]
-            return torch.tensor(
-                [i[-1] for i in sort_list_7(data, reverse=reverse)],
-                dtype=torch.int64,
-                device=labels_values.device,
-            )
-        if labels_values.shape[1] == 7:
-            data = [
-                (
-                    int(row[0]),
-                    int(row[1]),
-                    int(row[2]),
-                    int(row[3]),
-                    int(row[4]),
-                    int(row[5]),
-                    int(row[6]),
-                    i,
-                )
-                for i, row in enumerate(labels_values)
-            ]
-            return torch.tensor(
-                [i[-1] for i in sort_list_8(data, reverse=reverse)],
-                dtype=torch.int64,
-                device=labels_values.device,
-            )
-        if labels_values.shape[1] == 8:
-            data = [
-                (
-                    int(row[0]),
-                    int(row[1]),
-                    int(row[2]),
-                    int(row[3]),
-                    int(row[4]),
-                    int(row[5]),
-                    int(row[6]),
-                    int(row[7]),
-                    i,
-                )
-                for i, row in enumerate(labels_values)
-            ]
-            return torch.tensor(
-                [i[-1] for i in sort_list_9(data, reverse=reverse)],
-                dtype=torch.int64,
-                device=labels_values.device,
-            )
-        if labels_values.shape[1] == 9:
-            data = [
-                (
-                    int(row[0]),
-                    int(row[1]),
-                    int(row[2]),
-                    int(row[3]),
-                    int(row[4]),
-                    int(row[5]),
-                    int(row[6]),
-                    int(row[7]),
-                    int(row[8]),
-                    i,
-                )
-                for i, row in enumerate(labels_values)
-            ]
-            return torch.tensor(
-                [i[-1] for i in sort_list_10(data, reverse=reverse)],
-                dtype=torch.int64,
-                device=labels_values.device,
-            )
-        else:
-            raise Exception("labels_values.shape[1]> 9 is not supported")
+        indices = torch.arange(
+            labels_values.shape[0], dtype=torch.int64, device=labels_values.device
+        )
+        # stable sort by each column in turn, starting with the least significant one
+        for column in range(labels_values.shape[1] - 1, -1, -1):
+            _, order = torch.sort(labels_values[indices, column], stable=True)
+            indices = indices[order]
+
+        if reverse:
+            indices = torch.flip(indices, dims=[0])
+        return indices
     elif isinstance(labels_values, np.ndarray):
-        # Index is appended at the end to get the indices corresponding to the
-        # sorted values. Because we append the indices at the end and since metadata
-        # is unique, we do not affect the sorted order.
-        list_tuples: List[List[int]] = labels_values.tolist()
-        for i in range(len(labels_values)):
-            list_tuples[i].append(i)
-        list_tuples.sort(reverse=reverse)
-        return np.array(list_tuples)[:, -1]
+        if labels_values.shape[1] == 0:
+            indices = np.arange(labels_values.shape[0], dtype=np.int64)
+        else:
+            # np.lexsort uses the last key as the primary one
+            indices = np.lexsort(labels_values.T[::-1])
+
+        if reverse:
+            indices = indices[::-1]
+        return indices
     else:
         raise TypeError(UNKNOWN_ARRAY_TYPE)
 
@@ -426,6 +405,25 @@ def dot(A, B):
         raise TypeError(UNKNOWN_ARRAY_TYPE)
 
 
+def batched_dot(A, B):
+    """Compute the dot product of two stacks of matrices.
+
+    ``A`` must have shape ``(n_batch, n_rows, n_columns)`` and ``B`` must have
+    shape ``(n_batch, n_outputs, n_columns)``. This function has the same
+    behavior as ``np.matmul(A, B.transpose(0, 2, 1))``.
+    """
+    if isinstance(A, TorchTensor):
+        _check_all_torch_tensor([B])
+        assert len(A.shape) == 3 and len(B.shape) == 3
+        return torch.bmm(A, B.transpose(1, 2))
+    elif isinstance(A, np.ndarray):
+        _check_all_np_ndarray([B])
+        assert len(A.shape) == 3 and len(B.shape) == 3
+        return np.matmul(A, B.transpose(0, 2, 1))
+    else:
+        raise TypeError(UNKNOWN_ARRAY_TYPE)
+
+
 def empty_like(array, shape: Optional[List[int]] = None, requires_grad: bool = False):
     """
     Create an uninitialized array, with the given ``shape``, and similar dtype,
@@ -572,17 +570,43 @@ def lstsq(X, Y, rcond: Optional[float], driver: Optional[str] = None):
             for a full description
             If None, 'gelsy' is used for CPU inputs
             and 'gels' for CUDA inputs. Default: None
+
+    ``X`` and ``Y`` can also be stacks of matrices (3-dimensional arrays), in which
+    case all the systems are solved together.
     """
     if isinstance(X, TorchTensor):
         _check_all_torch_tensor([Y])
         return torch.linalg.lstsq(X, Y, rcond=rcond, driver=driver)[0]
     elif isinstance(X, np.ndarray):
         _check_all_np_ndarray([Y])
-        return np.linalg.lstsq(X, Y, rcond=rcond)[0]
+        if len(X.shape) == 2:
+            return np.linalg.lstsq(X, Y, rcond=rcond)[0]
+        else:
+            return _np_batched_lstsq(X, Y, rcond)
     else:
         raise TypeError(UNKNOWN_ARRAY_TYPE)
 
 
+def _np_batched_lstsq(X, Y, rcond: Optional[float]):
+    """
+    Equivalent of ``numpy.linalg.lstsq`` for stacks of matrices, using the singular
+    value decomposition of all the matrices at once.
+    """
+    U, S, Vh = np.linalg.svd(X, full_matrices=False)
+
+    if rcond is None:
+        rcond = np.finfo(S.dtype).eps * max(X.shape[1], X.shape[2])
+    elif rcond < 0:
+        rcond = np.finfo(S.dtype).eps
+
+    # singular values smaller than rcond times the largest one are treated as zero
+    cutoff = rcond * S[:, :1]
+    S_inverse = np.divide(1.0, S, out=np.zeros_like(S), where=S > cutoff)
+
+    UT_Y = np.matmul(np.swapaxes(U, 1, 2), Y)
+    return np.matmul(np.swapaxes(Vh, 1, 2), S_inverse[:, :, None] * UT_Y)
+
+
 def mask(array, axis: int, mask):
     """
     Applies a boolean mask along the specified axis.
@@ -604,6 +628,62 @@ def mask(array, axis: int, mask):
         raise TypeError(UNKNOWN_ARRAY_TYPE)
 
 
+def _torch_memory_extent(array: TorchTensor) -> int:
+    """Number of bytes between the first and one past the last element of ``array``"""
+    shape = array.shape
+    strides = array.stride()
+    extent = 1
+    for dim in range(len(shape)):
+        extent += (shape[dim] - 1) * strides[dim]
+    return extent * array.element_size()
+
+
+def may_share_memory(a, b) -> bool:
+    """
+    Check if the memory used by ``a`` and ``b`` might overlap. This compares the
+    memory bounds of both arrays, and can return false positives for interleaved
+    views of the same data.
+
+    This function has the same behavior as ``np.may_share_memory(a, b)``. The memory
+    of torch tensors can not be accessed from TorchScript, and this function always
+    returns :py:obj:`True` for them in this case.
+    """
+    if isinstance(a, TorchTensor):
+        _check_all_torch_tensor([b])
+        if torch_jit_is_scripting():
+            return True
+
+        if a.device != b.device or a.numel() == 0 or b.numel() == 0:
+            return False
+
+        start_a = a.data_ptr()
+        start_b = b.data_ptr()
+        end_a = start_a + _torch_memory_extent(a)
+        end_b = start_b + _torch_memory_extent(b)
+        return start_a < end_b and start_b < end_a
+    elif isinstance(a, np.ndarray):
+        _check_all_np_ndarray([b])
+        return bool(np.may_share_memory(a, b))
+    else:
+        raise TypeError(UNKNOWN_ARRAY_TYPE)
+
+
+def moveaxis(array, source: int, destination: int):
+    """
+    Move the axis ``source`` of ``array`` to position ``destination``, returning a view
+    of the array.
+
+    This function has the same behavior as ``np.moveaxis(array, source,
+    destination)``.
+    """
+    if isinstance(array, TorchTensor):
+        return torch.movedim(array, source, destination)
+    elif isinstance(array, np.ndarray):
+        return np.moveaxis(array, source, destination)
+    else:
+        raise TypeError(UNKNOWN_ARRAY_TYPE)
+
+
 def nan_to_num(
     X,
     nan: float = 0.0,
@@ -660,6 +740,21 @@ def ones_like(array, shape: Optional[List[int]] = None, requires_grad: bool = Fa
         raise TypeError(UNKNOWN_ARRAY_TYPE)
 
 
+def pow_(array, exponent: float):
+    """
+    Raise the elements of the array to the power ``exponent``, in-place.
+
+    It is equivalent of np.power(array, exponent, out=array) and
+    tensor.pow_(exponent)
+    """
+    if isinstance(array, TorchTensor):
+        return array.pow_(exponent)
+    elif isinstance(array, np.ndarray):
+        return np.power(array, exponent, out=array)
+    else:
+        raise TypeError(UNKNOWN_ARRAY_TYPE)
+
+
 def rand_like(array, shape: Optional[List[int]] = None, requires_grad: bool = False):
     """
     Create an array with values randomly sampled from the uniform distribution
@@ -710,6 +805,168 @@ def requires_grad(array, value: bool):
         raise TypeError(UNKNOWN_ARRAY_TYPE)
 
 
+def rows_ids(array_1, array_2):
+    """
+    Give the same integer identifier to identical rows of the 2-dimensional arrays
+    ``array_1`` and ``array_2``. This returns the identifiers of the rows of both
+    arrays, and the total number of different rows.
+    """
+    n_rows_1 = array_1.shape[0]
+    all_rows = concatenate([array_1, array_2], axis=0)
+
+    if isinstance(all_rows, TorchTensor):
+        # `torch.unique(dim=0)` is slow, so we give dense identifiers to the values of
+        # each column with 1-dimensional `torch.unique`, and combine them one column
+        # at the time
+        inverse = torch.zeros(
+            all_rows.shape[0], dtype=torch.int64, device=all_rows.device
+        )
+        n_unique = 1
+        for column in range(all_rows.shape[1]):
+            column_values, column_inverse = torch.unique(
+                all_rows[:, column], return_inverse=True
+            )
+            combined = inverse * column_values.shape[0] + column_inverse
+            unique_combined, inverse = torch.unique(combined, return_inverse=True)
+            n_unique = unique_combined.shape[0]
+
+        if all_rows.shape[0] == 0:
+            n_unique = 0
+
+        return inverse[:n_rows_1], inverse[n_rows_1:], n_unique
+    elif isinstance(all_rows, np.ndarray):
+        unique_rows, inverse = unique_with_inverse(all_rows, axis=0)
+        inverse = to_index_array(inverse.reshape(-1))
+        return inverse[:n_rows_1], inverse[n_rows_1:], int(unique_rows.shape[0])
+    else:
+        raise TypeError(UNKNOWN_ARRAY_TYPE)
+
+
+def rows_positions(reference, entries):
+    """
+    Find the position of each row of ``entries`` in the 2-dimensional array
+    ``reference`` (which should only contain unique rows), or -1 if the row is not
+    part of ``reference``.
+
+    This is the equivalent of calling ``Labels.position`` for all entries at once, but
+    stays on the same device as the arrays.
+    """
+    if entries.shape[0] == 0 or reference.shape[0] == 0:
+        return to_index_array(zeros_like(entries, [entries.shape[0]]) - 1)
+
+    reference_ids, entries_ids, n_unique = rows_ids(reference, entries)
+
+    positions = zeros_like(reference_ids, [n_unique]) - 1
+    positions[reference_ids] = indices_like([reference.shape[0]], reference_ids)[:, 0]
+    return positions[entries_ids]
+
+
+def rows_isin(array, entries):
+    """
+    Check which rows of the 2-dimensional ``array`` are also rows of ``entries``,
+    returning a 1-dimensional array of booleans. The computation stays on the same
+    device as the arrays.
+    """
+    if array.shape[0] == 0 or entries.shape[0] == 0:
+        return zeros_like(array, [array.shape[0]]) != 0
+
+    array_ids, entries_ids, n_unique = rows_ids(array, entries)
+
+    found = zeros_like(array_ids, [n_unique]) != 0
+    found[entries_ids] = True
+    return found[array_ids]
+
+
+def searchsorted(sorted_array, values):
+    """
+    Find the indices where ``values`` should be inserted in the 1-dimensional
+    ``sorted_array`` to keep it sorted.
+
+    This function has the same behavior as ``np.searchsorted(sorted_array,
+    values)``, and runs on the device of the arrays for torch.
+    """
+    if isinstance(sorted_array, TorchTensor):
+        _check_all_torch_tensor([values])
+        return torch.searchsorted(sorted_array.contiguous(), values.contiguous())
+    elif isinstance(sorted_array, np.ndarray):
+        _check_all_np_ndarray([values])
+        return np.searchsorted(sorted_array, values)
+    else:
+        raise TypeError(UNKNOWN_ARRAY_TYPE)
+
+
+def segment_sum(values, index, n_segments: int):
+    """
+    Sum the rows of ``values`` sharing the same ``index``, returning an array with
+    ``n_segments`` rows where row ``i`` contains the sum of all ``values[j]`` with
+    ``index[j] == i``. Segments without any row are filled with zeros.
+
+    This gives the same result as ``np.add.at(zeros, index, values)``, up to
+    floating-point rounding. For numpy, the rows are sorted by segment (if they are
+    not already), and summed with a number of vectorized operations equal to the
+    smaller of the number of segments and the size of the largest segment. When there
+    are more rows in a segment than segments, each segment is summed with
+    ``np.sum``, which can add the rows in a different order than ``np.add.at``.
+    """
+    index = to_index_array(index)
+    if isinstance(values, TorchTensor):
+        if not isinstance(index, TorchTensor):
+            index = torch.tensor(index).to(device=values.device)
+
+        shape = [n_segments] + list(values.shape[1:])
+        output = torch.zeros(shape, dtype=values.dtype, device=values.device)
+        return output.index_add_(0, index, values)
+    elif isinstance(values, np.ndarray):
+        _check_all_np_ndarray([index])
+        output = np.zeros((n_segments,) + values.shape[1:], dtype=values.dtype)
+        if values.shape[0] == 0:
+            return output
+
+        if np.any(index[1:] < index[:-1]):
+            order = np.argsort(index, kind="stable")
+            index = index[order]
+            values = values[order]
+
+        counts = np.bincount(index, minlength=n_segments)
+        ends = np.cumsum(counts)
+        starts = ends - counts
+
+        # segments sorted by decreasing size, the segments with more than `i` rows
+        # are always the first ones in `by_size`
+        by_size = np.argsort(-counts, kind="stable")
+        sorted_counts = counts[by_size]
+        max_count = int(sorted_counts[0])
+
+        if max_count <= n_segments and int(sorted_counts[-1]) == max_count:
+            # all segments have the same size, the i-th row of all segments is a
+            # strided view inside `values`
+            segments = values.reshape((n_segments, max_count) + values.shape[1:])
+            for i in range(max_count):
+                output += segments[:, i]
+        elif max_count <= n_segments:
+            # add the first row of all segments, then the second row, etc. The sums
+            # are accumulated in `by_size` order, so the segments still receiving rows
+            # are always a contiguous slice at the start of `accumulated`
+            accumulated = np.zeros_like(output)
+            sorted_starts = starts[by_size]
+            for i in range(max_count):
+                n_active = np.searchsorted(-sorted_counts, -i, side="left")
+                accumulated[:n_active] += values[sorted_starts[:n_active] + i]
+            output[by_size] = accumulated
+        else:
+            # few large segments, sum each of them at once. `np.sum` can use
+            # pairwise summation, so the result can differ from a sequential
+            # accumulation in the last bits
+            for segment in range(n_segments):
+                if counts[segment] != 0:
+                    segment_values = values[starts[segment] : ends[segment]]
+                    output[segment] = np.sum(segment_values, axis=0)
+
+        return output
+    else:
+        raise TypeError(UNKNOWN_ARRAY_TYPE)
+
+
 def sign(array):
     """
     Returns an indication of the sign of the elements in the array.
@@ -901,11 +1158,41 @@ else:
             raise TypeError(UNKNOWN_ARRAY_TYPE)
 
 
+def _np_unique_rows_with_inverse(array):
+    """
+    Same as ``np.unique(array, axis=0, return_inverse=True)`` for 2-dimensional
+    integer arrays, using :py:func:`np.lexsort` instead of sorting the rows as
+    structured values, which is a lot faster (especially for already sorted rows).
+    """
+    order = np.lexsort(array.T[::-1])
+    sorted_rows = array[order]
+
+    new_entry = np.empty(array.shape[0], dtype=bool)
+    new_entry[:1] = True
+    new_entry[1:] = np.any(sorted_rows[1:] != sorted_rows[:-1], axis=1)
+
+    inverse = np.empty(array.shape[0], dtype=np.int64)
+    inverse[order] = np.cumsum(new_entry) - 1
+    return sorted_rows[new_entry], inverse
+
+
+def _is_np_rows_array(array, axis: Optional[int]) -> bool:
+    return (
+        axis == 0
+        and len(array.shape) == 2
+        and array.shape[0] != 0
+        and array.shape[1] != 0
+        and np.issubdtype(array.dtype, np.integer)
+    )
+
+
 def unique(array, axis: Optional[int] = None):
     """Find the unique elements of an array."""
     if isinstance(array, TorchTensor):
         return torch.unique(array, dim=axis)
     elif isinstance(array, np.ndarray):
+        if _is_np_rows_array(array, axis):
+            return _np_unique_rows_with_inverse(array)[0]
         return np.unique(array, axis=axis)
 
 
@@ -919,6 +1206,8 @@ def unique_with_inverse(array, axis: Optional[int] = None):
     if isinstance(array, TorchTensor):
         return torch.unique(array, return_inverse=True, dim=axis)
     elif isinstance(array, np.ndarray):
+        if _is_np_rows_array(array, axis):
+            return _np_unique_rows_with_inverse(array)
         return np.unique(array, return_inverse=True, axis=axis)
     else:
         raise TypeError(UNKNOWN_ARRAY_TYPE)
@@ -962,104 +1251,3 @@ def zeros_like(array, shape: Optional[List[int]] = None, requires_grad: bool = F
         return np.zeros_like(array, shape=shape, subok=False)
     else:
         raise TypeError(UNKNOWN_ARRAY_TYPE)
-
-
-@torch_jit_script
-def sort_list_2(
-    data: List[Tuple[int, int]], reverse: bool = False
-) -> List[Tuple[int, int]]:
-    # Using the `reverse` flag of sorted does not work with TorchScript
-    if reverse:
-        return list(sorted(data))[::-1]
-    else:
-        return list(sorted(data))
-
-
-@torch_jit_script
-def sort_list_3(
-    data: List[Tuple[int, int, int]], reverse: bool = False
-) -> List[Tuple[int, int, int]]:
-    # Using the `reverse` flag of sorted does not work with TorchScript
-    if reverse:
-        return list(sorted(data))[::-1]
-    else:
-        return list(sorted(data))
-
-
-@torch_jit_script
-def sort_list_4(
-    data: List[Tuple[int, int, int, int]], reverse: bool = False
-) -> List[Tuple[int, int, int, int]]:
-    # Using the `reverse` flag of sorted does not work with TorchScript
-    if reverse:
-        return list(sorted(data))[::-1]
-    else:
-        return list(sorted(data))
-
-
-@torch_jit_script
-def sort_list_5(
-    data: List[Tuple[int, int, int, int, int]], reverse: bool = False
-) -> List[Tuple[int, int, int, int, int]]:
-    # Using the `reverse` flag of sorted does not work with TorchScript
-    if reverse:
-        return list(sorted(data))[::-1]
-    else:
-        return list(sorted(data))
-
-
-@torch_jit_script
-def sort_list_6(
-    data: List[Tuple[int, int, int, int, int, int]], reverse: bool = False
-) -> List[Tuple[int, int, int, int, int, int]]:
-    # Using the `reverse` flag of sorted does not work with TorchScript
-    if reverse:
-        return list(sorted(data))[::-1]
-    else:
-        return list(sorted(data))
-
-
-@torch_jit_script
-def sort_list_7(
-    data: List[Tuple[int, int, int, int, int, int, int]], reverse: bool = False
-) -> List[Tuple[int, int, int, int, int, int, int]]:
-    # Using the `reverse` flag of sorted does not work with TorchScript
-    if reverse:
-        return list(sorted(data))[::-1]
-    else:
-        return list(sorted(data))
-
-
-@torch_jit_script
-def sort_list_8(
-    data: List[Tuple[int, int, int, int, int, int, int, int]], reverse: bool = False
-) -> List[Tuple[int, int, int, int, int, int, int, int]]:
-    # Using the `reverse` flag of sorted does not work with TorchScript
-    if reverse:
-        return list(sorted(data))[::-1]
-    else:
-        return list(sorted(data))
-
-
-@torch_jit_script
-def sort_list_9(
-    data: List[Tuple[int, int, int, int, int, int, int, int, int]],
-    reverse: bool = False,
-) -> List[Tuple[int, int, int, int, int, int, int, int, int]]:
-    # Using the `reverse` flag of sorted does not work with TorchScript
-    if reverse:
-        return list(sorted(data))[::-1]
-    else:
-        return list(sorted(data))
-
-
-@torch_jit_script
-def sort_list_10(
-    data: List[Tuple[int, int, int, int, int, int, int, int, int, int]],
-    reverse: bool = False,
-) -> List[Tuple[int, int, int, int, int, int, int, int, int, int]]:
-    # Using the `reverse` flag of sorted does not work with TorchScript
-    if reverse:
-        return list(sorted(data))[::-1]
-    else:
-        return list(sorted(data))
@@ -1,6 +1,7 @@
 from typing import List, Union
 
-from ._backend import TensorBlock, TensorMap
+from . import _dispatch
+from ._backend import Array, TensorBlock, TensorMap
 
 
 class NotEqualError(Exception):
@@ -9,6 +10,136 @@ class NotEqualError(Exception):
     pass
 
 
+def _shallow_copy_block(block: TensorBlock) -> TensorBlock:
+    """
+    Create a new :py:class:`TensorBlock` sharing the values, gradients and metadata of
+    ``block``, without copying any data. This just increases the reference count on
+    everything, and can be used to put the same data in a new :py:class:`TensorMap`.
+    """
+    new_block = TensorBlock(
+        values=block.values,
+        samples=block.samples,
+        components=block.components,
+        properties=block.properties,
+    )
+
+    for parameter, gradient in block.gradients():
+        if len(gradient.gradients_list()) != 0:
+            raise NotImplementedError("gradients of gradients are not supported")
+
+        new_block.add_gradient(
+            parameter=parameter,
+            gradient=TensorBlock(
+                values=gradient.values,
+                samples=gradient.samples,
+                components=gradient.components,
+                properties=new_block.properties,
+            ),
+        )
+
+    return new_block
+
+
+def _group_same_shapes(arrays_1: List[Array], arrays_2: List[Array]) -> List[List[int]]:
+    """
+    Group together the indices ``i`` for which ``arrays_1[i]`` and ``arrays_2[i]``
+    have the same shapes, so that the corresponding arrays can be stacked and processed
+    with a single call. Groups are returned in order of first appearance.
+    """
+    group_shapes: List[List[int]] = []
+    groups: List[List[int]] = []
+    for i in range(len(arrays_1)):
+        shape = list(arrays_1[i].shape) + list(arrays_2[i].shape)
+
+        found = False
+        for group_i in range(len(groups)):
+            if group_shapes[group_i] == shape:
+                groups[group_i].append(i)
+                found = True
+                break
+
+        if not found:
+            group_shapes.append(shape)
+            groups.append([i])
+
+    return groups
+
+
+def _matching_blocks(a: TensorMap, b: TensorMap) -> List[TensorBlock]:
+    """
+    Get the blocks of ``b`` in the same order as the keys of ``a``. Both tensors must
+    have the same keys (for example after calling :py:func:`_check_same_keys_raise`),
+    potentially in a different order.
+
+    This finds all the blocks at once, instead of looking up each key separately with
+    ``b.block(key)``.
+    """
+    keys_a = a.keys
+    keys_b = b.keys
+    if keys_a == keys_b:
+        return b.blocks()
+
+    _, mapping_a, mapping_b = keys_a.intersection_and_mapping(keys_b)
+
+    # position in `b` of each entry of the intersection
+    positions_b: List[int] = [0] * len(keys_b)
+    for i_b in range(len(keys_b)):
+        positions_b[int(mapping_b[i_b])] = i_b
+
+    blocks: List[TensorBlock] = []
+    for i_a in range(len(keys_a)):
+        blocks.append(b.block_by_id(positions_b[int(mapping_a[i_a])]))
+    return blocks
+
+
+def _copy_into(out: TensorMap, tensor: TensorMap, fname: str) -> None:
+    """
+    Copy the values and gradients of ``tensor`` in the existing arrays of ``out``,
+    after checking that both have the same metadata. This is used to implement the
+    ``out`` argument of operations, which then modify ``out`` in-place.
+    """
+    _check_same_keys_raise(out, tensor, fname)
+    blocks = _matching_blocks(out, tensor)
+    for i, out_block in enumerate(out.blocks()):
+        block = blocks[i]
+        _check_blocks_raise(out_block, block, fname=fname)
+        _check_same_gradients_raise(out_block, block, fname=fname)
+
+        values = out_block.values
+        values[:] = block.values
+        for parameter, out_gradient in out_block.gradients():
+            if len(out_gradient.gradients_list()) != 0:
+                raise NotImplementedError("gradients of gradients are not supported")
+
+            gradient_values = out_gradient.values
+            gradient_values[:] = block.gradient(parameter).values
+
+
+def _shares_arrays(out: TensorMap, tensor: TensorMap) -> bool:
+    """
+    Check if the values or gradients arrays of ``out`` might share memory with the
+    corresponding arrays (for the same key and gradient parameter) in ``tensor``. This
+    returns false if the tensors do not have the same keys.
+    """
+    if not _check_same_keys(out, tensor, "_shares_arrays"):
+        return False
+
+    blocks = _matching_blocks(out, tensor)
+    for i, out_block in enumerate(out.blocks()):
+        block = blocks[i]
+        if _dispatch.may_share_memory(out_block.values, block.values):
+            return True
+
+        gradients_list = block.gradients_list()
+        for parameter, out_gradient in out_block.gradients():
+            if parameter in gradients_list:
+                gradient = block.gradient(parameter)
+                if _dispatch.may_share_memory(out_gradient.values, gradient.values):
+                    return True
+
+    return False
+
+
 def _check_same_keys(a: TensorMap, b: TensorMap, fname: str) -> bool:
     """
     Returns true if the keys of 2 TensorMaps are the same, without specification of the
@@ -57,7 +188,12 @@ def _check_same_keys_impl(a: TensorMap, b: TensorMap, fname: str) -> str:
             f"got {len(keys_a)} and {len(keys_b)}"
         )
 
-    if not all([keys_b[i] in keys_a for i in range(len(keys_b))]):
+    if keys_a == keys_b:
+        return ""
+
+    # the keys are unique, so both tensors contain the same keys if all the keys of
+    # one tensor are in the intersection
+    if len(keys_a.intersection(keys_b)) != len(keys_a):
         return f"inputs to '{fname}' should have the same keys"
 
     return ""
@@ -3,10 +3,20 @@ Module to find the absolute values of a :py:class:`TensorMap`, returning a new
 :py:class:`TensorMap`.
 """
 
-from typing import List
+from typing import List, Optional
 
 from . import _dispatch
-from ._backend import TensorBlock, TensorMap, torch_jit_script
+from ._backend import (
+    TensorBlock,
+    TensorMap,
+    is_metatensor_class,
+    torch_jit_is_scripting,
+    torch_jit_script,
+)
+from ._utils import _copy_into
+from .chunks import _samples_chunk_size
+from .map_blocks import _map_blocks_impl, _use_parallel_blocks
+from .pack import _from_packed_buffer, _packed_elementwise
 
 
 def _abs_block(block: TensorBlock) -> TensorBlock:
@@ -39,9 +49,28 @@ def _abs_block(block: TensorBlock) -> TensorBlock:
         diff_components = len(gradient.components) - len(block.components)
         # The sign_values have the same dimensions as that of the block.values.
         # Reshape the sign_values to allow multiplication with gradient.values
-        new_grad = gradient.values[:] * sign_values[
-            _dispatch.to_index_array(gradient.samples.column("sample"))
-        ].reshape([-1] + [1] * diff_components + _shape)
+        values_index = _dispatch.to_index_array(gradient.samples.column("sample"))
+        broadcast_shape = [-1] + [1] * diff_components + _shape
+
+        n_gradient_samples = len(gradient.samples)
+        chunk_size = n_gradient_samples
+        if not torch_jit_is_scripting():
+            chunk_size = _samples_chunk_size(n_gradient_samples)
+
+        new_grad = gradient.values[:chunk_size] * sign_values[
+            values_index[:chunk_size]
+        ].reshape(broadcast_shape)
+        if chunk_size < n_gradient_samples:
+            # compute the remaining gradient samples by chunks, and write them in a
+            # pre-allocated array
+            first_chunk = new_grad
+            new_grad = _dispatch.empty_like(first_chunk, list(gradient.values.shape))
+            new_grad[:chunk_size] = first_chunk
+            for start in range(chunk_size, n_gradient_samples, chunk_size):
+                stop = start + chunk_size
+                new_grad[start:stop] = gradient.values[start:stop] * sign_values[
+                    values_index[start:stop]
+                ].reshape(broadcast_shape)
 
         gradient = TensorBlock(
             new_grad, gradient.samples, gradient.components, gradient.properties
@@ -51,8 +80,57 @@ def _abs_block(block: TensorBlock) -> TensorBlock:
     return result_block
 
 
+def _abs_block_inplace(block: TensorBlock) -> None:
+    if len(block.gradients_list()) != 0:
+        # the gradients are updated first, since they use the sign of the values
+        # before taking the absolute value
+        sign_values = _dispatch.sign(block.values)
+        _shape: List[int] = []
+        for c in block.components:
+            _shape += [len(c)]
+        _shape += [len(block.properties)]
+
+        for _, gradient in block.gradients():
+            if len(gradient.gradients_list()) != 0:
+                raise NotImplementedError("gradients of gradients are not supported")
+
+            diff_components = len(gradient.components) - len(block.components)
+            values_index = _dispatch.to_index_array(gradient.samples.column("sample"))
+
+            gradient_values = gradient.values
+            gradient_values *= sign_values[values_index].reshape(
+                [-1] + [1] * diff_components + _shape
+            )
+
+    _dispatch.abs_(block.values)
+
+
 @torch_jit_script
-def abs(A: TensorMap) -> TensorMap:
+def abs_(A: TensorMap) -> TensorMap:
+    r"""
+    In-place version of :py:func:`abs`, replacing the values of ``A`` by their
+    absolute values and updating the gradients accordingly, and returning ``A``.
+
+    .. note::
+      Other :py:class:`TensorMap` sharing arrays with ``A`` are also modified, see
+      :py:func:`add_` for the operations sharing arrays between their input and output.
+
+    :param A: :py:class:`TensorMap` to modify.
+
+    :return: ``A``, after taking its absolute value.
+    """
+    if not torch_jit_is_scripting():
+        if not is_metatensor_class(A, TensorMap):
+            raise TypeError(f"`A` must be a metatensor TensorMap, not {type(A)}")
+
+    for block in A.blocks():
+        _abs_block_inplace(block)
+
+    return A
+
+
+@torch_jit_script
+def abs(A: TensorMap, out: Optional[TensorMap] = None) -> TensorMap:
     r"""
     Return a new :py:class:`TensorMap` with the same metadata as A and absolute
     values of ``A``.
@@ -66,12 +144,29 @@ def abs(A: TensorMap) -> TensorMap:
         \nabla(A) \rightarrow \nabla(\vert A \vert) = (A/\vert A \vert)*\nabla A
 
     :param A: the input :py:class:`TensorMap`.
+    :param out: optional :py:class:`TensorMap` with the same metadata as ``A``. If
+        given, the result is written in the existing values and gradients arrays of
+        ``out`` instead of allocating new ones. ``out`` can be ``A`` itself. See
+        also :py:func:`abs_`.
 
     :return: a new :py:class:`TensorMap` with the same metadata as ``A`` and
-        absolute values of ``A``.
+        absolute values of ``A``, or ``out`` if given.
     """
+    if out is not None:
+        _copy_into(out, A, "abs")
+        return abs_(out)
+
     blocks: List[TensorBlock] = []
     keys = A.keys
+    if not torch_jit_is_scripting():
+        buffer = _packed_elementwise(A, gradients_too=False)
+        if buffer is not None:
+            return _from_packed_buffer(A, _dispatch.abs(buffer))
+
+        if _use_parallel_blocks(len(keys)):
+            blocks = _map_blocks_impl(_abs_block, [(block,) for block in A.blocks()])
+            return TensorMap(keys, blocks)
+
     for i in range(len(keys)):
         blocks.append(_abs_block(block=A.block(keys.entry(i))))
     return TensorMap(keys, blocks)
@@ -1,4 +1,4 @@
-from typing import List, Union
+from typing import List, Optional, Tuple, Union
 
 from ._backend import (
     TensorBlock,
@@ -11,7 +11,12 @@ from ._utils import (
     _check_blocks_raise,
     _check_same_gradients_raise,
     _check_same_keys_raise,
+    _copy_into,
+    _matching_blocks,
+    _shares_arrays,
 )
+from .map_blocks import _map_blocks_impl, _use_parallel_blocks
+from .pack import _from_packed_buffer, _packed_elementwise
 
 
 def _add_block_constant(block: TensorBlock, constant: float) -> TensorBlock:
@@ -76,8 +81,105 @@ def _add_block_block(block_1: TensorBlock, block_2: TensorBlock) -> TensorBlock:
     return result_block
 
 
+def _add_block_constant_inplace(block: TensorBlock, constant: float) -> None:
+    # gradients are not modified when adding a constant
+    values = block.values
+    values += constant
+
+
+def _add_block_block_inplace(block_1: TensorBlock, block_2: TensorBlock) -> None:
+    values = block_1.values
+    values += block_2.values
+
+    for parameter, gradient_1 in block_1.gradients():
+        if len(gradient_1.gradients_list()) != 0:
+            raise NotImplementedError("gradients of gradients are not supported")
+
+        gradient_values = gradient_1.values
+        gradient_values += block_2.gradient(parameter).values
+
+
+@torch_jit_script
+def add_(A: TensorMap, B: Union[int, float, TensorMap]) -> TensorMap:
+    r"""In-place version of :py:func:`add`, adding ``B`` to the values and gradients of
+    ``A``, and returning ``A``.
+
+    The metadata of ``B`` is checked against ``A`` in the same way as in
+    :py:func:`add`, and the existing arrays of ``A`` are then modified, without
+    allocating new arrays or :py:class:`Labels`.
+
+    .. note::
+      The arrays of ``A`` are modified in-place, which is visible from every
+      :py:class:`TensorMap` sharing them. Operations only changing metadata (for
+      example :py:func:`rename_dimension`, :py:func:`remove_gradients`,
+      :py:func:`join`, or :py:func:`drop_blocks` with ``copy=False``) and
+      :py:meth:`TensorMap.to` without any conversion re-use the arrays of their
+      input. :py:func:`add` and :py:func:`subtract` with a scalar re-use the
+      gradients arrays of their input, since these gradients are not modified. Use
+      :py:meth:`TensorMap.copy` first if ``A`` was created by one of these, or pass
+      an ``out`` tensor to the out-of-place operation instead.
+
+    >>> import numpy as np
+    >>> import metatensor
+    >>> from metatensor import Labels, TensorBlock, TensorMap
+    >>> block = TensorBlock(
+    ...     values=np.array([[1.0, 2.0], [3.0, 4.0]]),
+    ...     samples=Labels.range("sample", 2),
+    ...     components=[],
+    ...     properties=Labels.range("property", 2),
+    ... )
+    >>> A = TensorMap(Labels.range("key", 1), [block])
+    >>> result = metatensor.add_(A, 2)
+    >>> result is A
+    True
+    >>> print(A.block().values)
+    [[3. 4.]
+     [5. 6.]]
+
+    :param A: :py:class:`TensorMap` to modify.
+    :param B: Scalar or :py:class:`TensorMap` with the same metadata as ``A`` to add
+              to ``A``.
+
+    :return: ``A``, after adding ``B`` to it.
+    """
+    if not torch_jit_is_scripting():
+        if not is_metatensor_class(A, TensorMap):
+            raise TypeError(f"`A` must be a metatensor TensorMap, not {type(A)}")
+
+    if torch_jit_is_scripting():
+        is_tensor_map = isinstance(B, TensorMap)
+    else:
+        is_tensor_map = is_metatensor_class(B, TensorMap)
+
+    if isinstance(B, (float, int)):
+        B = float(B)
+        for block_A in A.blocks():
+            _add_block_constant_inplace(block=block_A, constant=B)
+    elif is_tensor_map:
+        _check_same_keys_raise(A, B, "add_")
+        blocks_B = _matching_blocks(A, B)
+        for i, block_A in enumerate(A.blocks()):
+            block_B = blocks_B[i]
+            _check_blocks_raise(block_A, block_B, fname="add_")
+            _check_same_gradients_raise(block_A, block_B, fname="add_")
+            _add_block_block_inplace(block_1=block_A, block_2=block_B)
+    else:
+        if torch_jit_is_scripting():
+            extra = ""
+        else:
+            extra = f", not {type(B)}"
+
+        raise TypeError("`B` must be a metatensor TensorMap or a scalar value" + extra)
+
+    return A
+
+
 @torch_jit_script
-def add(A: TensorMap, B: Union[int, float, TensorMap]) -> TensorMap:
+def add(
+    A: TensorMap,
+    B: Union[int, float, TensorMap],
+    out: Optional[TensorMap] = None,
+) -> TensorMap:
     r"""Return a new :class:`TensorMap` with the values being the sum of
     ``A`` and ``B``.
 
@@ -90,6 +192,9 @@ def add(A: TensorMap, B: Union[int, float, TensorMap]) -> TensorMap:
        .. math::
             \nabla(A + B) = \nabla A
 
+       and the gradients arrays of ``A`` are re-used in the output, without copying
+       them.
+
     * ``B`` is a :py:class:`TensorMap` with the same metadata of ``A``:
 
        .. math::
@@ -99,14 +204,33 @@ def add(A: TensorMap, B: Union[int, float, TensorMap]) -> TensorMap:
     :param B: Second instance for the addition. Parameter can be a scalar or a
               :py:class:`TensorMap`. In the latter case ``B`` must have the same
               metadata of ``A``.
+    :param out: Optional :py:class:`TensorMap` with the same metadata as ``A``. If
+              given, the result is written in the existing values and gradients
+              arrays of ``out`` instead of allocating new ones. ``out`` can be ``A``
+              itself or ``B``. See also :py:func:`add_`.
 
-    :return: New :py:class:`TensorMap` with the same metadata as ``A``.
+    :return: New :py:class:`TensorMap` with the same metadata as ``A``, or ``out``
+             if given.
     """
 
     if not torch_jit_is_scripting():
         if not is_metatensor_class(A, TensorMap):
             raise TypeError(f"`A` must be a metatensor TensorMap, not {type(A)}")
 
+    if out is not None:
+        # the arrays of `B` would be overwritten when copying `A` to `out`
+        if torch_jit_is_scripting():
+            if isinstance(B, TensorMap):
+                if _shares_arrays(out, B):
+                    B = B.copy()
+        else:
+            if is_metatensor_class(B, TensorMap):
+                if _shares_arrays(out, B):
+                    B = B.copy()
+
+        _copy_into(out, A, "add")
+        return add_(out, B)
+
     blocks: List[TensorBlock] = []
     if torch_jit_is_scripting():
         is_tensor_map = isinstance(B, TensorMap)
@@ -115,13 +239,28 @@ def add(A: TensorMap, B: Union[int, float, TensorMap]) -> TensorMap:
 
     if isinstance(B, (float, int)):
         B = float(B)
+        if not torch_jit_is_scripting():
+            # gradients are not modified when adding a constant, so we can only use
+            # the packed buffer for tensors without gradients
+            buffer = _packed_elementwise(A, gradients_too=False)
+            if buffer is not None:
+                return _from_packed_buffer(A, B + buffer)
+
+            if _use_parallel_blocks(len(A)):
+                blocks = _map_blocks_impl(
+                    _add_block_constant, [(block_A, B) for block_A in A.blocks()]
+                )
+                return TensorMap(A.keys, blocks)
+
         for block_A in A.blocks():
             blocks.append(_add_block_constant(block=block_A, constant=B))
 
     elif is_tensor_map:
         _check_same_keys_raise(A, B, "add")
-        for key, block_A in A.items():
-            block_B = B[key]
+        pairs: List[Tuple[TensorBlock, TensorBlock]] = []
+        blocks_B = _matching_blocks(A, B)
+        for i, block_A in enumerate(A.blocks()):
+            block_B = blocks_B[i]
             _check_blocks_raise(
                 block_A,
                 block_B,
@@ -132,6 +271,14 @@ def add(A: TensorMap, B: Union[int, float, TensorMap]) -> TensorMap:
                 block_B,
                 fname="add",
             )
+            pairs.append((block_A, block_B))
+
+        if not torch_jit_is_scripting():
+            if _use_parallel_blocks(len(pairs)):
+                blocks = _map_blocks_impl(_add_block_block, pairs)
+                return TensorMap(A.keys, blocks)
+
+        for block_A, block_B in pairs:
             blocks.append(_add_block_block(block_1=block_A, block_2=block_B))
     else:
         if torch_jit_is_scripting():
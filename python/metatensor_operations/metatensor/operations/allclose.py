@@ -5,6 +5,7 @@ from ._utils import (
     _check_blocks_impl,
     _check_same_gradients_impl,
     _check_same_keys_impl,
+    _matching_blocks,
 )
 
 
@@ -16,15 +17,19 @@ def _allclose_impl(
     if message != "":
         return f"the tensor maps have different keys: {message}"
 
-    for key, block_1 in tensor_1.items():
+    keys = tensor_1.keys
+    blocks_2 = _matching_blocks(tensor_1, tensor_2)
+
+    for i in range(len(keys)):
         message = _allclose_block_impl(
-            block_1=block_1,
-            block_2=tensor_2.block(key),
+            block_1=tensor_1.block_by_id(i),
+            block_2=blocks_2[i],
             rtol=rtol,
             atol=atol,
             equal_nan=equal_nan,
         )
         if message != "":
+            key = keys.entry(i)
             return f"blocks for key {key.print()} are different: {message}"
     return ""
 
@@ -40,11 +45,8 @@ def _allclose_block_impl(
     if not block_1.values.shape == block_2.values.shape:
         return "values shapes are different"
 
-    if not _dispatch.allclose(
-        block_1.values, block_2.values, rtol=rtol, atol=atol, equal_nan=equal_nan
-    ):
-        return "values are not allclose"
-
+    # check all the metadata first, since this is a lot cheaper than comparing the
+    # values for large blocks
     check_blocks_message = _check_blocks_impl(
         block_1,
         block_2,
@@ -62,6 +64,12 @@ def _allclose_block_impl(
     if check_same_gradient_message != "":
         return check_same_gradient_message
 
+    if not _dispatch.allclose(
+        block_1.values, block_2.values, rtol=rtol, atol=atol, equal_nan=equal_nan
+    ):
+        difference = _dispatch.max_abs_difference(block_1.values, block_2.values)
+        return f"values are not allclose (largest absolute difference is {difference})"
+
     for parameter, gradient1 in block_1.gradients():
         gradient2 = block_2.gradient(parameter)
 
@@ -72,7 +80,13 @@ def _allclose_block_impl(
             atol=atol,
             equal_nan=equal_nan,
         ):
-            return f"gradient '{parameter}' values are not allclose"
+            difference = _dispatch.max_abs_difference(
+                gradient1.values, gradient2.values
+            )
+            return (
+                f"gradient '{parameter}' values are not allclose (largest absolute "
+                f"difference is {difference})"
+            )
     return ""
 
 
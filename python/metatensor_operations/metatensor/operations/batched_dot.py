@@ -0,0 +1,230 @@
+"""
+Compute the same products as :py:func:`dot` with a handful of batched matrix
+multiplications instead of one small matrix multiplication per block.
+
+This module is only available in pure Python mode, and can not be used from
+TorchScript.
+"""
+
+from typing import Dict, List, Tuple
+
+from . import _dispatch
+from ._backend import TensorBlock, TensorMap
+from ._dispatch import TorchTensor
+from ._utils import _check_same_keys_raise, _matching_blocks
+
+
+# arrays with up to this factor between their number of rows are padded and
+# multiplied together in the same batch
+_MAX_PADDING_RATIO = 2
+
+
+class _Product:
+    """A single ``left @ weights.T`` matrix product, from values or gradients"""
+
+    def __init__(self, left, weights: int):
+        # shape of the array before flattening all but the last dimension
+        self.shape = list(left.shape)
+        n_rows = 1
+        for size in self.shape[:-1]:
+            n_rows *= size
+        self.left = left.reshape(n_rows, self.shape[-1])
+        # index of the weights this product uses
+        self.weights = weights
+        self.result = None
+
+    @property
+    def n_rows(self) -> int:
+        return self.left.shape[0]
+
+
+def _check_blocks(block_1: TensorBlock, block_2: TensorBlock):
+    if not block_1.properties == block_2.properties:
+        raise ValueError(
+            "TensorBlocks in `batched_dot` should have the same properties"
+        )
+
+    if len(block_2.components) > 0:
+        raise ValueError(
+            "the second TensorMap in `batched_dot` should not have components"
+        )
+
+    if len(block_2.gradients_list()) > 0:
+        raise ValueError(
+            "the second TensorMap in `batched_dot` should not have gradients"
+        )
+
+    for _, gradient in block_1.gradients():
+        if len(gradient.gradients_list()) != 0:
+            raise NotImplementedError("gradients of gradients are not supported")
+
+
+def _group_key(array, weights) -> Tuple:
+    """Products can be batched together if they share this key"""
+    if isinstance(array, TorchTensor):
+        device = str(array.device)
+    else:
+        device = "numpy"
+
+    return (
+        array.shape[-1],
+        weights.shape[0],
+        str(array.dtype),
+        str(weights.dtype),
+        device,
+    )
+
+
+def _batches(products: List[_Product]) -> List[List[_Product]]:
+    """
+    Split ``products`` (which all share the same group key) into batches, such that
+    padding all the products in a batch to the same number of rows at most doubles
+    their size.
+    """
+    products = sorted(products, key=lambda product: product.n_rows)
+
+    batches = []
+    current = []
+    for product in products:
+        if len(current) != 0:
+            if product.n_rows > _MAX_PADDING_RATIO * max(current[0].n_rows, 1):
+                batches.append(current)
+                current = []
+        current.append(product)
+
+    if len(current) != 0:
+        batches.append(current)
+
+    return batches
+
+
+def _compute_batch(batch: List[_Product], weights: List):
+    n_rows = batch[-1].n_rows
+
+    if batch[0].n_rows == n_rows:
+        left = _dispatch.stack([product.left for product in batch], axis=0)
+    else:
+        first = batch[0].left
+        left = _dispatch.zeros_like(first, [len(batch), n_rows, first.shape[1]])
+        for i, product in enumerate(batch):
+            left[i, : product.n_rows] = product.left
+
+    stacked_weights = _dispatch.stack(
+        [weights[product.weights] for product in batch], axis=0
+    )
+
+    result = _dispatch.batched_dot(left, stacked_weights)
+    for i, product in enumerate(batch):
+        shape = product.shape[:-1] + [result.shape[2]]
+        product.result = result[i, : product.n_rows].reshape(shape)
+
+
+def batched_dot(tensor_1: TensorMap, tensor_2: TensorMap) -> TensorMap:
+    """Compute the dot product of two :py:class:`TensorMap`, batching together the
+    products of different blocks.
+
+    This function gives the same result as :py:func:`dot`, but instead of doing one
+    matrix multiplication for each block and each gradient, it groups all these
+    products by number of properties (and number of samples of ``tensor_2``), pads
+    them to the same number of rows and computes each group with a single batched
+    matrix multiplication (:py:func:`numpy.matmul` or :py:func:`torch.bmm`). Products
+    with very different number of rows (for example values and gradients with respect
+    to positions) are put in different batches, to limit the cost of padding.
+
+    This is faster than :py:func:`dot` when ``tensor_1`` contains many small blocks,
+    for example when applying a linear layer per block with many species and angular
+    channels. For tensors with a few large blocks, :py:func:`dot` avoids the copies
+    needed to pad and stack the arrays and should be preferred.
+
+    >>> import numpy as np
+    >>> import metatensor
+    >>> from metatensor import Labels, TensorBlock, TensorMap
+    >>> blocks = [
+    ...     TensorBlock(
+    ...         values=np.arange(2 * n, dtype=np.float64).reshape(n, 2),
+    ...         samples=Labels.range("system", n),
+    ...         components=[],
+    ...         properties=Labels.range("properties", 2),
+    ...     )
+    ...     for n in [2, 3]
+    ... ]
+    >>> weights = TensorBlock(
+    ...     values=np.array([[1.0, 0.0], [1.0, 1.0], [0.0, 2.0]]),
+    ...     samples=Labels.range("out", 3),
+    ...     components=[],
+    ...     properties=Labels.range("properties", 2),
+    ... )
+    >>> keys = Labels.range("key", 2)
+    >>> A = TensorMap(keys, blocks)
+    >>> B = TensorMap(keys, [weights.copy(), weights.copy()])
+    >>> result = metatensor.batched_dot(A, B)
+    >>> print(result.block(1).values)
+    [[ 0.  1.  2.]
+     [ 2.  5.  6.]
+     [ 4.  9. 10.]]
+    >>> metatensor.allclose(result, metatensor.dot(A, B))
+    True
+
+    :param tensor_1: first :py:class:`TensorMap` to multiply
+    :param tensor_2: second :py:class:`TensorMap` to multiply, with no components and
+        no gradients
+
+    :return: a :py:class:`TensorMap` with the same keys and metadata as
+        ``dot(tensor_1, tensor_2)``
+    """
+    _check_same_keys_raise(tensor_1, tensor_2, "batched_dot")
+
+    blocks_1 = tensor_1.blocks()
+    blocks_2 = _matching_blocks(tensor_1, tensor_2)
+
+    weights = []
+    values_products: List[_Product] = []
+    gradients_products: List[List[Tuple[str, TensorBlock, _Product]]] = []
+    groups: Dict[Tuple, List[_Product]] = {}
+    for i, block_1 in enumerate(blocks_1):
+        block_2 = blocks_2[i]
+        _check_blocks(block_1, block_2)
+
+        weights.append(block_2.values)
+        key = _group_key(block_1.values, block_2.values)
+        group = groups.setdefault(key, [])
+
+        product = _Product(block_1.values, weights=i)
+        values_products.append(product)
+        group.append(product)
+
+        block_gradients = []
+        for parameter, gradient in block_1.gradients():
+            product = _Product(gradient.values, weights=i)
+            block_gradients.append((parameter, gradient, product))
+            group.append(product)
+
+        gradients_products.append(block_gradients)
+
+    for group in groups.values():
+        for batch in _batches(group):
+            _compute_batch(batch, weights)
+
+    blocks: List[TensorBlock] = []
+    for i, block_1 in enumerate(blocks_1):
+        result_block = TensorBlock(
+            values=values_products[i].result,
+            samples=block_1.samples,
+            components=block_1.components,
+            properties=blocks_2[i].samples,
+        )
+
+        for parameter, gradient, product in gradients_products[i]:
+            result_block.add_gradient(
+                parameter=parameter,
+                gradient=TensorBlock(
+                    values=product.result,
+                    samples=gradient.samples,
+                    components=gradient.components,
+                    properties=result_block.properties,
+                ),
+            )
+
+        blocks.append(result_block)
+
+    return TensorMap(tensor_1.keys, blocks)
@@ -0,0 +1,88 @@
+"""
+Process the values and gradients of large blocks by chunks of samples in the built-in
+operations, to bound the memory used by temporary arrays.
+
+This module is only available in pure Python mode, and can not be used from
+TorchScript.
+"""
+
+from typing import Optional
+
+
+# number of samples to process at once in the built-in operations, set by
+# `sample_chunks`
+_SAMPLES_CHUNK_SIZE: Optional[int] = None
+
+
+class sample_chunks:
+    """Process large blocks by chunks of ``chunk_size`` samples.
+
+    Inside this context manager, the operations from metatensor-operations creating
+    temporary arrays as large as their inputs (the gradients of :py:func:`multiply`,
+    :py:func:`pow` and :py:func:`abs`; and the values and gradients of
+    :py:func:`var_over_samples` and :py:func:`std_over_samples`) compute their output
+    by chunks of at most ``chunk_size`` samples (or gradient samples), and write the
+    results in a pre-allocated output. The peak memory usage is then the size of the
+    output plus the temporaries for a single chunk.
+
+    The results are the same as without chunks, up to the order of floating point
+    additions in the reductions.
+
+    >>> import metatensor
+    >>> from metatensor import Labels, TensorBlock, TensorMap
+    >>> import numpy as np
+    >>> block = TensorBlock(
+    ...     values=np.arange(24, dtype=np.float64).reshape(12, 2),
+    ...     samples=Labels(
+    ...         ["system", "atom"],
+    ...         np.array([[system, atom] for system in range(3) for atom in range(4)]),
+    ...     ),
+    ...     components=[],
+    ...     properties=Labels.range("p", 2),
+    ... )
+    >>> tensor = TensorMap(Labels.range("key", 1), [block])
+    >>> with metatensor.sample_chunks(5):
+    ...     result = metatensor.var_over_samples(tensor, "atom")
+    >>> print(result.block().values)
+    [[5. 5.]
+     [5. 5.]
+     [5. 5.]]
+
+    :param chunk_size: maximal number of samples to process at once
+    """
+
+    def __init__(self, chunk_size: int):
+        if not isinstance(chunk_size, int) or isinstance(chunk_size, bool):
+            raise TypeError(f"`chunk_size` must be an integer, not {type(chunk_size)}")
+
+        if chunk_size <= 0:
+            raise ValueError(f"`chunk_size` must be positive, got {chunk_size}")
+
+        self._chunk_size = chunk_size
+
+    def __repr__(self) -> str:
+        return f"sample chunks (chunk_size={self._chunk_size})"
+
+    def __enter__(self):
+        global _SAMPLES_CHUNK_SIZE
+
+        self._previous = _SAMPLES_CHUNK_SIZE
+        _SAMPLES_CHUNK_SIZE = self._chunk_size
+        return self
+
+    def __exit__(self, type, value, traceback):
+        global _SAMPLES_CHUNK_SIZE
+
+        _SAMPLES_CHUNK_SIZE = self._previous
+
+
+def _samples_chunk_size(n_samples: int) -> int:
+    """
+    Get the number of samples the built-in operations should process at once for an
+    array with ``n_samples`` samples. This is ``n_samples`` (i.e. a single chunk)
+    outside of :py:class:`sample_chunks`.
+    """
+    if _SAMPLES_CHUNK_SIZE is None:
+        return n_samples
+    else:
+        return _SAMPLES_CHUNK_SIZE
@@ -0,0 +1,314 @@
+from typing import List, Tuple, Union
+
+from . import _dispatch
+from ._backend import (
+    Array,
+    Labels,
+    TensorBlock,
+    TensorMap,
+    is_metatensor_class,
+    torch_jit_is_scripting,
+    torch_jit_script,
+)
+
+
+def _normalize_dimensions(dimensions: Union[str, List[str]]) -> List[str]:
+    if isinstance(dimensions, str):
+        return [dimensions]
+
+    result: List[str] = []
+    for dimension in dimensions:
+        result.append(dimension)
+    return result
+
+
+def _merge_last_axes(values):
+    """Reshape ``values`` to merge its last two axes together"""
+    new_shape: List[int] = []
+    for i in range(len(values.shape) - 2):
+        new_shape.append(values.shape[i])
+    new_shape.append(values.shape[-2] * values.shape[-1])
+    return values.reshape(new_shape)
+
+
+def _split_last_axis(values, first: int, second: int):
+    """Reshape ``values`` to split its last axis in two axes of size ``first`` and
+    ``second``"""
+    new_shape: List[int] = []
+    for i in range(len(values.shape) - 1):
+        new_shape.append(values.shape[i])
+    new_shape.append(first)
+    new_shape.append(second)
+    return values.reshape(new_shape)
+
+
+def _components_to_properties_block(
+    block: TensorBlock, dimensions: List[str]
+) -> TensorBlock:
+    component_axis = -1
+    for i, component in enumerate(block.components):
+        if component.names == dimensions:
+            component_axis = i
+            break
+
+    if component_axis == -1:
+        raise ValueError(
+            f"unable to find [{', '.join(dimensions)}] in the components of the block"
+        )
+
+    moved_component = block.components[component_axis]
+    properties = block.properties
+
+    # new properties are the product of the moved component (outer dimension) and the
+    # old properties (inner dimension), matching the memory layout of the values below
+    indices = _dispatch.indices_like(
+        [len(moved_component), len(properties)], properties.values
+    )
+    new_properties = Labels(
+        names=moved_component.names + properties.names,
+        values=_dispatch.concatenate(
+            [
+                _dispatch.take(moved_component.values, indices[:, 0], axis=0),
+                _dispatch.take(properties.values, indices[:, 1], axis=0),
+            ],
+            axis=1,
+        ),
+    )
+
+    new_components: List[Labels] = []
+    for i, component in enumerate(block.components):
+        if i != component_axis:
+            new_components.append(component)
+
+    # Moving the component axis to be the last one before properties only creates a
+    # view. The reshape then copies the data once, or not at all if the moved component
+    # was already the last one and the values are contiguous.
+    values = _dispatch.moveaxis(block.values, component_axis + 1, -2)
+    new_block = TensorBlock(
+        values=_merge_last_axes(values),
+        samples=block.samples,
+        components=new_components,
+        properties=new_properties,
+    )
+
+    for parameter, gradient in block.gradients():
+        if len(gradient.gradients_list()) != 0:
+            raise NotImplementedError("gradients of gradients are not supported")
+
+        # gradients have extra components before the ones of the block
+        gradient_axis = len(gradient.components) - len(block.components)
+        gradient_axis += component_axis
+
+        new_gradient_components: List[Labels] = []
+        for i, component in enumerate(gradient.components):
+            if i != gradient_axis:
+                new_gradient_components.append(component)
+
+        values = _dispatch.moveaxis(gradient.values, gradient_axis + 1, -2)
+        new_block.add_gradient(
+            parameter=parameter,
+            gradient=TensorBlock(
+                values=_merge_last_axes(values),
+                samples=gradient.samples,
+                components=new_gradient_components,
+                properties=new_properties,
+            ),
+        )
+
+    return new_block
+
+
+@torch_jit_script
+def components_to_properties(
+    tensor: TensorMap, dimensions: Union[str, List[str]]
+) -> TensorMap:
+    """
+    Move the component with the given ``dimensions`` names to the properties, for all
+    blocks in ``tensor``.
+
+    The new properties are the product of the moved component and the old properties,
+    with the component entries varying the slowest. This produces the same result as
+    :py:meth:`TensorMap.components_to_properties`, but all the data movement happens
+    directly on the arrays: the component axis is moved next to the properties (which
+    only creates a view) and the last two axes are merged with a single reshape. No
+    data is copied at all if the moved component is already the last one and the
+    values are contiguous.
+
+    >>> import numpy as np
+    >>> import metatensor
+    >>> from metatensor import Labels, TensorBlock, TensorMap
+    >>> block = TensorBlock(
+    ...     values=np.arange(12.0).reshape(2, 3, 2),
+    ...     samples=Labels.range("sample", 2),
+    ...     components=[Labels.range("xyz", 3)],
+    ...     properties=Labels.range("n", 2),
+    ... )
+    >>> tensor = TensorMap(Labels.single(), [block])
+    >>> tensor = metatensor.components_to_properties(tensor, "xyz")
+    >>> tensor.block().properties.names
+    ['xyz', 'n']
+    >>> print(tensor.block().values)
+    [[ 0.  1.  2.  3.  4.  5.]
+     [ 6.  7.  8.  9. 10. 11.]]
+
+    :param tensor: input :py:class:`TensorMap`
+    :param dimensions: names of the component to move to the properties. All the
+        dimensions of a given component must be moved at once.
+
+    :return: a new :py:class:`TensorMap` with the component moved to the properties
+    """
+    if not torch_jit_is_scripting():
+        if not is_metatensor_class(tensor, TensorMap):
+            raise TypeError(
+                f"`tensor` must be a metatensor TensorMap, not {type(tensor)}"
+            )
+
+    dimensions = _normalize_dimensions(dimensions)
+
+    blocks: List[TensorBlock] = []
+    for block in tensor.blocks():
+        blocks.append(_components_to_properties_block(block, dimensions))
+
+    return TensorMap(tensor.keys, blocks)
+
+
+def _split_properties(
+    properties: Labels, dimension: str
+) -> Tuple[Labels, Labels, bool, Array]:
+    """
+    Split ``properties`` into a new component containing ``dimension`` and the new
+    properties containing the remaining dimensions. This returns the new component,
+    the new properties, whether the values need to be re-ordered along the properties
+    axis and the corresponding order.
+    """
+    if dimension not in properties.names:
+        raise ValueError(f"'{dimension}' is not part of the properties of the block")
+
+    remaining: List[str] = []
+    for name in properties.names:
+        if name != dimension:
+            remaining.append(name)
+
+    if len(remaining) == 0:
+        raise ValueError("can not move the only properties dimension to a component")
+
+    component_values, component_index = _dispatch.unique_with_inverse(
+        properties.view(dimension).values, axis=0
+    )
+    remaining_values, remaining_index = _dispatch.unique_with_inverse(
+        properties.view(remaining).values, axis=0
+    )
+
+    n_components = component_values.shape[0]
+    n_remaining = remaining_values.shape[0]
+    if n_components * n_remaining != len(properties):
+        raise ValueError(
+            f"the properties must contain all the combinations of '{dimension}' and "
+            "the remaining dimensions to be able to move it to a component"
+        )
+
+    # position of each property in the (component, remaining) grid, and the inverse
+    # permutation to gather the values in this order
+    target = component_index.reshape(-1) * n_remaining + remaining_index.reshape(-1)
+    positions = _dispatch.indices_like([len(properties)], target).reshape(-1)
+    order = _dispatch.empty_like(target, [len(properties)])
+    order[target] = positions
+
+    reorder = not bool(_dispatch.all(target == positions))
+
+    component = Labels(names=[dimension], values=component_values)
+    new_properties = Labels(names=remaining, values=remaining_values)
+    return component, new_properties, reorder, order
+
+
+@torch_jit_script
+def properties_to_components(tensor: TensorMap, dimension: str) -> TensorMap:
+    """
+    Move the given properties ``dimension`` to a new component, for all blocks in
+    ``tensor``. This is the inverse of :py:func:`components_to_properties`.
+
+    The new component is added after all the existing components, and contains the
+    unique values taken by ``dimension`` in the properties. The new properties contain
+    the unique values of the remaining dimensions. Both are sorted, and the properties
+    of each block must contain all the combinations of these values.
+
+    The values are re-ordered (with a single copy) only if the properties are not
+    already sorted with ``dimension`` varying the slowest, e.g. when they come from
+    :py:func:`components_to_properties`. Otherwise, only a reshape is needed.
+
+    >>> import numpy as np
+    >>> import metatensor
+    >>> from metatensor import Labels, TensorBlock, TensorMap
+    >>> block = TensorBlock(
+    ...     values=np.arange(12.0).reshape(2, 6),
+    ...     samples=Labels.range("sample", 2),
+    ...     components=[],
+    ...     properties=Labels(
+    ...         ["xyz", "n"],
+    ...         np.array([[0, 0], [0, 1], [1, 0], [1, 1], [2, 0], [2, 1]]),
+    ...     ),
+    ... )
+    >>> tensor = TensorMap(Labels.single(), [block])
+    >>> tensor = metatensor.properties_to_components(tensor, "xyz")
+    >>> tensor.block().components
+    [Labels(
+        xyz
+         0
+         1
+         2
+    )]
+    >>> tensor.block().values.shape
+    (2, 3, 2)
+
+    :param tensor: input :py:class:`TensorMap`
+    :param dimension: name of the properties dimension to move to the new component
+
+    :return: a new :py:class:`TensorMap` with the properties dimension moved to a new
+        component
+    """
+    if not torch_jit_is_scripting():
+        if not is_metatensor_class(tensor, TensorMap):
+            raise TypeError(
+                f"`tensor` must be a metatensor TensorMap, not {type(tensor)}"
+            )
+
+    blocks: List[TensorBlock] = []
+    for block in tensor.blocks():
+        component, new_properties, reorder, order = _split_properties(
+            block.properties, dimension
+        )
+
+        values = block.values
+        if reorder:
+            values = _dispatch.take(values, order, axis=-1)
+
+        new_block = TensorBlock(
+            values=_split_last_axis(values, len(component), len(new_properties)),
+            samples=block.samples,
+            components=block.components + [component],
+            properties=new_properties,
+        )
+
+        for parameter, gradient in block.gradients():
+            if len(gradient.gradients_list()) != 0:
+                raise NotImplementedError("gradients of gradients are not supported")
+
+            values = gradient.values
+            if reorder:
+                values = _dispatch.take(values, order, axis=-1)
+
+            new_block.add_gradient(
+                parameter=parameter,
+                gradient=TensorBlock(
+                    values=_split_last_axis(
+                        values, len(component), len(new_properties)
+                    ),
+                    samples=gradient.samples,
+                    components=gradient.components + [component],
+                    properties=new_properties,
+                ),
+            )
+
+        blocks.append(new_block)
+
+    return TensorMap(tensor.keys, blocks)
@@ -1,4 +1,4 @@
-from typing import List, Union
+from typing import List, Tuple, Union
 
 from . import _dispatch
 from ._backend import (
@@ -12,7 +12,10 @@ from ._utils import (
     _check_blocks_raise,
     _check_same_gradients_raise,
     _check_same_keys_raise,
+    _matching_blocks,
 )
+from .map_blocks import _map_blocks_impl, _use_parallel_blocks
+from .pack import _from_packed_buffer, _packed_elementwise
 
 
 def _divide_block_constant(block: TensorBlock, constant: float) -> TensorBlock:
@@ -140,12 +143,25 @@ def divide(A: TensorMap, B: Union[float, int, TensorMap]) -> TensorMap:
 
     if isinstance(B, (float, int)):
         B = float(B)
+        if not torch_jit_is_scripting():
+            buffer = _packed_elementwise(A, gradients_too=True)
+            if buffer is not None:
+                return _from_packed_buffer(A, buffer / B)
+
+            if _use_parallel_blocks(len(A)):
+                blocks = _map_blocks_impl(
+                    _divide_block_constant, [(block_A, B) for block_A in A.blocks()]
+                )
+                return TensorMap(A.keys, blocks)
+
         for block_A in A.blocks():
             blocks.append(_divide_block_constant(block=block_A, constant=B))
     elif is_tensor_map:
         _check_same_keys_raise(A, B, "divide")
-        for key, block_A in A.items():
-            block_B = B.block(key)
+        pairs: List[Tuple[TensorBlock, TensorBlock]] = []
+        blocks_B = _matching_blocks(A, B)
+        for i, block_A in enumerate(A.blocks()):
+            block_B = blocks_B[i]
             _check_blocks_raise(
                 block_A,
                 block_B,
@@ -156,6 +172,14 @@ def divide(A: TensorMap, B: Union[float, int, TensorMap]) -> TensorMap:
                 block_B,
                 fname="divide",
             )
+            pairs.append((block_A, block_B))
+
+        if not torch_jit_is_scripting():
+            if _use_parallel_blocks(len(pairs)):
+                blocks = _map_blocks_impl(_divide_block_block, pairs)
+                return TensorMap(A.keys, blocks)
+
+        for block_A, block_B in pairs:
             blocks.append(_divide_block_block(block_1=block_A, block_2=block_B))
     else:
         if torch_jit_is_scripting():
@@ -1,8 +1,9 @@
-from typing import List
+from typing import List, Tuple
 
 from . import _dispatch
-from ._backend import TensorBlock, TensorMap, torch_jit_script
-from ._utils import _check_same_keys_raise
+from ._backend import TensorBlock, TensorMap, torch_jit_is_scripting, torch_jit_script
+from ._utils import _check_same_keys_raise, _matching_blocks
+from .map_blocks import _map_blocks_impl, _use_parallel_blocks
 
 
 def _dot_block(block_1: TensorBlock, block_2: TensorBlock) -> TensorBlock:
@@ -114,9 +115,17 @@ def dot(tensor_1: TensorMap, tensor_2: TensorMap) -> TensorMap:
     """
     _check_same_keys_raise(tensor_1, tensor_2, "dot")
 
+    pairs: List[Tuple[TensorBlock, TensorBlock]] = []
+    blocks_2 = _matching_blocks(tensor_1, tensor_2)
+    for i, block_1 in enumerate(tensor_1.blocks()):
+        pairs.append((block_1, blocks_2[i]))
+
+    if not torch_jit_is_scripting():
+        if _use_parallel_blocks(len(pairs)):
+            return TensorMap(tensor_1.keys, _map_blocks_impl(_dot_block, pairs))
+
     blocks: List[TensorBlock] = []
-    for key, block_1 in tensor_1.items():
-        block_2 = tensor_2.block(key)
+    for block_1, block_2 in pairs:
         blocks.append(_dot_block(block_1=block_1, block_2=block_2))
 
     return TensorMap(tensor_1.keys, blocks)
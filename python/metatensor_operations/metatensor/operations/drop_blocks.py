@@ -9,6 +9,7 @@ from ._backend import (
     torch_jit_is_scripting,
     torch_jit_script,
 )
+from ._utils import _shallow_copy_block
 
 
 @torch_jit_script
@@ -43,54 +44,26 @@ def drop_blocks(tensor: TensorMap, keys: Labels, copy: bool = False) -> TensorMa
     # Find the indices of keys to remove
     tensor_keys = tensor.keys
     to_remove_indices: List[int] = tensor_keys.select(keys).tolist()
+    removed: List[bool] = [False] * len(tensor_keys)
+    for i in to_remove_indices:
+        removed[i] = True
 
     # Create the new TensorMap
+    kept: List[int] = []
     new_blocks: List[TensorBlock] = []
-    new_keys_values = []
     for i in range(len(tensor_keys)):
-        if i in to_remove_indices:
+        if removed[i]:
             continue
 
-        new_keys_values.append(tensor_keys.entry(i).values)
-        block = tensor[i]
+        kept.append(i)
+        block = tensor.block_by_id(i)
 
         if copy:
             new_blocks.append(block.copy())
         else:
-            # just increase the reference count on everything
-            new_block = TensorBlock(
-                values=block.values,
-                samples=block.samples,
-                components=block.components,
-                properties=block.properties,
-            )
-
-            for parameter, gradient in block.gradients():
-                if len(gradient.gradients_list()) != 0:
-                    raise NotImplementedError(
-                        "gradients of gradients are not supported"
-                    )
-
-                new_block.add_gradient(
-                    parameter=parameter,
-                    gradient=TensorBlock(
-                        values=gradient.values,
-                        samples=gradient.samples,
-                        components=gradient.components,
-                        properties=new_block.properties,
-                    ),
-                )
-
-            new_blocks.append(new_block)
+            new_blocks.append(_shallow_copy_block(block))
 
-    if len(new_keys_values) != 0:
-        new_keys = Labels(tensor_keys.names, _dispatch.stack(new_keys_values, 0))
-    else:
-        new_keys = Labels(
-            names=tensor_keys.names,
-            values=_dispatch.empty_like(
-                tensor_keys.values, (0, len(tensor_keys.names))
-            ),
-        )
+    kept_indices = _dispatch.int_array_like(kept, tensor_keys.values)
+    new_keys = Labels(tensor_keys.names, tensor_keys.values[kept_indices])
 
     return TensorMap(keys=new_keys, blocks=new_blocks)
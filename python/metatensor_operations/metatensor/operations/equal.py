@@ -5,6 +5,7 @@ from ._utils import (
     _check_blocks_impl,
     _check_same_gradients_impl,
     _check_same_keys_impl,
+    _matching_blocks,
 )
 
 
@@ -14,9 +15,15 @@ def _equal_impl(tensor_1: TensorMap, tensor_2: TensorMap) -> str:
     if message != "":
         return f"the tensor maps have different keys: {message}"
 
-    for key, block_1 in tensor_1.items():
-        message = _equal_block_impl(block_1=block_1, block_2=tensor_2.block(key))
+    keys = tensor_1.keys
+    blocks_2 = _matching_blocks(tensor_1, tensor_2)
+
+    for i in range(len(keys)):
+        message = _equal_block_impl(
+            block_1=tensor_1.block_by_id(i), block_2=blocks_2[i]
+        )
         if message != "":
+            key = keys.entry(i)
             return f"blocks for key {key.print()} are different: {message}"
     return ""
 
@@ -26,9 +33,8 @@ def _equal_block_impl(block_1: TensorBlock, block_2: TensorBlock) -> str:
     if not block_1.values.shape == block_2.values.shape:
         return "values shapes are different"
 
-    if not _dispatch.all(block_1.values == block_2.values):
-        return "values are not equal"
-
+    # check all the metadata first, since this is a lot cheaper than comparing the
+    # values for large blocks
     check_blocks_message = _check_blocks_impl(block_1, block_2, fname="equal")
     if check_blocks_message != "":
         return check_blocks_message
@@ -39,10 +45,13 @@ def _equal_block_impl(block_1: TensorBlock, block_2: TensorBlock) -> str:
     if check_same_gradient_message != "":
         return check_same_gradient_message
 
+    if not _dispatch.array_equal(block_1.values, block_2.values):
+        return "values are not equal"
+
     for parameter, gradient1 in block_1.gradients():
         gradient2 = block_2.gradient(parameter)
 
-        if not _dispatch.all(gradient1.values == gradient2.values):
+        if not _dispatch.array_equal(gradient1.values, gradient2.values):
             return f"gradient '{parameter}' values are not equal"
     return ""
 
@@ -16,6 +16,7 @@ from ._utils import (
     _check_blocks_impl,
     _check_same_gradients_impl,
     _check_same_keys_impl,
+    _matching_blocks,
 )
 
 
@@ -34,8 +35,11 @@ def _equal_metadata_impl(
     if message != "":
         return message
 
-    for key in [tensor_1.keys[i] for i in range(len(tensor_1.keys))]:
-        message = _equal_metadata_block_impl(tensor_1[key], tensor_2[key], check=check)
+    blocks_2 = _matching_blocks(tensor_1, tensor_2)
+    for i in range(len(blocks_2)):
+        message = _equal_metadata_block_impl(
+            tensor_1.block_by_id(i), blocks_2[i], check=check
+        )
         if message != "":
             return message
 
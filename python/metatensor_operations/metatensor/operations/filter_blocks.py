@@ -9,6 +9,7 @@ from ._backend import (
     torch_jit_is_scripting,
     torch_jit_script,
 )
+from ._utils import _shallow_copy_block
 
 
 @torch_jit_script
@@ -56,31 +57,7 @@ def filter_blocks(tensor: TensorMap, keys: Labels, copy: bool = False) -> Tensor
         if copy:
             new_blocks.append(block.copy())
         else:
-            # just increase the reference count on everything
-            new_block = TensorBlock(
-                values=block.values,
-                samples=block.samples,
-                components=block.components,
-                properties=block.properties,
-            )
-
-            for parameter, gradient in block.gradients():
-                if len(gradient.gradients_list()) != 0:
-                    raise NotImplementedError(
-                        "gradients of gradients are not supported"
-                    )
-
-                new_block.add_gradient(
-                    parameter=parameter,
-                    gradient=TensorBlock(
-                        values=gradient.values,
-                        samples=gradient.samples,
-                        components=gradient.components,
-                        properties=new_block.properties,
-                    ),
-                )
-
-            new_blocks.append(new_block)
+            new_blocks.append(_shallow_copy_block(block))
 
     if len(new_keys_values) != 0:
         new_keys = Labels(tensor_keys.names, _dispatch.stack(new_keys_values, 0))
@@ -9,7 +9,7 @@ from ._backend import (
     torch_jit_is_scripting,
     torch_jit_script,
 )
-from ._utils import _check_same_keys_raise
+from ._utils import _check_same_keys_raise, _matching_blocks, _shallow_copy_block
 from .manipulate_dimension import remove_dimension
 
 
@@ -21,8 +21,9 @@ def _disjoint_tensor_labels(tensors: List[TensorMap], axis: str) -> bool:
     """
     for i_tensor, first_tensor in enumerate(tensors[:-1]):
         for second_tensor in tensors[i_tensor + 1 :]:
-            for key, first_block in first_tensor.items():
-                second_block = second_tensor.block(key)
+            second_blocks = _matching_blocks(first_tensor, second_tensor)
+            for i_block, first_block in enumerate(first_tensor.blocks()):
+                second_block = second_blocks[i_block]
                 if axis == "samples":
                     first_labels = first_block.samples
                     second_labels = second_block.samples
@@ -65,7 +66,8 @@ def _tensors_intersection(tensors: List[TensorMap]) -> List[TensorMap]:
     for tensor in tensors:
         new_blocks: List[TensorBlock] = []
         for i_key in range(all_keys.values.shape[0]):
-            new_blocks.append(tensor.block(all_keys.entry(i_key)).copy())
+            block = tensor.block(all_keys.entry(i_key))
+            new_blocks.append(_shallow_copy_block(block))
         new_tensors.append(TensorMap(keys=all_keys, blocks=new_blocks))
 
     return new_tensors
@@ -93,7 +95,7 @@ def _tensors_union(tensors: List[TensorMap], axis: str) -> List[TensorMap]:
         )
 
         new_keys = tensor.keys.union(missing_keys)
-        new_blocks = [block.copy() for block in tensor.blocks()]
+        new_blocks = [_shallow_copy_block(block) for block in tensor.blocks()]
 
         for i_key in range(missing_keys.values.shape[0]):
             key = missing_keys.entry(i_key)
@@ -185,6 +187,235 @@ def _tensors_union(tensors: List[TensorMap], axis: str) -> List[TensorMap]:
     return new_tensors
 
 
+def _join_keys(tensors: List[TensorMap], different_keys: str) -> Labels:
+    """Get the keys of the joined tensor, according to ``different_keys``"""
+    keys = tensors[0].keys
+    if different_keys == "error":
+        for tensor in tensors[1:]:
+            _check_same_keys_raise(tensors[0], tensor, "join")
+    elif different_keys == "intersection":
+        for tensor in tensors[1:]:
+            keys = keys.intersection(tensor.keys)
+    elif different_keys == "union":
+        for tensor in tensors[1:]:
+            keys = keys.union(tensor.keys)
+    else:
+        raise ValueError(
+            f"'{different_keys}' is not a valid option for `different_keys`. Choose "
+            "either 'error', 'intersection' or 'union'."
+        )
+
+    return keys
+
+
+def _check_same_metadata_join_samples(
+    block: TensorBlock,
+    sample_names: List[str],
+    properties: Labels,
+    components: List[Labels],
+    gradients: List[str],
+):
+    if block.samples.names != sample_names:
+        raise ValueError(
+            "Sample names are not the same! Joining along samples with different "
+            "sample names will loose information and is not supported."
+        )
+
+    if block.properties != properties:
+        raise ValueError(
+            "all blocks with the same key must have the same properties to be joined "
+            "along samples"
+        )
+
+    block_components = block.components
+    same_components = len(block_components) == len(components)
+    if same_components:
+        for i, component in enumerate(block_components):
+            if component != components[i]:
+                same_components = False
+
+    if not same_components:
+        raise ValueError(
+            "all blocks with the same key must have the same components to be joined "
+            "along samples"
+        )
+
+    if block.gradients_list() != gradients:
+        raise ValueError(
+            "all blocks with the same key must have the same gradients to be joined "
+            "along samples"
+        )
+
+
+def _join_samples(
+    tensors: List[TensorMap],
+    different_keys: str,
+    sort_samples: bool,
+    remove_tensor_name: bool,
+) -> TensorMap:
+    """
+    Join ``tensors`` along the samples. This gives the same result as moving a
+    ``tensor`` key dimension to the samples, but directly computes the new samples and
+    concatenates the values and gradients for each key, without creating a temporary
+    :py:class:`TensorMap`.
+    """
+    keys = _join_keys(tensors, different_keys)
+
+    # position of the block corresponding to each key in each tensor, or -1 if the key
+    # is missing (with `different_keys="union"`). Most of the time, all tensors have
+    # the same keys in the same order, and we don't need to look them up.
+    blocks_ids: List[List[int]] = []
+    for tensor in tensors:
+        if tensor.keys == keys:
+            blocks_ids.append(list(range(len(keys))))
+        else:
+            ids: List[int] = []
+            for i_key in range(len(keys)):
+                position = tensor.keys.position(keys.entry(i_key))
+                if position is None:
+                    ids.append(-1)
+                else:
+                    ids.append(position)
+            blocks_ids.append(ids)
+
+    all_disjoint = True
+    first_blocks: List[TensorBlock] = []
+    new_samples_list = []
+    new_values_list = []
+    new_gradients_list: List[List[TensorBlock]] = []
+    for i_key in range(len(keys)):
+        tensor_ids: List[int] = []
+        key_blocks: List[TensorBlock] = []
+        for i_tensor, tensor in enumerate(tensors):
+            block_id = blocks_ids[i_tensor][i_key]
+            if block_id != -1:
+                tensor_ids.append(i_tensor)
+                key_blocks.append(tensor.block_by_id(block_id))
+
+        first = key_blocks[0]
+        sample_names = first.samples.names
+        properties = first.properties
+        components = first.components
+        gradients = first.gradients_list()
+        for block in key_blocks[1:]:
+            _check_same_metadata_join_samples(
+                block, sample_names, properties, components, gradients
+            )
+
+        # the new samples are the concatenation of the samples of all blocks, with an
+        # additional dimension containing the index of the corresponding tensor
+        samples_parts = []
+        tensor_parts = []
+        values_parts = []
+        offsets: List[int] = []
+        n_samples = 0
+        for i_block, block in enumerate(key_blocks):
+            samples = block.samples.values
+            samples_parts.append(samples)
+            tensor_parts.append(
+                _dispatch.zeros_like(samples, shape=[samples.shape[0], 1])
+                + tensor_ids[i_block]
+            )
+            values_parts.append(block.values)
+            offsets.append(n_samples)
+            n_samples += samples.shape[0]
+
+        new_samples = _dispatch.concatenate(
+            [
+                _dispatch.concatenate(samples_parts, axis=0),
+                _dispatch.concatenate(tensor_parts, axis=0),
+            ],
+            axis=1,
+        )
+        new_values = _dispatch.concatenate(values_parts, axis=0)
+
+        if sort_samples:
+            order = _dispatch.argsort_labels_values(new_samples)
+            new_samples = new_samples[order]
+            new_values = new_values[order]
+
+            # new position of the samples, used to update the gradients
+            new_positions = _dispatch.empty_like(order, shape=[n_samples])
+            new_positions[order] = _dispatch.indices_like([n_samples], order).reshape(
+                -1
+            )
+        else:
+            new_positions = _dispatch.empty_like(new_samples, shape=[0])
+
+        if remove_tensor_name and all_disjoint:
+            unique_samples = _dispatch.unique(new_samples[:, :-1], axis=0)
+            all_disjoint = unique_samples.shape[0] == n_samples
+
+        new_gradients: List[TensorBlock] = []
+        for parameter in gradients:
+            gradient_samples_parts = []
+            gradient_values_parts = []
+            for i_block, block in enumerate(key_blocks):
+                gradient = block.gradient(parameter)
+                if len(gradient.gradients_list()) != 0:
+                    raise NotImplementedError(
+                        "gradients of gradients are not supported"
+                    )
+
+                gradient_samples = _dispatch.copy(gradient.samples.values)
+                gradient_samples[:, 0] += offsets[i_block]
+                gradient_samples_parts.append(gradient_samples)
+                gradient_values_parts.append(gradient.values)
+
+            gradient_samples = _dispatch.concatenate(gradient_samples_parts, axis=0)
+            gradient_values = _dispatch.concatenate(gradient_values_parts, axis=0)
+
+            if sort_samples:
+                gradient_samples[:, 0] = new_positions[
+                    _dispatch.to_index_array(gradient_samples[:, 0])
+                ]
+
+            # the gradient samples are always sorted after joining
+            order = _dispatch.argsort_labels_values(gradient_samples)
+            gradient = first.gradient(parameter)
+            new_gradients.append(
+                TensorBlock(
+                    values=gradient_values[order],
+                    samples=Labels(gradient.samples.names, gradient_samples[order]),
+                    components=gradient.components,
+                    properties=properties,
+                )
+            )
+
+        first_blocks.append(first)
+        new_samples_list.append(new_samples)
+        new_values_list.append(new_values)
+        new_gradients_list.append(new_gradients)
+
+    # the blocks are only created once we know if the "tensor" dimension can be
+    # removed from all of them
+    remove_tensor = remove_tensor_name and all_disjoint
+
+    blocks: List[TensorBlock] = []
+    for i_key, first in enumerate(first_blocks):
+        new_samples = new_samples_list[i_key]
+        if remove_tensor:
+            samples = Labels(first.samples.names, new_samples[:, :-1])
+        else:
+            samples = Labels(first.samples.names + ["tensor"], new_samples)
+
+        new_block = TensorBlock(
+            values=new_values_list[i_key],
+            samples=samples,
+            components=first.components,
+            properties=first.properties,
+        )
+
+        for i_gradient, parameter in enumerate(first.gradients_list()):
+            new_block.add_gradient(
+                parameter=parameter, gradient=new_gradients_list[i_key][i_gradient]
+            )
+
+        blocks.append(new_block)
+
+    return TensorMap(keys, blocks)
+
+
 @torch_jit_script
 def join(
     tensors: List[TensorMap],
@@ -371,6 +602,14 @@ def join(
     if len(tensors) == 1:
         return tensors[0]
 
+    if axis == "samples":
+        return _join_samples(
+            tensors,
+            different_keys=different_keys,
+            sort_samples=sort_samples,
+            remove_tensor_name=remove_tensor_name,
+        )
+
     if different_keys == "error":
         for ts_to_join in tensors[1:]:
             _check_same_keys_raise(tensors[0], ts_to_join, "join")
@@ -384,12 +623,9 @@ def join(
             "either 'error', 'intersection' or 'union'."
         )
 
-    # Deduce if sample/property names are the same in all tensors.
+    # Deduce if property names are the same in all tensors.
     # If this is not the case we have to change unify the corresponding labels later.
-    if axis == "samples":
-        names_list = [tensor.sample_names for tensor in tensors]
-    else:
-        names_list = [tensor.property_names for tensor in tensors]
+    names_list = [tensor.property_names for tensor in tensors]
 
     names_list_flattened: List[str] = []
     for names in names_list:
@@ -399,13 +635,6 @@ def join(
     length_equal = [len(unique_names) == len(names) for names in names_list]
     names_are_same = sum(length_equal) == len(length_equal)
 
-    # It's fine to lose metadata on the property axis, less so on the sample axis!
-    if axis == "samples" and not names_are_same:
-        raise ValueError(
-            "Sample names are not the same! Joining along samples with different "
-            "sample names will loose information and is not supported."
-        )
-
     keys = tensors[0].keys
     n_tensors = len(tensors)
     n_keys_dimensions = 1 + keys.values.shape[1]
@@ -427,8 +656,6 @@ def join(
     blocks: List[TensorBlock] = []
     for tensor in tensors:
         for block in tensor.blocks():
-            # We would already raised an error if `axis == "samples"`. Therefore, we can
-            # neglect the check for `axis == "properties"`.
             if names_are_same:
                 properties = block.properties
             else:
@@ -466,10 +693,7 @@ def join(
 
     tensor = TensorMap(keys=keys, blocks=blocks)
 
-    if axis == "samples":
-        tensor_joined = tensor.keys_to_samples("tensor", sort_samples=sort_samples)
-    else:
-        tensor_joined = tensor.keys_to_properties("tensor", sort_samples=sort_samples)
+    tensor_joined = tensor.keys_to_properties("tensor", sort_samples=sort_samples)
 
     if remove_tensor_name and _disjoint_tensor_labels(tensors, axis):
         return remove_dimension(tensor_joined, name="tensor", axis=axis)
@@ -0,0 +1,415 @@
+"""
+Record chains of element-wise operations on :py:class:`TensorMap`, and evaluate them
+for each block in a single pass, without creating intermediate :py:class:`TensorMap`.
+
+This module is only available in pure Python mode, and can not be used from
+TorchScript.
+"""
+
+from typing import Dict, List, Optional, Tuple, Union
+
+from . import _dispatch
+from ._backend import TensorBlock, TensorMap, is_metatensor_class
+from ._utils import (
+    _check_blocks_raise,
+    _check_same_gradients_raise,
+    _check_same_keys_raise,
+    _matching_blocks,
+)
+
+
+class _Node:
+    """A node in the expression tree of a :py:class:`LazyTensorMap`"""
+
+    def __init__(self, operation: str, operands: Tuple):
+        # operation is one of "tensor", "scalar", "add", "subtract", "multiply",
+        # "divide", "pow" or "negate"
+        self.operation = operation
+        self.operands = operands
+
+
+class _BlockEvaluator:
+    """
+    Evaluate an expression tree for the blocks corresponding to a single key. The
+    gradients of the leaves are all required to have the same metadata, so we only
+    need to track the gradient values.
+    """
+
+    def __init__(self, blocks: Dict[int, TensorBlock], first: TensorBlock):
+        # blocks for each "tensor" node, indexed by the node id
+        self.blocks = blocks
+        self.parameters = first.gradients_list()
+
+        # shape of the values used to broadcast them to the gradients shape, and
+        # indices of the values corresponding to each gradient sample
+        self._broadcast_shapes: Dict[str, List[int]] = {}
+        self._gradient_samples = {}
+
+        values_shape = list(first.values.shape[1:])
+        for parameter in self.parameters:
+            gradient = first.gradient(parameter)
+            diff_components = len(gradient.values.shape) - len(first.values.shape)
+            self._broadcast_shapes[parameter] = (
+                [-1] + [1] * diff_components + values_shape
+            )
+            self._gradient_samples[parameter] = _dispatch.to_index_array(
+                gradient.samples.column("sample")
+            )
+
+    def _at_gradient_samples(self, values, parameter: str):
+        """Get the ``values`` corresponding to each sample of this gradient"""
+        return values[self._gradient_samples[parameter]].reshape(
+            self._broadcast_shapes[parameter]
+        )
+
+    def evaluate(self, node: _Node):
+        """
+        Get the values and gradients for this ``node``. The gradients are stored in a
+        dictionary indexed by parameter, and set to :py:obj:`None` for constant
+        expressions.
+        """
+        if node.operation == "tensor":
+            block = self.blocks[id(node)]
+            gradients = {p: block.gradient(p).values for p in self.parameters}
+            return block.values, gradients
+
+        elif node.operation == "scalar":
+            return node.operands[0], {p: None for p in self.parameters}
+
+        elif node.operation == "negate":
+            values, gradients = self.evaluate(node.operands[0])
+            return -values, {p: _negate(g) for p, g in gradients.items()}
+
+        elif node.operation == "pow":
+            values, gradients = self.evaluate(node.operands[0])
+            exponent = node.operands[1]
+
+            new_gradients = {}
+            for parameter, gradient in gradients.items():
+                if gradient is None:
+                    new_gradients[parameter] = None
+                else:
+                    at_samples = self._at_gradient_samples(values, parameter)
+                    new_gradients[parameter] = (
+                        exponent * gradient * at_samples ** (exponent - 1)
+                    )
+
+            return values**exponent, new_gradients
+
+        values_1, gradients_1 = self.evaluate(node.operands[0])
+        values_2, gradients_2 = self.evaluate(node.operands[1])
+
+        new_gradients = {}
+        if node.operation == "add":
+            for parameter in self.parameters:
+                new_gradients[parameter] = _add(
+                    gradients_1[parameter], gradients_2[parameter]
+                )
+            return values_1 + values_2, new_gradients
+
+        elif node.operation == "subtract":
+            for parameter in self.parameters:
+                new_gradients[parameter] = _add(
+                    gradients_1[parameter], _negate(gradients_2[parameter])
+                )
+            return values_1 - values_2, new_gradients
+
+        elif node.operation == "multiply":
+            for parameter in self.parameters:
+                # d(a * b) = da * b + a * db
+                gradient_1 = gradients_1[parameter]
+                if gradient_1 is not None:
+                    gradient_1 = gradient_1 * self._maybe_at_gradient_samples(
+                        values_2, parameter, node.operands[1]
+                    )
+
+                gradient_2 = gradients_2[parameter]
+                if gradient_2 is not None:
+                    gradient_2 = gradient_2 * self._maybe_at_gradient_samples(
+                        values_1, parameter, node.operands[0]
+                    )
+
+                new_gradients[parameter] = _add(gradient_1, gradient_2)
+            return values_1 * values_2, new_gradients
+
+        elif node.operation == "divide":
+            for parameter in self.parameters:
+                # d(a / b) = da / b - a * db / b^2
+                values_2_at_samples = self._maybe_at_gradient_samples(
+                    values_2, parameter, node.operands[1]
+                )
+
+                gradient_1 = gradients_1[parameter]
+                if gradient_1 is not None:
+                    gradient_1 = gradient_1 / values_2_at_samples
+
+                gradient_2 = gradients_2[parameter]
+                if gradient_2 is not None:
+                    values_1_at_samples = self._maybe_at_gradient_samples(
+                        values_1, parameter, node.operands[0]
+                    )
+                    gradient_2 = (
+                        -values_1_at_samples * gradient_2 / values_2_at_samples**2
+                    )
+
+                new_gradients[parameter] = _add(gradient_1, gradient_2)
+            return values_1 / values_2, new_gradients
+
+        else:
+            raise ValueError(f"unknown operation '{node.operation}'")
+
+    def _maybe_at_gradient_samples(self, values, parameter: str, node: _Node):
+        if node.operation == "scalar":
+            return values
+        else:
+            return self._at_gradient_samples(values, parameter)
+
+
+def _add(gradient_1, gradient_2):
+    if gradient_1 is None:
+        return gradient_2
+    elif gradient_2 is None:
+        return gradient_1
+    else:
+        return gradient_1 + gradient_2
+
+
+def _negate(gradient):
+    if gradient is None:
+        return None
+    else:
+        return -gradient
+
+
+def _as_node(value) -> Optional[_Node]:
+    if isinstance(value, LazyTensorMap):
+        return value._node
+    elif is_metatensor_class(value, TensorMap):
+        return _Node("tensor", (value,))
+    elif isinstance(value, (float, int)):
+        return _Node("scalar", (float(value),))
+    else:
+        return None
+
+
+class LazyTensorMap:
+    """
+    A deferred :py:class:`TensorMap`, recording a chain of element-wise operations
+    instead of executing them directly. Use :py:func:`metatensor.lazy` to create one.
+
+    The operators ``+``, ``-``, ``*``, ``/`` and unary ``-`` are supported between
+    :py:class:`LazyTensorMap`, :py:class:`TensorMap` and scalars, as well as ``**``
+    with a scalar exponent. They follow the same rules as :py:func:`add`,
+    :py:func:`subtract`, :py:func:`multiply`, :py:func:`divide` and :py:func:`pow`,
+    including for gradients.
+
+    Calling :py:meth:`evaluate` checks the metadata of all the tensors in the
+    expression once, and then computes the whole expression block by block, without
+    creating intermediate :py:class:`TensorMap`, :py:class:`TensorBlock` or
+    :py:class:`Labels`.
+    """
+
+    # make numpy arrays defer to the operators of this class, instead of treating
+    # LazyTensorMap as a scalar object
+    __array_ufunc__ = None
+
+    def __init__(self, node: _Node):
+        self._node = node
+
+    def __repr__(self) -> str:
+        return f"LazyTensorMap({_format_node(self._node, parenthesize=False)})"
+
+    def _binary(self, operation: str, other, reverse: bool = False):
+        other_node = _as_node(other)
+        if other_node is None:
+            return NotImplemented
+
+        if reverse:
+            return LazyTensorMap(_Node(operation, (other_node, self._node)))
+        else:
+            return LazyTensorMap(_Node(operation, (self._node, other_node)))
+
+    def __add__(self, other: Union["LazyTensorMap", TensorMap, float, int]):
+        return self._binary("add", other)
+
+    def __radd__(self, other: Union[TensorMap, float, int]):
+        return self._binary("add", other, reverse=True)
+
+    def __sub__(self, other: Union["LazyTensorMap", TensorMap, float, int]):
+        return self._binary("subtract", other)
+
+    def __rsub__(self, other: Union[TensorMap, float, int]):
+        return self._binary("subtract", other, reverse=True)
+
+    def __mul__(self, other: Union["LazyTensorMap", TensorMap, float, int]):
+        return self._binary("multiply", other)
+
+    def __rmul__(self, other: Union[TensorMap, float, int]):
+        return self._binary("multiply", other, reverse=True)
+
+    def __truediv__(self, other: Union["LazyTensorMap", TensorMap, float, int]):
+        return self._binary("divide", other)
+
+    def __rtruediv__(self, other: Union[TensorMap, float, int]):
+        return self._binary("divide", other, reverse=True)
+
+    def __pow__(self, exponent: Union[float, int]):
+        if not isinstance(exponent, (float, int)):
+            raise TypeError(
+                "the exponent of a LazyTensorMap must be a scalar, "
+                f"not {type(exponent)}"
+            )
+        return LazyTensorMap(_Node("pow", (self._node, float(exponent))))
+
+    def __neg__(self):
+        return LazyTensorMap(_Node("negate", (self._node,)))
+
+    def evaluate(self) -> TensorMap:
+        """
+        Compute the value of this expression, and return it as a new
+        :py:class:`TensorMap`.
+        """
+        leaves: List[_Node] = []
+        _collect_leaves(self._node, leaves)
+
+        first = leaves[0].operands[0]
+
+        # blocks of all the other tensors, in the same order as the keys of `first`
+        matching_blocks: Dict[int, List[TensorBlock]] = {}
+        for leaf in leaves[1:]:
+            tensor = leaf.operands[0]
+            if tensor is not first and id(tensor) not in matching_blocks:
+                _check_same_keys_raise(first, tensor, "lazy")
+                matching_blocks[id(tensor)] = _matching_blocks(first, tensor)
+
+        keys = first.keys
+        blocks: List[TensorBlock] = []
+        for key_i in range(len(keys)):
+            first_block = first.block_by_id(key_i)
+            for _, gradient in first_block.gradients():
+                if len(gradient.gradients_list()) != 0:
+                    raise NotImplementedError(
+                        "gradients of gradients are not supported"
+                    )
+
+            leaf_blocks: Dict[int, TensorBlock] = {id(leaves[0]): first_block}
+            for leaf in leaves[1:]:
+                tensor = leaf.operands[0]
+                if tensor is first:
+                    block = first_block
+                else:
+                    block = matching_blocks[id(tensor)][key_i]
+                    _check_blocks_raise(first_block, block, fname="lazy")
+                    _check_same_gradients_raise(first_block, block, fname="lazy")
+
+                leaf_blocks[id(leaf)] = block
+
+            evaluator = _BlockEvaluator(leaf_blocks, first_block)
+            values, gradients = evaluator.evaluate(self._node)
+
+            new_block = TensorBlock(
+                values=values,
+                samples=first_block.samples,
+                components=first_block.components,
+                properties=first_block.properties,
+            )
+
+            for parameter, gradient in first_block.gradients():
+                gradient_values = gradients[parameter]
+                if gradient_values is None:
+                    gradient_values = _dispatch.zeros_like(gradient.values)
+
+                new_block.add_gradient(
+                    parameter=parameter,
+                    gradient=TensorBlock(
+                        values=gradient_values,
+                        samples=gradient.samples,
+                        components=gradient.components,
+                        properties=gradient.properties,
+                    ),
+                )
+
+            blocks.append(new_block)
+
+        return TensorMap(keys, blocks)
+
+
+def _collect_leaves(node: _Node, leaves: List[_Node]):
+    """Collect all the ``"tensor"`` nodes in the expression, depth first"""
+    if node.operation == "tensor":
+        leaves.append(node)
+    elif node.operation == "pow" or node.operation == "negate":
+        _collect_leaves(node.operands[0], leaves)
+    elif node.operation != "scalar":
+        _collect_leaves(node.operands[0], leaves)
+        _collect_leaves(node.operands[1], leaves)
+
+
+def _format_node(node: _Node, parenthesize: bool = True) -> str:
+    if node.operation == "tensor":
+        return "TensorMap"
+    elif node.operation == "scalar":
+        return str(node.operands[0])
+    elif node.operation == "negate":
+        return f"-{_format_node(node.operands[0])}"
+
+    if node.operation == "pow":
+        formatted = f"{_format_node(node.operands[0])} ** {node.operands[1]}"
+    else:
+        symbol = {"add": "+", "subtract": "-", "multiply": "*", "divide": "/"}
+        formatted = (
+            f"{_format_node(node.operands[0])} {symbol[node.operation]} "
+            f"{_format_node(node.operands[1])}"
+        )
+
+    if parenthesize:
+        return f"({formatted})"
+    else:
+        return formatted
+
+
+def lazy(tensor: TensorMap) -> LazyTensorMap:
+    """
+    Start a lazy expression from ``tensor``.
+
+    Element-wise operations (``+``, ``-``, ``*``, ``/``, unary ``-`` and ``**`` with
+    a scalar exponent) on the result are recorded instead of being executed, and
+    :py:meth:`LazyTensorMap.evaluate` computes the whole expression at once. The
+    result is the same as calling :py:func:`add`, :py:func:`subtract`,
+    :py:func:`multiply`, :py:func:`divide` and :py:func:`pow` one after the other,
+    but the metadata is only checked once and no intermediate :py:class:`TensorMap`
+    is created.
+
+    All the :py:class:`TensorMap` in the expression must have the same keys, and
+    the same metadata for each block and for the gradients.
+
+    >>> import numpy as np
+    >>> import metatensor
+    >>> from metatensor import Labels, TensorBlock, TensorMap
+    >>> def create_tensor(values):
+    ...     block = TensorBlock(
+    ...         values=np.array(values),
+    ...         samples=Labels.range("sample", 2),
+    ...         components=[],
+    ...         properties=Labels.range("property", 2),
+    ...     )
+    ...     return TensorMap(Labels.range("key", 1), [block])
+    >>> a = create_tensor([[1.0, 2.0], [3.0, 4.0]])
+    >>> b = create_tensor([[1.0, 1.0], [1.0, 1.0]])
+    >>> w = create_tensor([[2.0, 2.0], [0.5, 0.5]])
+    >>> expression = (metatensor.lazy(a) - b) ** 2 * w + 1
+    >>> expression
+    LazyTensorMap((((TensorMap - TensorMap) ** 2.0) * TensorMap) + 1.0)
+    >>> result = expression.evaluate()
+    >>> print(result.block().values)
+    [[1.  3. ]
+     [3.  5.5]]
+
+    :param tensor: the first :py:class:`TensorMap` in the expression
+
+    :return: a :py:class:`LazyTensorMap` wrapping ``tensor``
+    """
+    if not is_metatensor_class(tensor, TensorMap):
+        raise TypeError(f"`tensor` must be a metatensor TensorMap, not {type(tensor)}")
+
+    return LazyTensorMap(_Node("tensor", (tensor,)))
@@ -1,24 +1,36 @@
+import math
 import warnings
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from . import _dispatch
 from ._backend import (
+    Array,
     Labels,
     TensorBlock,
     TensorMap,
     torch_jit_annotate,
+    torch_jit_is_scripting,
     torch_jit_script,
 )
 from ._utils import (
     _check_blocks_raise,
     _check_same_gradients_raise,
     _check_same_keys_raise,
+    _group_same_shapes,
+    _matching_blocks,
 )
+from .map_blocks import _map_blocks_impl, _use_parallel_blocks
 
 
-def _lstsq_block(
-    X: TensorBlock, Y: TensorBlock, rcond: Optional[float], driver: Optional[str] = None
-) -> TensorBlock:
+def _lstsq_arrays(
+    X: TensorBlock, Y: TensorBlock, alpha: float, normal_equations: bool
+) -> Tuple[Array, Array]:
+    """
+    Get the 2-dimensional arrays defining the least-squares problem for the blocks
+    ``X`` and ``Y``, including gradients and regularization. If
+    ``normal_equations`` is true, this returns the matrices of the normal equations
+    (:math:`A^T A` and :math:`A^T B`) instead.
+    """
     _check_blocks_raise(X, Y, check=["samples", "components"], fname="lstsq")
     _check_same_gradients_raise(X, Y, check=["samples", "components"], fname="lstsq")
 
@@ -29,14 +41,60 @@ def _lstsq_block(
     Y_n_properties = Y.values.shape[-1]
     Y_values = Y.values.reshape(-1, Y_n_properties)
 
+    if normal_equations:
+        # accumulate the contribution of the values and each gradient separately,
+        # without creating the concatenated arrays
+        XT_X = X_values.T @ X_values
+        XT_Y = X_values.T @ Y_values
+        for parameter, X_gradient in X.gradients():
+            X_gradient_values = X_gradient.values.reshape(-1, X_n_properties)
+
+            Y_gradient = Y.gradient(parameter)
+            Y_gradient_values = Y_gradient.values.reshape(-1, Y_n_properties)
+
+            XT_X = XT_X + X_gradient_values.T @ X_gradient_values
+            XT_Y = XT_Y + X_gradient_values.T @ Y_gradient_values
+
+        if alpha != 0.0:
+            XT_X = XT_X + alpha * _dispatch.eye_like(XT_X, X_n_properties)
+
+        return XT_X, XT_Y
+
+    all_X_values = [X_values]
+    all_Y_values = [Y_values]
     for parameter, X_gradient in X.gradients():
-        X_gradient_values = X_gradient.values.reshape(-1, X_n_properties)
-        X_values = _dispatch.concatenate((X_values, X_gradient_values), axis=0)
+        all_X_values.append(X_gradient.values.reshape(-1, X_n_properties))
 
         Y_gradient = Y.gradient(parameter)
-        Y_gradient_values = Y_gradient.values.reshape(-1, Y_n_properties)
-        Y_values = _dispatch.concatenate((Y_values, Y_gradient_values), axis=0)
+        all_Y_values.append(Y_gradient.values.reshape(-1, Y_n_properties))
+
+    if alpha != 0.0:
+        # ridge regularization, as additional rows sqrt(alpha) * w = 0
+        all_X_values.append(
+            math.sqrt(alpha) * _dispatch.eye_like(X_values, X_n_properties)
+        )
+        all_Y_values.append(
+            _dispatch.zeros_like(Y_values, [X_n_properties, Y_n_properties])
+        )
 
+    if len(all_X_values) == 1:
+        return X_values, Y_values
+    else:
+        return (
+            _dispatch.concatenate(all_X_values, axis=0),
+            _dispatch.concatenate(all_Y_values, axis=0),
+        )
+
+
+def _lstsq_block(
+    X: TensorBlock,
+    Y: TensorBlock,
+    rcond: Optional[float],
+    driver: Optional[str] = None,
+    alpha: float = 0.0,
+    normal_equations: bool = False,
+) -> TensorBlock:
+    X_values, Y_values = _lstsq_arrays(X, Y, alpha, normal_equations)
     weights = _dispatch.lstsq(X_values, Y_values, rcond=rcond, driver=driver)
 
     return TensorBlock(
@@ -53,6 +111,8 @@ def lstsq(
     Y: TensorMap,
     rcond: Optional[float],
     driver: Optional[str] = None,
+    alpha: float = 0.0,
+    normal_equations: bool = False,
 ) -> TensorMap:
     r"""
     Solve a linear system using two :py:class:`TensorMap`.
@@ -72,6 +132,9 @@ def lstsq(
     the linear system :math:`A_b w_b = B_b` is solved for :math:`w_b` using
     least-squares.
 
+    Blocks where these arrays have the same shapes are solved together, with a
+    single batched call to numpy or torch.
+
     .. note::
       The solutions :math:`w_b` differ from the output of numpy or torch in that they
       are already transposed. Be aware of that if you want to manually access
@@ -95,6 +158,21 @@ def lstsq(
         https://pytorch.org/docs/stable/generated/torch.linalg.lstsq.html for a
         full description
 
+    :param alpha:
+        Strength of the ridge (L2) regularization. The solutions :math:`w_b` then
+        minimize :math:`\|A_b w_b - B_b\|^2 + \alpha \|w_b\|^2`. Defaults to 0,
+        i.e. no regularization.
+
+    :param normal_equations:
+        If :py:obj:`True`, solve the normal equations :math:`(A_b^T A_b) w_b = A_b^T
+        B_b` instead. The contributions of the values and of each gradient to
+        :math:`A_b^T A_b` and :math:`A_b^T B_b` are computed separately, so the
+        concatenated arrays :math:`A_b` and :math:`B_b` are never created and the
+        memory usage only depends on the number of properties. This is useful when
+        fitting on large datasets with gradients, but squares the condition number
+        of the system. ``rcond`` is squared accordingly, so that the same singular
+        values of :math:`A_b` are discarded.
+
     :return: a :py:class:`TensorMap` with the same keys of ``Y`` and ``X``, and
         where each :py:class:`TensorBlock` has: the ``sample`` equal to the
         ``properties`` of ``Y``; and the ``properties`` equal to the
@@ -145,11 +223,64 @@ def lstsq(
             stacklevel=1,
         )
 
+    if alpha < 0.0:
+        raise ValueError(f"`alpha` must be positive or zero, got {alpha}")
+
     _check_same_keys_raise(X, Y, "lstsq")
 
+    if normal_equations and rcond is not None:
+        # the singular values of A^T A are the square of the singular values of A
+        if rcond > 0.0:
+            rcond = rcond * rcond
+
+    Y_blocks = _matching_blocks(X, Y)
+
+    if not torch_jit_is_scripting():
+        if _use_parallel_blocks(len(X)):
+            arguments = [
+                (X_block, Y_blocks[i], rcond, driver, alpha, normal_equations)
+                for i, X_block in enumerate(X.blocks())
+            ]
+            return TensorMap(X.keys, _map_blocks_impl(_lstsq_block, arguments))
+
+    X_blocks = X.blocks()
+    X_arrays: List[Array] = []
+    Y_arrays: List[Array] = []
+    for i, X_block in enumerate(X_blocks):
+        X_values, Y_values = _lstsq_arrays(
+            X_block, Y_blocks[i], alpha, normal_equations
+        )
+
+        X_arrays.append(X_values)
+        Y_arrays.append(Y_values)
+
+    # placeholder values, all the entries are overwritten below
+    weights: List[Array] = [array for array in X_arrays]
+    for group in _group_same_shapes(X_arrays, Y_arrays):
+        if len(group) == 1:
+            i = group[0]
+            weights[i] = _dispatch.lstsq(
+                X_arrays[i], Y_arrays[i], rcond=rcond, driver=driver
+            )
+        else:
+            group_weights = _dispatch.lstsq(
+                _dispatch.stack([X_arrays[i] for i in group], 0),
+                _dispatch.stack([Y_arrays[i] for i in group], 0),
+                rcond=rcond,
+                driver=driver,
+            )
+            for group_i, i in enumerate(group):
+                weights[i] = group_weights[group_i]
+
     blocks: List[TensorBlock] = []
-    for key, X_block in X.items():
-        Y_block = Y.block(key)
-        blocks.append(_lstsq_block(X_block, Y_block, rcond=rcond, driver=driver))
+    for i in range(len(weights)):
+        blocks.append(
+            TensorBlock(
+                values=weights[i].T,
+                samples=Y_blocks[i].properties,
+                components=torch_jit_annotate(List[Labels], []),
+                properties=X_blocks[i].properties,
+            )
+        )
 
     return TensorMap(X.keys, blocks)
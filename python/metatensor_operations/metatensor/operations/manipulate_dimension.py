@@ -16,7 +16,7 @@ changing the columns of the :py:class:`metatensor.Labels` within).
 .. autofunction:: metatensor.rename_dimension
 """
 
-from typing import List, Union
+from typing import List, Optional, Union
 
 from . import _dispatch
 from ._backend import Array, Labels, TensorBlock, TensorMap, torch_jit_script
@@ -30,6 +30,40 @@ def _check_axis(axis: str):
         )
 
 
+def _find_transformed(
+    labels: Labels, originals: List[Labels], transformed: List[Labels]
+) -> Optional[Labels]:
+    """
+    Look for ``labels`` in the Labels already transformed by the current operation.
+
+    The same Labels are often shared between blocks (especially properties and
+    components), and comparing with them is a lot cheaper than creating new Labels,
+    which checks the uniqueness of all entries. Re-using the transformed Labels also
+    keeps them shared between the blocks of the output.
+    """
+    for i in range(len(originals)):
+        if originals[i] == labels:
+            return transformed[i]
+    return None
+
+
+def _remember_transformed(
+    labels: Labels,
+    new_labels: Labels,
+    originals: List[Labels],
+    transformed: List[Labels],
+):
+    """
+    Store ``new_labels`` as the transformed version of ``labels``, only keeping the
+    last few Labels to bound the cost of :py:func:`_find_transformed`.
+    """
+    originals.append(labels)
+    transformed.append(new_labels)
+    if len(originals) > 4:
+        originals.pop(0)
+        transformed.pop(0)
+
+
 @torch_jit_script
 def insert_dimension(
     tensor: TensorMap,
@@ -95,26 +129,36 @@ def insert_dimension(
 
     if axis == "keys":
         if values_was_int:
-            label_values = _dispatch.concatenate([values] * len(keys), axis=0)
+            label_values = _dispatch.zeros_like(values, [len(keys)]) + values
 
         keys = keys.insert(index=index, name=name, values=label_values)
 
+    originals: List[Labels] = []
+    transformed: List[Labels] = []
+
     blocks: List[TensorBlock] = []
     for block in tensor.blocks():
         samples = block.samples
         properties = block.properties
 
-        if axis == "samples":
-            if values_was_int:
-                label_values = _dispatch.concatenate([values] * len(samples), axis=0)
+        if axis == "samples" or axis == "properties":
+            if axis == "samples":
+                labels = samples
+            else:
+                labels = properties
 
-            samples = samples.insert(index=index, name=name, values=label_values)
+            new_labels = _find_transformed(labels, originals, transformed)
+            if new_labels is None:
+                if values_was_int:
+                    label_values = _dispatch.zeros_like(values, [len(labels)]) + values
 
-        elif axis == "properties":
-            if values_was_int:
-                label_values = _dispatch.concatenate([values] * len(properties), axis=0)
+                new_labels = labels.insert(index=index, name=name, values=label_values)
+                _remember_transformed(labels, new_labels, originals, transformed)
 
-            properties = properties.insert(index=index, name=name, values=label_values)
+            if axis == "samples":
+                samples = new_labels
+            else:
+                properties = new_labels
 
         new_block = TensorBlock(
             values=block.values,
@@ -248,15 +292,29 @@ def permute_dimensions(
     if axis == "keys":
         keys = keys.permute(dimensions_indexes=dimensions_indexes)
 
+    originals: List[Labels] = []
+    transformed: List[Labels] = []
+
     blocks: List[TensorBlock] = []
     for block in tensor.blocks():
         samples = block.samples
         properties = block.properties
 
-        if axis == "samples":
-            samples = samples.permute(dimensions_indexes=dimensions_indexes)
-        elif axis == "properties":
-            properties = properties.permute(dimensions_indexes=dimensions_indexes)
+        if axis == "samples" or axis == "properties":
+            if axis == "samples":
+                labels = samples
+            else:
+                labels = properties
+
+            new_labels = _find_transformed(labels, originals, transformed)
+            if new_labels is None:
+                new_labels = labels.permute(dimensions_indexes=dimensions_indexes)
+                _remember_transformed(labels, new_labels, originals, transformed)
+
+            if axis == "samples":
+                samples = new_labels
+            else:
+                properties = new_labels
 
         new_block = TensorBlock(
             values=block.values,
@@ -342,15 +400,29 @@ def remove_dimension(tensor: TensorMap, axis: str, name: str) -> TensorMap:
     if axis == "keys":
         keys = keys.remove(name=name)
 
+    originals: List[Labels] = []
+    transformed: List[Labels] = []
+
     blocks: List[TensorBlock] = []
     for block in tensor.blocks():
         samples = block.samples
         properties = block.properties
 
-        if axis == "samples":
-            samples = samples.remove(name)
-        elif axis == "properties":
-            properties = properties.remove(name)
+        if axis == "samples" or axis == "properties":
+            if axis == "samples":
+                labels = samples
+            else:
+                labels = properties
+
+            new_labels = _find_transformed(labels, originals, transformed)
+            if new_labels is None:
+                new_labels = labels.remove(name)
+                _remember_transformed(labels, new_labels, originals, transformed)
+
+            if axis == "samples":
+                samples = new_labels
+            else:
+                properties = new_labels
 
         new_block = TensorBlock(
             values=block.values,
@@ -375,6 +447,20 @@ def remove_dimension(tensor: TensorMap, axis: str, name: str) -> TensorMap:
     return TensorMap(keys=keys, blocks=blocks)
 
 
+def _rename_cached(
+    labels: Labels,
+    old: str,
+    new: str,
+    originals: List[Labels],
+    transformed: List[Labels],
+) -> Labels:
+    new_labels = _find_transformed(labels, originals, transformed)
+    if new_labels is None:
+        new_labels = labels.rename(old, new)
+        _remember_transformed(labels, new_labels, originals, transformed)
+    return new_labels
+
+
 @torch_jit_script
 def rename_dimension(tensor: TensorMap, axis: str, old: str, new: str) -> TensorMap:
     """Rename a :py:class:`metatensor.Labels` dimension name for a given axis.
@@ -413,6 +499,9 @@ def rename_dimension(tensor: TensorMap, axis: str, old: str, new: str) -> Tensor
     if axis == "keys":
         keys = keys.rename(old, new)
 
+    originals: List[Labels] = []
+    transformed: List[Labels] = []
+
     blocks: List[TensorBlock] = []
     for block in tensor.blocks():
         samples = block.samples
@@ -420,14 +509,16 @@ def rename_dimension(tensor: TensorMap, axis: str, old: str, new: str) -> Tensor
         components = block.components
 
         if axis == "samples":
-            samples = samples.rename(old, new)
+            samples = _rename_cached(samples, old, new, originals, transformed)
         elif axis == "properties":
-            properties = properties.rename(old, new)
+            properties = _rename_cached(properties, old, new, originals, transformed)
         elif axis == "components":
             new_components: List[Labels] = []
             for component in components:
                 if old in component.names:
-                    component = component.rename(old, new)
+                    component = _rename_cached(
+                        component, old, new, originals, transformed
+                    )
                 new_components.append(component)
             components = new_components
 
@@ -447,7 +538,9 @@ def rename_dimension(tensor: TensorMap, axis: str, old: str, new: str) -> Tensor
                 new_components: List[Labels] = []
                 for component in gradient_components:
                     if old in component.names:
-                        component = component.rename(old, new)
+                        component = _rename_cached(
+                            component, old, new, originals, transformed
+                        )
                     new_components.append(component)
                 gradient_components = new_components
 
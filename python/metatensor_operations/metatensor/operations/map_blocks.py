@@ -0,0 +1,245 @@
+"""
+Apply a function to the blocks of one or more :py:class:`TensorMap`, optionally
+processing independent blocks concurrently in a pool of threads.
+
+Most numpy and torch kernels release the GIL while they run, so blocks processed in
+different threads are computed concurrently. This module is only available in pure
+Python mode, and can not be used from TorchScript.
+"""
+
+import concurrent.futures
+import threading
+from typing import Callable, List, Optional, Sequence
+
+from ._backend import TensorBlock, TensorMap, is_metatensor_class
+from ._utils import _check_same_keys_raise, _matching_blocks
+
+
+class _ParallelBlocksState(threading.local):
+    """Per-thread state of :py:class:`parallel_blocks`"""
+
+    def __init__(self):
+        # executor used by the built-in operations, set by `parallel_blocks`
+        self.executor: Optional[concurrent.futures.Executor] = None
+        # minimal number of blocks for the built-in operations to use `executor`
+        self.min_blocks = 0
+        # is this thread currently running a function submitted to an executor by
+        # `_map_blocks_impl`?
+        self.in_worker = False
+
+
+_STATE = _ParallelBlocksState()
+
+
+class parallel_blocks:
+    """Process the blocks of :py:class:`TensorMap` in a pool of threads.
+
+    Inside this context manager, the operations from metatensor-operations working on
+    each block independently (:py:func:`add`, :py:func:`multiply`, :py:func:`dot`,
+    :py:func:`lstsq`, :py:func:`slice`, :py:func:`sum_over_samples`, *etc.*) run the
+    per-block computations (including gradients) in a thread pool, as long as the
+    input contains at least ``min_blocks`` blocks. This is also the default executor
+    used by :py:func:`map_blocks`.
+
+    The executor is only used by operations called from the thread that entered this
+    context manager. Operations called from inside a block function already running in
+    an executor (for example a function given to :py:func:`map_blocks` calling
+    :py:func:`multiply`) process their blocks sequentially, instead of submitting more
+    work to the pool and waiting for it.
+
+    >>> import metatensor
+    >>> from metatensor import Labels, TensorBlock, TensorMap
+    >>> import numpy as np
+    >>> blocks = [
+    ...     TensorBlock(
+    ...         values=np.full((4, 3), float(i)),
+    ...         samples=Labels.range("s", 4),
+    ...         components=[],
+    ...         properties=Labels.range("p", 3),
+    ...     )
+    ...     for i in range(20)
+    ... ]
+    >>> tensor = TensorMap(Labels.range("key", 20), blocks)
+    >>> with metatensor.parallel_blocks(max_workers=4):
+    ...     result = metatensor.multiply(tensor, 2.0)
+    >>> print(result.block(3).values[0])
+    [6. 6. 6.]
+
+    :param executor: :py:class:`concurrent.futures.Executor` to use. If this is
+        :py:obj:`None`, a new :py:class:`concurrent.futures.ThreadPoolExecutor` is
+        created when entering the context manager, and shut down when leaving it.
+    :param max_workers: number of threads to use when creating a new executor.
+        :py:obj:`None` uses the default of
+        :py:class:`concurrent.futures.ThreadPoolExecutor`.
+    :param min_blocks: built-in operations only use the executor for
+        :py:class:`TensorMap` with at least this number of blocks, smaller ones are
+        processed sequentially.
+    """
+
+    def __init__(
+        self,
+        executor: Optional[concurrent.futures.Executor] = None,
+        max_workers: Optional[int] = None,
+        min_blocks: int = 8,
+    ):
+        if executor is not None and max_workers is not None:
+            raise ValueError("can not give both `executor` and `max_workers`")
+
+        self._executor = executor
+        self._max_workers = max_workers
+        self._min_blocks = min_blocks
+        self._owned_executor = None
+
+    def __repr__(self) -> str:
+        return f"parallel blocks (min_blocks={self._min_blocks})"
+
+    def __enter__(self):
+        self._previous = (_STATE.executor, _STATE.min_blocks)
+
+        executor = self._executor
+        if executor is None:
+            self._owned_executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self._max_workers,
+                thread_name_prefix="metatensor-blocks",
+            )
+            executor = self._owned_executor
+
+        _STATE.executor = executor
+        _STATE.min_blocks = self._min_blocks
+        return self
+
+    def __exit__(self, type, value, traceback):
+        _STATE.executor, _STATE.min_blocks = self._previous
+        if self._owned_executor is not None:
+            self._owned_executor.shutdown(wait=True)
+            self._owned_executor = None
+
+
+def _use_parallel_blocks(n_blocks: int) -> bool:
+    """
+    Should the built-in operations process ``n_blocks`` blocks using the executor set
+    by :py:class:`parallel_blocks`?
+    """
+    if _STATE.executor is None or _STATE.in_worker:
+        return False
+
+    return n_blocks >= _STATE.min_blocks
+
+
+def _run_in_worker(function: Callable[..., TensorBlock], *args) -> TensorBlock:
+    """
+    Call ``function(*args)``, marking the current thread as running inside an
+    executor for the duration of the call.
+    """
+    previous = _STATE.in_worker
+    _STATE.in_worker = True
+    try:
+        return function(*args)
+    finally:
+        _STATE.in_worker = previous
+
+
+def _map_blocks_impl(
+    function: Callable[..., TensorBlock],
+    arguments: Sequence[tuple],
+    executor: Optional[concurrent.futures.Executor] = None,
+) -> List[TensorBlock]:
+    """
+    Call ``function(*args)`` for all ``args`` in ``arguments``, in the given
+    ``executor`` (or the one set by :py:class:`parallel_blocks` if ``executor`` is
+    :py:obj:`None`). The results are returned in the same order as ``arguments``.
+
+    When called from a function already running in an executor, the blocks are
+    processed sequentially: waiting on work submitted to the same pool from one of its
+    workers could deadlock.
+    """
+    if executor is None:
+        executor = _STATE.executor
+
+    if executor is None or _STATE.in_worker or len(arguments) < 2:
+        return [function(*args) for args in arguments]
+
+    futures = [executor.submit(_run_in_worker, function, *args) for args in arguments]
+    return [future.result() for future in futures]
+
+
+def map_blocks(
+    function: Callable[..., TensorBlock],
+    *tensors: TensorMap,
+    executor: Optional[concurrent.futures.Executor] = None,
+) -> TensorMap:
+    """
+    Apply ``function`` to the blocks sharing the same key in all ``tensors``, and
+    collect the results in a new :py:class:`TensorMap`.
+
+    ``function`` is called as ``function(block_1, block_2, ...)`` with one block from
+    each tensor, and must return a new :py:class:`TensorBlock` (blocks that are already
+    part of a :py:class:`TensorMap` can not be re-used, create a new block with the
+    same data instead). All ``tensors`` must have the same keys, and the output uses
+    the keys of the first tensor. Gradients are handled by ``function``, which must
+    add them to the new block if needed.
+
+    The blocks are processed in ``executor`` when it is given, or in the executor set
+    by :py:class:`parallel_blocks` otherwise. If neither is available, or if this
+    function is called from another function already running in an executor, the
+    blocks are processed sequentially.
+
+    >>> import metatensor
+    >>> from metatensor import Labels, TensorBlock, TensorMap
+    >>> import numpy as np
+    >>> block = TensorBlock(
+    ...     values=np.array([[1.0, -2.0], [3.0, -4.0]]),
+    ...     samples=Labels.range("s", 2),
+    ...     components=[],
+    ...     properties=Labels.range("p", 2),
+    ... )
+    >>> tensor = TensorMap(Labels.range("key", 1), [block])
+    >>> def clip(block):
+    ...     return TensorBlock(
+    ...         values=np.clip(block.values, 0.0, None),
+    ...         samples=block.samples,
+    ...         components=block.components,
+    ...         properties=block.properties,
+    ...     )
+    >>> result = metatensor.map_blocks(clip, tensor)
+    >>> print(result.block().values)
+    [[1. 0.]
+     [3. 0.]]
+
+    :param function: function taking one block from each tensor, and returning a new
+        :py:class:`TensorBlock`
+    :param tensors: the :py:class:`TensorMap` to process
+    :param executor: :py:class:`concurrent.futures.Executor` used to process the
+        blocks concurrently
+
+    :return: a new :py:class:`TensorMap` with the same keys as the first of
+        ``tensors``, containing the blocks returned by ``function``
+    """
+    if len(tensors) == 0:
+        raise ValueError("`map_blocks` requires at least one TensorMap")
+
+    for tensor in tensors:
+        if not is_metatensor_class(tensor, TensorMap):
+            raise TypeError(
+                f"`tensors` must be metatensor TensorMap, not {type(tensor)}"
+            )
+
+    first = tensors[0]
+    for tensor in tensors[1:]:
+        _check_same_keys_raise(first, tensor, "map_blocks")
+
+    others = [_matching_blocks(first, tensor) for tensor in tensors[1:]]
+
+    arguments = []
+    for i, block in enumerate(first.blocks()):
+        arguments.append((block,) + tuple(blocks[i] for blocks in others))
+
+    blocks = _map_blocks_impl(function, arguments, executor=executor)
+    for block in blocks:
+        if not is_metatensor_class(block, TensorBlock):
+            raise TypeError(
+                "`function` in `map_blocks` must return a metatensor TensorBlock, "
+                f"got {type(block)}"
+            )
+
+    return TensorMap(first.keys, blocks)
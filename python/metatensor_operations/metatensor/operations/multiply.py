@@ -1,4 +1,4 @@
-from typing import List, Union
+from typing import List, Optional, Tuple, Union
 
 from . import _dispatch
 from ._backend import (
@@ -12,7 +12,13 @@ from ._utils import (
     _check_blocks_raise,
     _check_same_gradients_raise,
     _check_same_keys_raise,
+    _copy_into,
+    _matching_blocks,
+    _shares_arrays,
 )
+from .chunks import _samples_chunk_size
+from .map_blocks import _map_blocks_impl, _use_parallel_blocks
+from .pack import _from_packed_buffer, _packed_elementwise
 
 
 def _multiply_block_constant(block: TensorBlock, constant: float) -> TensorBlock:
@@ -42,6 +48,14 @@ def _multiply_block_constant(block: TensorBlock, constant: float) -> TensorBlock
     return result_block
 
 
+def _multiply_gradient_values(values_1, values_2, gradient_1, gradient_2):
+    """
+    Gradients of the product, from the values gathered for each gradient sample and
+    the gradients of both blocks
+    """
+    return values_1 * gradient_2 + gradient_1 * values_2
+
+
 def _multiply_block_block(block_1: TensorBlock, block_2: TensorBlock) -> TensorBlock:
     values = block_1.values * block_2.values
 
@@ -73,15 +87,37 @@ def _multiply_block_block(block_1: TensorBlock, block_2: TensorBlock) -> TensorB
         # empty dimensions for broadcasting
         diff_components = len(gradient_1.values.shape) - len(block_1.values.shape)
 
-        gradient_samples_to_values_samples_1 = gradient_1.samples.column("sample")
-        gradient_samples_to_values_samples_2 = gradient_2.samples.column("sample")
-        gradient_values = block_1.values[
-            _dispatch.to_index_array(gradient_samples_to_values_samples_1)
-        ].reshape(
-            [-1] + [1] * diff_components + _shape
-        ) * gradient_2.values + gradient_1.values * block_2.values[
-            _dispatch.to_index_array(gradient_samples_to_values_samples_2)
-        ].reshape([-1] + [1] * diff_components + _shape)
+        values_index_1 = _dispatch.to_index_array(gradient_1.samples.column("sample"))
+        values_index_2 = _dispatch.to_index_array(gradient_2.samples.column("sample"))
+        broadcast_shape = [-1] + [1] * diff_components + _shape
+
+        n_gradient_samples = len(gradient_1.samples)
+        chunk_size = n_gradient_samples
+        if not torch_jit_is_scripting():
+            chunk_size = _samples_chunk_size(n_gradient_samples)
+
+        gradient_values = _multiply_gradient_values(
+            block_1.values[values_index_1[:chunk_size]].reshape(broadcast_shape),
+            block_2.values[values_index_2[:chunk_size]].reshape(broadcast_shape),
+            gradient_1.values[:chunk_size],
+            gradient_2.values[:chunk_size],
+        )
+        if chunk_size < n_gradient_samples:
+            # compute the remaining gradient samples by chunks, and write them in a
+            # pre-allocated array
+            first_chunk = gradient_values
+            gradient_values = _dispatch.empty_like(
+                first_chunk, list(gradient_1.values.shape)
+            )
+            gradient_values[:chunk_size] = first_chunk
+            for start in range(chunk_size, n_gradient_samples, chunk_size):
+                stop = start + chunk_size
+                gradient_values[start:stop] = _multiply_gradient_values(
+                    block_1.values[values_index_1[start:stop]].reshape(broadcast_shape),
+                    block_2.values[values_index_2[start:stop]].reshape(broadcast_shape),
+                    gradient_1.values[start:stop],
+                    gradient_2.values[start:stop],
+                )
 
         result_block.add_gradient(
             parameter=parameter_1,
@@ -96,8 +132,106 @@ def _multiply_block_block(block_1: TensorBlock, block_2: TensorBlock) -> TensorB
     return result_block
 
 
+def _multiply_block_constant_inplace(block: TensorBlock, constant: float) -> None:
+    values = block.values
+    values *= constant
+
+    for _, gradient in block.gradients():
+        if len(gradient.gradients_list()) != 0:
+            raise NotImplementedError("gradients of gradients are not supported")
+
+        gradient_values = gradient.values
+        gradient_values *= constant
+
+
+def _multiply_block_block_inplace(block_1: TensorBlock, block_2: TensorBlock) -> None:
+    _shape: List[int] = []
+    for c in block_1.components:
+        _shape.append(len(c))
+    _shape.append(len(block_1.properties))
+
+    # the gradients are updated first, since they use the values of block_1 before
+    # the multiplication
+    for parameter, gradient_1 in block_1.gradients():
+        gradient_2 = block_2.gradient(parameter)
+
+        if len(gradient_1.gradients_list()) != 0:
+            raise NotImplementedError("gradients of gradients are not supported")
+
+        diff_components = len(gradient_1.values.shape) - len(block_1.values.shape)
+        broadcast_shape = [-1] + [1] * diff_components + _shape
+        values_index = _dispatch.to_index_array(gradient_1.samples.column("sample"))
+
+        # computed before modifying the gradients of block_1, in case block_2 is
+        # the same block
+        values_1 = block_1.values[values_index].reshape(broadcast_shape)
+        update = values_1 * gradient_2.values
+
+        gradient_values = gradient_1.values
+        gradient_values *= block_2.values[values_index].reshape(broadcast_shape)
+        gradient_values += update
+
+    values = block_1.values
+    values *= block_2.values
+
+
 @torch_jit_script
-def multiply(A: TensorMap, B: Union[float, int, TensorMap]) -> TensorMap:
+def multiply_(A: TensorMap, B: Union[float, int, TensorMap]) -> TensorMap:
+    r"""In-place version of :py:func:`multiply`, multiplying the values and gradients
+    of ``A`` by ``B``, and returning ``A``.
+
+    The metadata of ``B`` is checked against ``A`` in the same way as in
+    :py:func:`multiply`, and the existing arrays of ``A`` are then modified, without
+    allocating new :py:class:`Labels`.
+
+    .. note::
+      Other :py:class:`TensorMap` sharing arrays with ``A`` are also modified, see
+      :py:func:`add_` for the operations sharing arrays between their input and output.
+
+    :param A: :py:class:`TensorMap` to modify.
+    :param B: Scalar or :py:class:`TensorMap` with the same metadata as ``A`` to
+              multiply ``A`` with.
+
+    :return: ``A``, after multiplying it by ``B``.
+    """
+    if not torch_jit_is_scripting():
+        if not is_metatensor_class(A, TensorMap):
+            raise TypeError(f"`A` must be a metatensor TensorMap, not {type(A)}")
+
+    if torch_jit_is_scripting():
+        is_tensor_map = isinstance(B, TensorMap)
+    else:
+        is_tensor_map = is_metatensor_class(B, TensorMap)
+
+    if isinstance(B, (float, int)):
+        B = float(B)
+        for block_A in A.blocks():
+            _multiply_block_constant_inplace(block=block_A, constant=B)
+    elif is_tensor_map:
+        _check_same_keys_raise(A, B, "multiply_")
+        blocks_B = _matching_blocks(A, B)
+        for i, block_A in enumerate(A.blocks()):
+            block_B = blocks_B[i]
+            _check_blocks_raise(block_A, block_B, fname="multiply_")
+            _check_same_gradients_raise(block_A, block_B, fname="multiply_")
+            _multiply_block_block_inplace(block_1=block_A, block_2=block_B)
+    else:
+        if torch_jit_is_scripting():
+            extra = ""
+        else:
+            extra = f", not {type(B)}"
+
+        raise TypeError("`B` must be a metatensor TensorMap or a scalar value" + extra)
+
+    return A
+
+
+@torch_jit_script
+def multiply(
+    A: TensorMap,
+    B: Union[float, int, TensorMap],
+    out: Optional[TensorMap] = None,
+) -> TensorMap:
     r"""Return a new :class:`TensorMap` with the values being the element-wise
     multiplication of ``A`` and ``B``.
 
@@ -120,13 +254,32 @@ def multiply(A: TensorMap, B: Union[float, int, TensorMap]) -> TensorMap:
     :param B: Second instance for the multiplication. Parameter can be a scalar
             or a :py:class:`TensorMap`. In the latter case ``B`` must have the same
             metadata of ``A``.
+    :param out: Optional :py:class:`TensorMap` with the same metadata as ``A``. If
+            given, the result is written in the existing values and gradients
+            arrays of ``out`` instead of allocating new ones. ``out`` can be ``A``
+            itself or ``B``. See also :py:func:`multiply_`.
 
-    :return: New :py:class:`TensorMap` with the same metadata as ``A``.
+    :return: New :py:class:`TensorMap` with the same metadata as ``A``, or ``out``
+            if given.
     """
     if not torch_jit_is_scripting():
         if not is_metatensor_class(A, TensorMap):
             raise TypeError(f"`A` must be a metatensor TensorMap, not {type(A)}")
 
+    if out is not None:
+        # the arrays of `B` would be overwritten when copying `A` to `out`
+        if torch_jit_is_scripting():
+            if isinstance(B, TensorMap):
+                if _shares_arrays(out, B):
+                    B = B.copy()
+        else:
+            if is_metatensor_class(B, TensorMap):
+                if _shares_arrays(out, B):
+                    B = B.copy()
+
+        _copy_into(out, A, "multiply")
+        return multiply_(out, B)
+
     blocks: List[TensorBlock] = []
     if torch_jit_is_scripting():
         is_tensor_map = isinstance(B, TensorMap)
@@ -135,14 +288,35 @@ def multiply(A: TensorMap, B: Union[float, int, TensorMap]) -> TensorMap:
 
     if isinstance(B, (float, int)):
         B = float(B)
+        if not torch_jit_is_scripting():
+            buffer = _packed_elementwise(A, gradients_too=True)
+            if buffer is not None:
+                return _from_packed_buffer(A, B * buffer)
+
+            if _use_parallel_blocks(len(A)):
+                blocks = _map_blocks_impl(
+                    _multiply_block_constant, [(block_A, B) for block_A in A.blocks()]
+                )
+                return TensorMap(A.keys, blocks)
+
         for block_A in A.blocks():
             blocks.append(_multiply_block_constant(block=block_A, constant=B))
     elif is_tensor_map:
         _check_same_keys_raise(A, B, "multiply")
-        for key, block_A in A.items():
-            block_B = B[key]
+        pairs: List[Tuple[TensorBlock, TensorBlock]] = []
+        blocks_B = _matching_blocks(A, B)
+        for i, block_A in enumerate(A.blocks()):
+            block_B = blocks_B[i]
             _check_blocks_raise(block_A, block_B, fname="multiply")
             _check_same_gradients_raise(block_A, block_B, fname="multiply")
+            pairs.append((block_A, block_B))
+
+        if not torch_jit_is_scripting():
+            if _use_parallel_blocks(len(pairs)):
+                blocks = _map_blocks_impl(_multiply_block_block, pairs)
+                return TensorMap(A.keys, blocks)
+
+        for block_A, block_B in pairs:
             blocks.append(_multiply_block_block(block_1=block_A, block_2=block_B))
     else:
         if torch_jit_is_scripting():
@@ -59,19 +59,28 @@ def one_hot(labels: Labels, dimension: Labels):
         )
 
     name = dimension.names[0]
-
-    indices = _dispatch.zeros_like(dimension.values, [len(labels)])
     labels_name = labels.column(name)
-    for i in range(labels_name.shape[0]):
-        entry = labels_name[None, i]
-        position = dimension.position(entry)
-        if position is None:
-            raise ValueError(
-                f"{name}={entry[0]} is present in the labels, but was not found in "
-                "the dimension"
-            )
-        indices[i] = position
 
+    # find the position of all entries at once in the sorted dimension values
+    order = _dispatch.argsort_labels_values(dimension.values)
+    sorted_dimension = dimension.column(name)[order]
+    positions = _dispatch.searchsorted(sorted_dimension, labels_name)
+
+    if len(dimension) == 0:
+        found = positions < 0
+    else:
+        # entries larger than all dimension values end up past the last position
+        positions[positions == len(dimension)] = 0
+        found = sorted_dimension[positions] == labels_name
+
+    if not bool(_dispatch.all(found)):
+        missing = int(labels_name[_dispatch.where(~found)[0][0]])
+        raise ValueError(
+            f"{name}={missing} is present in the labels, but was not found in "
+            "the dimension"
+        )
+
+    indices = order[positions]
     one_hot_array = _dispatch.eye_like(dimension.values, len(dimension))[
         _dispatch.to_index_array(indices)
     ]
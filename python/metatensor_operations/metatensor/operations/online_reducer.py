@@ -0,0 +1,584 @@
+"""
+Reduce over the samples of :py:class:`TensorMap` given batch by batch, without keeping
+all the batches in memory.
+
+This module is only available in pure Python mode, and can not be used from
+TorchScript.
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from . import _dispatch
+from ._backend import Labels, TensorBlock, TensorMap, is_metatensor_class
+from ._dispatch import TorchTensor
+
+
+def _index_like(index, like):
+    """Convert the integer array ``index`` to the same backend/device as ``like``"""
+    if isinstance(like, TorchTensor) and not isinstance(index, TorchTensor):
+        return _dispatch.to(index, backend="torch", device=like.device)
+    return index
+
+
+def _broadcast_rows(array, n_dimensions: int):
+    """
+    Reshape ``array`` (with one entry per row) to broadcast against an array with
+    ``n_dimensions`` dimensions.
+    """
+    return array.reshape((-1,) + (1,) * (n_dimensions - 1))
+
+
+def _expand(array, mapping, size: int):
+    """Scatter the rows of ``array`` to the positions in ``mapping`` of a new array
+    with ``size`` rows, filled with zeros everywhere else."""
+    output = _dispatch.zeros_like(array, shape=(size,) + tuple(array.shape[1:]))
+    output[_index_like(mapping, array)] = array
+    return output
+
+
+def _empty_labels(names: List[str], like) -> Labels:
+    return Labels(names, _dispatch.zeros_like(like, shape=[0, len(names)]))
+
+
+class _GradientState:
+    """Running sums for one gradient of one block"""
+
+    def __init__(self, samples: Labels, components: List[Labels], values_like):
+        # gradient samples, with the "sample" dimension referring to the reduced
+        # samples of the block
+        self.samples = samples
+        self.components = components
+        self.count = _dispatch.zeros_like(values_like, shape=(len(samples),))
+        self.sum = _dispatch.zeros_like(
+            values_like, shape=(len(samples),) + tuple(values_like.shape[1:])
+        )
+        # sum of gradients multiplied by the corresponding values, used by var/std
+        self.sum_values = _dispatch.zeros_like(self.sum)
+
+    def combine(self, samples: Labels, count, sum, sum_values):
+        if len(self.samples) == 0:
+            self.samples = samples
+            self.count = count
+            self.sum = sum
+            self.sum_values = sum_values
+            return
+
+        union, mapping, other_mapping = self.samples.union_and_mapping(samples)
+        size = len(union)
+
+        self.count = _expand(self.count, mapping, size)
+        self.sum = _expand(self.sum, mapping, size)
+        self.sum_values = _expand(self.sum_values, mapping, size)
+
+        other_mapping = _index_like(other_mapping, self.sum)
+        self.count[other_mapping] += count
+        self.sum[other_mapping] += sum
+        self.sum_values[other_mapping] += sum_values
+        self.samples = union
+
+
+class _BlockState:
+    """Welford-style running count, mean and M2 for one block"""
+
+    def __init__(self, block: TensorBlock, sample_names: List[str]):
+        self.sample_names = sample_names
+        self.components = block.components
+        self.properties = block.properties
+
+        # start without any samples. The arrays are created here instead of being views
+        # of the block values, to not keep the batch alive.
+        if len(sample_names) == 0:
+            self.samples = _empty_labels(["_"], block.samples.values)
+        else:
+            self.samples = _empty_labels(sample_names, block.samples.values)
+
+        shape = list(block.values.shape)
+        shape[0] = 0
+        self.count = _dispatch.zeros_like(block.values, shape=[0])
+        self.mean = _dispatch.zeros_like(block.values, shape=shape)
+        self.m2 = _dispatch.zeros_like(block.values, shape=shape)
+
+        self.gradients: Dict[str, _GradientState] = {}
+        for parameter, gradient in block.gradients():
+            if len(gradient.gradients_list()) != 0:
+                raise NotImplementedError("gradients of gradients are not supported")
+
+            self.gradients[parameter] = _GradientState(
+                _empty_labels(gradient.samples.names, gradient.samples.values),
+                gradient.components,
+                gradient.values,
+            )
+
+    def combine(self, samples: Labels, count, mean, m2):
+        """
+        Combine the statistics for the reduced ``samples`` in this state, using the
+        parallel algorithm from Chan et al. Returns the position of ``samples`` in the
+        updated state.
+        """
+        if len(self.samples) == 0:
+            self.samples = samples
+            self.count = count
+            self.mean = mean
+            self.m2 = m2
+            return _dispatch.indices_like([len(samples)], count).reshape(-1)
+
+        union, mapping, other_mapping = self.samples.union_and_mapping(samples)
+        size = len(union)
+
+        self.count = _expand(self.count, mapping, size)
+        self.mean = _expand(self.mean, mapping, size)
+        self.m2 = _expand(self.m2, mapping, size)
+
+        position = _index_like(other_mapping, self.mean)
+        n_dimensions = len(self.mean.shape)
+
+        count_a = self.count[position]
+        total = count_a + count
+        delta = mean - self.mean[position]
+
+        self.mean[position] += delta * _broadcast_rows(count / total, n_dimensions)
+        self.m2[position] += m2 + delta**2 * _broadcast_rows(
+            count_a * count / total, n_dimensions
+        )
+        self.count[position] = total
+        self.samples = union
+
+        return other_mapping
+
+
+class OnlineReducer:
+    """Reduce over the samples of :py:class:`TensorMap` given one batch at a time.
+
+    This computes the same result as :py:func:`sum_over_samples`,
+    :py:func:`mean_over_samples`, :py:func:`var_over_samples` or
+    :py:func:`std_over_samples` applied to all the batches joined along the samples,
+    while only keeping running statistics in memory: the number of samples, mean and
+    sum of squared deviations (updated with Welford's algorithm) for each reduced
+    sample, as well as running sums for the gradients. This is useful to compute
+    statistics over a full dataset, e.g. to standardize features.
+
+    Blocks with the same key in different batches are accumulated together. Batches
+    can contain different keys, but blocks with the same key must have the same
+    components, properties and gradients. The reduced samples are given in the order
+    they first appear in the batches.
+
+    Reducers can be pickled and combined with :py:meth:`merge`, for example to reduce
+    over parts of a dataset in different worker processes (such as the workers of a
+    :py:class:`metatensor.learn.DataLoader`) and then merge the results.
+
+    >>> import numpy as np
+    >>> import metatensor
+    >>> from metatensor import Labels, TensorBlock, TensorMap
+    >>> def batch(system, values):
+    ...     block = TensorBlock(
+    ...         values=np.array(values),
+    ...         samples=Labels(
+    ...             ["system", "atom"],
+    ...             np.array([[system, i] for i in range(len(values))]),
+    ...         ),
+    ...         components=[],
+    ...         properties=Labels.range("p", 2),
+    ...     )
+    ...     return TensorMap(Labels.range("key", 1), [block])
+    >>> reducer = metatensor.OnlineReducer("system", reduction="mean")
+    >>> reducer.update(batch(0, [[1.0, 2.0], [3.0, 4.0]]))
+    >>> reducer.update(batch(1, [[5.0, 6.0]]))
+    >>> result = reducer.finalize()
+    >>> result.block().samples
+    Labels(
+        atom
+         0
+         1
+    )
+    >>> print(result.block().values)
+    [[3. 4.]
+     [3. 4.]]
+
+    :param sample_names: names of the samples to reduce over
+    :param reduction: how to reduce the samples, one of ``"sum"``, ``"mean"``,
+        ``"var"`` or ``"std"``
+    """
+
+    def __init__(
+        self, sample_names: Union[str, Sequence[str]], reduction: str = "mean"
+    ):
+        if isinstance(sample_names, str):
+            sample_names = [sample_names]
+
+        if reduction not in ["sum", "mean", "var", "std"]:
+            raise ValueError(
+                f"invalid reduction '{reduction}', expected one of 'sum', 'mean', "
+                "'var' or 'std'"
+            )
+
+        self._sample_names = list(sample_names)
+        self._reduction = reduction
+
+        self._keys_names: Optional[List[str]] = None
+        self._remaining_names: Optional[List[str]] = None
+        self._keys: Dict[Tuple[int, ...], object] = {}
+        self._blocks: Dict[Tuple[int, ...], _BlockState] = {}
+
+    def __repr__(self) -> str:
+        return (
+            f"OnlineReducer(sample_names={self._sample_names}, "
+            f"reduction='{self._reduction}', blocks={len(self._blocks)})"
+        )
+
+    @property
+    def reduction(self) -> str:
+        """reduction used by this reducer"""
+        return self._reduction
+
+    def update(self, tensor: TensorMap):
+        """
+        Add the values and gradients of ``tensor`` to the running statistics.
+
+        :param tensor: a batch of data
+        """
+        if not is_metatensor_class(tensor, TensorMap):
+            raise TypeError(
+                f"`tensor` must be a metatensor TensorMap, not {type(tensor)}"
+            )
+
+        for sample in self._sample_names:
+            if sample not in tensor.sample_names:
+                raise ValueError(
+                    f"one of the requested sample name ({sample}) is not part of "
+                    "this TensorMap"
+                )
+
+        remaining = [
+            name for name in tensor.sample_names if name not in self._sample_names
+        ]
+        self._check_metadata_names(tensor.keys.names, remaining)
+
+        for key, block in tensor.items():
+            state = self._block_state(key, block)
+            self._update_block(state, block)
+
+    def merge(self, other: "OnlineReducer"):
+        """
+        Merge the running statistics from ``other`` into this reducer. ``other`` must
+        use the same ``sample_names`` and ``reduction``.
+
+        :param other: another :py:class:`OnlineReducer`
+        """
+        if not isinstance(other, OnlineReducer):
+            raise TypeError(f"`other` must be an OnlineReducer, not {type(other)}")
+
+        if (
+            other._sample_names != self._sample_names
+            or other._reduction != self._reduction
+        ):
+            raise ValueError(
+                "can not merge OnlineReducer with different sample names or reduction"
+            )
+
+        if other._keys_names is None:
+            return
+
+        self._check_metadata_names(other._keys_names, other._remaining_names)
+
+        for key_tuple, other_state in other._blocks.items():
+            if key_tuple not in self._blocks:
+                self._keys[key_tuple] = other._keys[key_tuple]
+                self._blocks[key_tuple] = _copy_state(other_state)
+                continue
+
+            state = self._blocks[key_tuple]
+            _check_same_block_metadata(
+                state,
+                other_state.properties,
+                other_state.components,
+                list(other_state.gradients.keys()),
+            )
+
+            if len(other_state.samples) == 0:
+                continue
+
+            mapping = state.combine(
+                other_state.samples,
+                other_state.count,
+                other_state.mean,
+                other_state.m2,
+            )
+
+            for parameter, other_gradient in other_state.gradients.items():
+                gradient_samples = _remap_gradient_samples(
+                    other_gradient.samples, mapping
+                )
+                state.gradients[parameter].combine(
+                    gradient_samples,
+                    other_gradient.count,
+                    other_gradient.sum,
+                    other_gradient.sum_values,
+                )
+
+    def finalize(self) -> TensorMap:
+        """
+        Get the reduced :py:class:`TensorMap` from the data seen so far.
+
+        :return: a :py:class:`TensorMap` with the same keys as the batches, and blocks
+            reduced over ``sample_names``
+        """
+        if self._keys_names is None:
+            raise ValueError("no data was given to this OnlineReducer")
+
+        keys_values = [self._keys[key_tuple] for key_tuple in self._blocks.keys()]
+        keys = Labels(self._keys_names, _dispatch.stack(keys_values, 0))
+
+        blocks: List[TensorBlock] = []
+        for state in self._blocks.values():
+            blocks.append(self._finalize_block(state))
+
+        return TensorMap(keys, blocks)
+
+    def _check_metadata_names(self, keys_names: List[str], remaining: List[str]):
+        if self._keys_names is None:
+            self._keys_names = keys_names
+            self._remaining_names = remaining
+            return
+
+        if keys_names != self._keys_names:
+            raise ValueError(
+                f"inconsistent keys names: expected {self._keys_names}, "
+                f"got {keys_names}"
+            )
+
+        if remaining != self._remaining_names:
+            raise ValueError(
+                f"inconsistent samples names: expected the remaining samples to be "
+                f"{self._remaining_names}, got {remaining}"
+            )
+
+    def _block_state(self, key, block: TensorBlock) -> _BlockState:
+        key_tuple = tuple(int(value) for value in key.values)
+        state = self._blocks.get(key_tuple)
+        if state is None:
+            state = _BlockState(block, self._remaining_names)
+            self._blocks[key_tuple] = state
+            self._keys[key_tuple] = key.values
+        else:
+            _check_same_block_metadata(
+                state, block.properties, block.components, block.gradients_list()
+            )
+
+        return state
+
+    def _update_block(self, state: _BlockState, block: TensorBlock):
+        values = block.values
+        if values.shape[0] == 0:
+            return
+
+        n_dimensions = len(values.shape)
+
+        # group the samples of this batch
+        if len(state.sample_names) == 0:
+            index = _dispatch.zeros_like(block.samples.values, (len(block.samples),))
+            samples = Labels(
+                "_", _dispatch.zeros_like(block.samples.values, shape=(1, 1))
+            )
+        else:
+            samples_values, index = _dispatch.unique_with_inverse(
+                block.samples.view(state.sample_names).values, axis=0
+            )
+            index = index.reshape(-1)
+            samples = Labels(state.sample_names, samples_values)
+
+        n_groups = len(samples)
+        index = _index_like(index, values)
+        count = _dispatch.make_like(
+            _dispatch.bincount(index, minlength=n_groups), values
+        )
+        mean = _dispatch.segment_sum(values, index, n_groups) / _broadcast_rows(
+            count, n_dimensions
+        )
+
+        if self._reduction == "var" or self._reduction == "std":
+            m2 = _dispatch.segment_sum((values - mean[index]) ** 2, index, n_groups)
+        else:
+            m2 = _dispatch.zeros_like(mean)
+
+        mapping = state.combine(samples, count, mean, m2)
+        mapping = _index_like(mapping, values)
+
+        for parameter, gradient in block.gradients():
+            if len(gradient.gradients_list()) != 0:
+                raise NotImplementedError("gradients of gradients are not supported")
+
+            gradient_values = gradient.values
+            gradient_samples = _dispatch.copy(gradient.samples.values)
+            values_index = _dispatch.to_index_array(gradient.samples.values[:, 0])
+
+            # reduced sample in the state for each gradient sample
+            reduced = mapping[index[_index_like(values_index, values)]]
+            gradient_samples[:, 0] = _dispatch.make_like(reduced, gradient_samples)
+
+            new_samples, gradient_index = _dispatch.unique_with_inverse(
+                gradient_samples, axis=0
+            )
+            gradient_index = _index_like(gradient_index.reshape(-1), values)
+            n_gradient_groups = new_samples.shape[0]
+
+            gradient_count = _dispatch.make_like(
+                _dispatch.bincount(gradient_index, minlength=n_gradient_groups),
+                values,
+            )
+            gradient_sum = _dispatch.segment_sum(
+                gradient_values, gradient_index, n_gradient_groups
+            )
+
+            if self._reduction == "var" or self._reduction == "std":
+                # add axes for the gradient-specific components
+                n_gradient_components = len(gradient_values.shape) - n_dimensions
+                matching_values = values[_index_like(values_index, values)]
+                matching_values = matching_values.reshape(
+                    (-1,) + (1,) * n_gradient_components + tuple(values.shape[1:])
+                )
+                gradient_sum_values = _dispatch.segment_sum(
+                    gradient_values * matching_values,
+                    gradient_index,
+                    n_gradient_groups,
+                )
+            else:
+                gradient_sum_values = _dispatch.zeros_like(gradient_sum)
+
+            state.gradients[parameter].combine(
+                Labels(gradient.samples.names, new_samples),
+                gradient_count,
+                gradient_sum,
+                gradient_sum_values,
+            )
+
+    def _finalize_block(self, state: _BlockState) -> TensorBlock:
+        n_dimensions = len(state.mean.shape)
+        count = _broadcast_rows(state.count, n_dimensions)
+
+        if self._reduction == "sum":
+            values = state.mean * count
+        elif self._reduction == "mean":
+            values = state.mean
+        else:
+            values = state.m2 / count
+            if self._reduction == "std":
+                values = _dispatch.sqrt(values)
+
+        block = TensorBlock(
+            values=_dispatch.copy(values),
+            samples=state.samples,
+            components=state.components,
+            properties=state.properties,
+        )
+
+        for parameter, gradient in state.gradients.items():
+            gradient_count = _broadcast_rows(gradient.count, len(gradient.sum.shape))
+
+            if self._reduction == "sum":
+                gradient_values = gradient.sum
+            elif self._reduction == "mean":
+                gradient_values = gradient.sum / gradient_count
+            else:
+                reduced = _index_like(
+                    _dispatch.to_index_array(gradient.samples.values[:, 0]), state.mean
+                )
+                n_gradient_components = len(gradient.sum.shape) - n_dimensions
+                shape = (-1,) + (1,) * n_gradient_components + tuple(values.shape[1:])
+
+                mean_times_gradient = gradient.sum * state.mean[reduced].reshape(shape)
+                gradient_values = (gradient.sum_values - mean_times_gradient) / (
+                    gradient_count
+                )
+
+                if self._reduction == "var":
+                    gradient_values = 2 * gradient_values
+                else:
+                    if isinstance(values, TorchTensor):
+                        gradient_values = gradient_values / values[reduced].reshape(
+                            shape
+                        )
+                    else:
+                        with np.errstate(divide="ignore", invalid="ignore"):
+                            gradient_values = gradient_values / values[reduced].reshape(
+                                shape
+                            )
+
+                    gradient_values = _dispatch.nan_to_num(
+                        gradient_values, nan=0.0, posinf=0.0, neginf=0.0
+                    )
+
+            block.add_gradient(
+                parameter=parameter,
+                gradient=TensorBlock(
+                    values=_dispatch.copy(gradient_values),
+                    samples=gradient.samples,
+                    components=gradient.components,
+                    properties=state.properties,
+                ),
+            )
+
+        return block
+
+
+def _check_same_block_metadata(
+    state: _BlockState,
+    properties: Labels,
+    components: List[Labels],
+    gradients: List[str],
+):
+    if properties != state.properties:
+        raise ValueError(
+            "all blocks with the same key must have the same properties in "
+            "OnlineReducer"
+        )
+
+    same_components = len(components) == len(state.components)
+    if same_components:
+        for i, component in enumerate(components):
+            if component != state.components[i]:
+                same_components = False
+                break
+
+    if not same_components:
+        raise ValueError(
+            "all blocks with the same key must have the same components in "
+            "OnlineReducer"
+        )
+
+    if sorted(gradients) != sorted(state.gradients.keys()):
+        raise ValueError(
+            "all blocks with the same key must have the same gradients in OnlineReducer"
+        )
+
+
+def _remap_gradient_samples(samples: Labels, mapping) -> Labels:
+    """Change the "sample" dimension of gradient ``samples`` with ``mapping``"""
+    values = _dispatch.copy(samples.values)
+    values[:, 0] = _dispatch.make_like(
+        mapping[_index_like(_dispatch.to_index_array(values[:, 0]), mapping)], values
+    )
+    return Labels(samples.names, values)
+
+
+def _copy_state(state: _BlockState) -> _BlockState:
+    """Copy all the arrays in ``state``, so the copy can be updated separately"""
+    new_state = _BlockState.__new__(_BlockState)
+    new_state.__dict__.update(state.__dict__)
+
+    new_state.count = _dispatch.copy(state.count)
+    new_state.mean = _dispatch.copy(state.mean)
+    new_state.m2 = _dispatch.copy(state.m2)
+
+    new_state.gradients = {}
+    for parameter, gradient in state.gradients.items():
+        new_gradient = _GradientState.__new__(_GradientState)
+        new_gradient.samples = gradient.samples
+        new_gradient.components = gradient.components
+        new_gradient.count = _dispatch.copy(gradient.count)
+        new_gradient.sum = _dispatch.copy(gradient.sum)
+        new_gradient.sum_values = _dispatch.copy(gradient.sum_values)
+        new_state.gradients[parameter] = new_gradient
+
+    return new_state
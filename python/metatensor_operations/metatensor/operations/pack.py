@@ -0,0 +1,420 @@
+"""
+Store the values and gradients of all the blocks in a :py:class:`TensorMap` inside a
+single contiguous buffer, and operate on this buffer all at once.
+
+This module is only available in pure Python mode, and can not be used from
+TorchScript.
+"""
+
+from typing import List, Optional, Union
+
+import numpy as np
+
+from . import _dispatch
+from ._backend import TensorBlock, TensorMap, is_metatensor_class
+from ._dispatch import TorchTensor, torch_device, torch_dtype
+from ._utils import _check_gradient_presence_raise
+
+
+def _packing_order(tensor: TensorMap) -> List:
+    """
+    Get all the arrays in ``tensor``, in the order they are stored in packed buffers:
+    for each block, the values first and then the gradients in the order of
+    ``block.gradients_list()``.
+    """
+    arrays = []
+    for block in tensor.blocks():
+        arrays.append(block.values)
+        for _, gradient in block.gradients():
+            if len(gradient.gradients_list()) != 0:
+                raise NotImplementedError("gradients of gradients are not supported")
+            arrays.append(gradient.values)
+    return arrays
+
+
+def _array_base(array):
+    """Get the 1-dimensional array owning the memory of ``array``, or None"""
+    if isinstance(array, TorchTensor):
+        base = array._base
+    else:
+        base = array.base
+        if not isinstance(base, np.ndarray):
+            return None
+
+    if base is None or len(base.shape) != 1:
+        return None
+
+    return base
+
+
+def _offset_in_base(array, base) -> int:
+    """Get the offset (in number of elements) of ``array`` inside ``base``"""
+    if isinstance(array, TorchTensor):
+        return array.storage_offset() - base.storage_offset()
+    else:
+        start = array.__array_interface__["data"][0]
+        base_start = base.__array_interface__["data"][0]
+        return (start - base_start) // array.itemsize
+
+
+def _packed_buffer(tensor: TensorMap):
+    """
+    Get the buffer containing all the values and gradients of ``tensor``, or
+    :py:obj:`None` if the arrays in ``tensor`` are not all consecutive views inside a
+    single buffer (as created by :py:func:`pack`).
+    """
+    if len(tensor.keys) == 0:
+        return None
+
+    # check the first block before looking at all of them, most tensors are not packed
+    buffer = _array_base(tensor.block_by_id(0).values)
+    if buffer is None:
+        return None
+
+    offset = 0
+    for array in _packing_order(tensor):
+        if _array_base(array) is not buffer or not _dispatch.is_contiguous(array):
+            return None
+
+        if _offset_in_base(array, buffer) != offset:
+            return None
+
+        offset += _array_size(array.shape)
+
+    if offset != buffer.shape[0]:
+        return None
+
+    return buffer
+
+
+def _from_packed_buffer(tensor: TensorMap, buffer) -> TensorMap:
+    """
+    Create a new :py:class:`TensorMap` with the same metadata as ``tensor``, and arrays
+    taken from consecutive views inside ``buffer``. ``buffer`` must have the same size
+    as all the arrays in ``tensor`` together.
+    """
+    offset = 0
+
+    def next_view(shape):
+        nonlocal offset
+        size = _array_size(shape)
+        view = buffer[offset : offset + size].reshape(shape)
+        offset += size
+        return view
+
+    blocks: List[TensorBlock] = []
+    for block in tensor.blocks():
+        new_block = TensorBlock(
+            values=next_view(block.values.shape),
+            samples=block.samples,
+            components=block.components,
+            properties=block.properties,
+        )
+
+        for parameter, gradient in block.gradients():
+            new_block.add_gradient(
+                parameter=parameter,
+                gradient=TensorBlock(
+                    values=next_view(gradient.values.shape),
+                    samples=gradient.samples,
+                    components=gradient.components,
+                    properties=gradient.properties,
+                ),
+            )
+
+        blocks.append(new_block)
+
+    assert offset == buffer.shape[0]
+    return TensorMap(tensor.keys, blocks)
+
+
+def _allocate_like(
+    tensor: TensorMap,
+    gradients: Optional[Union[List[str], str]],
+    fill: str,
+    fname: str,
+) -> Optional[TensorMap]:
+    """
+    Create a new :py:class:`TensorMap` with the same metadata as ``tensor``, including
+    the ``gradients`` parameters (or all gradients if this is :py:obj:`None`), and
+    arrays filled according to ``fill`` (one of ``"zeros"``, ``"ones"``, ``"empty"``
+    or ``"random"``).
+
+    The :py:class:`Labels` of ``tensor`` are shared with the new :py:class:`TensorMap`,
+    and the arrays are allocated all at once as views inside a single new buffer. This
+    returns :py:obj:`None` if ``tensor`` has no blocks.
+    """
+    if len(tensor.keys) == 0:
+        return None
+
+    if isinstance(gradients, str):
+        gradients = [gradients]
+
+    # gather all the metadata first, to know the size of the buffer
+    blocks_data = []
+    size = 0
+    for block in tensor.blocks():
+        if gradients is None:
+            parameters = block.gradients_list()
+        else:
+            _check_gradient_presence_raise(block, gradients, fname=fname)
+            parameters = gradients
+
+        shape = block.values.shape
+        size += _array_size(shape)
+
+        gradients_data = []
+        for parameter in parameters:
+            gradient = block.gradient(parameter)
+            if len(gradient.gradients_list()) != 0:
+                raise NotImplementedError("gradients of gradients are not supported")
+
+            gradient_shape = gradient.values.shape
+            size += _array_size(gradient_shape)
+            gradients_data.append((parameter, gradient, gradient_shape))
+
+        blocks_data.append((block, shape, gradients_data))
+
+    array = tensor.block_by_id(0).values
+    if fill == "zeros":
+        buffer = _dispatch.zeros_like(array, [size])
+    elif fill == "ones":
+        buffer = _dispatch.ones_like(array, [size])
+    elif fill == "empty":
+        buffer = _dispatch.empty_like(array, [size])
+    elif fill == "random":
+        buffer = _dispatch.rand_like(array, [size])
+    else:
+        raise ValueError(f"invalid fill: '{fill}'")
+
+    offset = 0
+    blocks: List[TensorBlock] = []
+    for block, shape, gradients_data in blocks_data:
+        new_block = TensorBlock(
+            values=buffer[offset : offset + _array_size(shape)].reshape(shape),
+            samples=block.samples,
+            components=block.components,
+            properties=block.properties,
+        )
+        offset += _array_size(shape)
+
+        for parameter, gradient, gradient_shape in gradients_data:
+            new_block.add_gradient(
+                parameter=parameter,
+                gradient=TensorBlock(
+                    values=buffer[
+                        offset : offset + _array_size(gradient_shape)
+                    ].reshape(gradient_shape),
+                    samples=gradient.samples,
+                    components=gradient.components,
+                    properties=gradient.properties,
+                ),
+            )
+            offset += _array_size(gradient_shape)
+
+        blocks.append(new_block)
+
+    return TensorMap(tensor.keys, blocks)
+
+
+def _array_size(shape) -> int:
+    size = 1
+    for dimension in shape:
+        size *= dimension
+    return size
+
+
+def _has_gradients(tensor: TensorMap) -> bool:
+    for block in tensor.blocks():
+        if len(block.gradients_list()) != 0:
+            return True
+    return False
+
+
+def pack(tensor: TensorMap) -> TensorMap:
+    """
+    Create a new :py:class:`TensorMap` where the values and gradients of all blocks are
+    stored in a single contiguous buffer.
+
+    The blocks of the new :py:class:`TensorMap` are accessed as usual, and their
+    ``values`` are views inside the shared buffer. This is useful for
+    :py:class:`TensorMap` containing many small blocks, since operations able to work
+    on the whole buffer (:py:func:`multiply` and :py:func:`divide` by a scalar, as
+    well as :py:func:`add`, :py:func:`abs` and :py:func:`pow` on :py:class:`TensorMap`
+    without gradients) then run a single kernel instead of one kernel per block. The
+    output of these operations is packed as well.
+
+    Since all blocks in a :py:class:`TensorMap` share the same dtype and device, a
+    single buffer is used for all arrays. Modifying the values of one of the blocks in
+    place (e.g. ``block.values[:] = 0``) keeps the :py:class:`TensorMap` packed.
+
+    >>> import metatensor
+    >>> from metatensor import Labels, TensorBlock, TensorMap
+    >>> import numpy as np
+    >>> blocks = [
+    ...     TensorBlock(
+    ...         values=np.full((2, 3), float(i)),
+    ...         samples=Labels.range("s", 2),
+    ...         components=[],
+    ...         properties=Labels.range("p", 3),
+    ...     )
+    ...     for i in range(3)
+    ... ]
+    >>> tensor = TensorMap(Labels.range("key", 3), blocks)
+    >>> packed = metatensor.pack(tensor)
+    >>> metatensor.is_packed(packed)
+    True
+    >>> print(packed.block(1).values)
+    [[1. 1. 1.]
+     [1. 1. 1.]]
+    >>> metatensor.is_packed(metatensor.multiply(packed, 2.0))
+    True
+
+    :param tensor: input :py:class:`TensorMap`
+
+    :return: a new :py:class:`TensorMap` with the same metadata and data as
+        ``tensor``, with all arrays stored in the same buffer
+    """
+    if not is_metatensor_class(tensor, TensorMap):
+        raise TypeError(f"`tensor` must be a metatensor TensorMap, not {type(tensor)}")
+
+    arrays = _packing_order(tensor)
+    if len(arrays) == 0:
+        return tensor.copy()
+
+    buffer = _dispatch.concatenate([array.reshape(-1) for array in arrays], axis=0)
+    return _from_packed_buffer(tensor, buffer)
+
+
+def is_packed(tensor: TensorMap) -> bool:
+    """
+    Check if the values and gradients of all blocks in ``tensor`` are stored in a single
+    buffer, as created by :py:func:`pack`.
+
+    :param tensor: input :py:class:`TensorMap`
+
+    :return: whether ``tensor`` is packed
+    """
+    if not is_metatensor_class(tensor, TensorMap):
+        raise TypeError(f"`tensor` must be a metatensor TensorMap, not {type(tensor)}")
+
+    return _packed_buffer(tensor) is not None
+
+
+def packed_to(
+    tensor: TensorMap,
+    device: Optional[Union[str, torch_device]] = None,
+    dtype: Optional[Union[np.dtype, torch_dtype]] = None,
+    non_blocking: bool = False,
+    pin_memory: bool = False,
+) -> TensorMap:
+    """
+    Move all the values and gradients of ``tensor`` to the given ``device`` and
+    ``dtype`` with a single transfer, returning a packed :py:class:`TensorMap`.
+
+    :py:meth:`TensorMap.to` moves each array separately, which is slow for
+    :py:class:`TensorMap` containing many small blocks when moving data between host
+    and accelerator, since each array requires a separate (synchronizing) copy. This
+    function instead gathers all arrays in a single buffer (re-using the existing buffer
+    if ``tensor`` is already packed, see :py:func:`pack`), transfers this buffer at
+    once, and creates views inside the transferred buffer for all the blocks.
+
+    With torch arrays, ``pin_memory=True`` stages the buffer in page-locked host memory
+    before moving it to a non-CPU device, which allows the copy to run asynchronously
+    when ``non_blocking=True``. Non-blocking copies are issued on the current stream,
+    use ``torch.cuda.stream()`` to select a different one. ``pin_memory`` is ignored
+    when moving data to the CPU.
+
+    >>> import metatensor
+    >>> from metatensor import Labels, TensorBlock, TensorMap
+    >>> import numpy as np
+    >>> blocks = [
+    ...     TensorBlock(
+    ...         values=np.full((2, 3), float(i)),
+    ...         samples=Labels.range("s", 2),
+    ...         components=[],
+    ...         properties=Labels.range("p", 3),
+    ...     )
+    ...     for i in range(3)
+    ... ]
+    >>> tensor = TensorMap(Labels.range("key", 3), blocks)
+    >>> moved = metatensor.packed_to(tensor, device="cpu", dtype=np.float32)
+    >>> moved.dtype
+    dtype('float32')
+    >>> metatensor.is_packed(moved)
+    True
+
+    :param tensor: input :py:class:`TensorMap`
+    :param device: new device for all arrays. The device stays the same if this is
+        :py:obj:`None`. Only ``"cpu"`` is supported for numpy arrays.
+    :param dtype: new dtype for all arrays. The dtype stays the same if this is
+        :py:obj:`None`.
+    :param non_blocking: use an asynchronous copy when moving torch arrays to a
+        different device, if possible
+    :param pin_memory: stage the data in page-locked memory before moving torch arrays
+        from the CPU to a different device
+
+    :return: a new packed :py:class:`TensorMap` with the same metadata and data as
+        ``tensor``, with arrays on ``device`` and with the given ``dtype``
+    """
+    if not is_metatensor_class(tensor, TensorMap):
+        raise TypeError(f"`tensor` must be a metatensor TensorMap, not {type(tensor)}")
+
+    arrays = _packing_order(tensor)
+    if len(arrays) == 0:
+        return tensor.to(device=device, dtype=dtype)
+
+    buffer = _packed_buffer(tensor)
+
+    if isinstance(arrays[0], TorchTensor):
+        import torch
+
+        if device is not None:
+            device = torch.device(device)
+
+        stage_in_pinned = (
+            pin_memory
+            and device is not None
+            and device.type != "cpu"
+            and arrays[0].device.type == "cpu"
+        )
+
+        if buffer is None:
+            flat = [array.reshape(-1) for array in arrays]
+            if stage_in_pinned:
+                size = 0
+                for array in flat:
+                    size += array.shape[0]
+                buffer = torch.empty(size, dtype=arrays[0].dtype, pin_memory=True)
+                torch.cat(flat, out=buffer)
+            else:
+                buffer = torch.cat(flat)
+        elif stage_in_pinned and not buffer.is_pinned():
+            buffer = buffer.pin_memory()
+
+        buffer = buffer.to(device=device, dtype=dtype, non_blocking=non_blocking)
+    else:
+        if device is not None and str(device) != "cpu":
+            raise ValueError(f"can not move numpy array to non-cpu device: {device}")
+
+        if buffer is None:
+            buffer = np.concatenate([array.reshape(-1) for array in arrays])
+
+        if dtype is not None:
+            buffer = buffer.astype(dtype, copy=False)
+
+    return _from_packed_buffer(tensor, buffer)
+
+
+def _packed_elementwise(tensor: TensorMap, gradients_too: bool):
+    """
+    Get the buffer of a packed ``tensor`` for operations applying the same elementwise
+    function to all arrays (``gradients_too=True``), or only to the values of tensors
+    without gradients (``gradients_too=False``). Returns :py:obj:`None` if the
+    operation can not be applied to the whole buffer.
+    """
+    buffer = _packed_buffer(tensor)
+    if buffer is not None and not gradients_too and _has_gradients(tensor):
+        return None
+
+    return buffer
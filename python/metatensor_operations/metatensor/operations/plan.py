@@ -0,0 +1,344 @@
+"""
+Pre-compute the metadata of a sequence of operations for one template
+:py:class:`TensorMap`, and apply them to many tensors with the same keys, components
+and properties.
+
+This module is only available in pure Python mode, and can not be used from
+TorchScript.
+"""
+
+from typing import Dict, List, Union
+
+from . import _dispatch
+from ._backend import Labels, TensorBlock, TensorMap, is_metatensor_class
+from ._dispatch import TorchTensor
+
+
+class _BlockPlan:
+    """Metadata and indices used to create a single block of the output"""
+
+    def __init__(self, source: int, block: TensorBlock):
+        # index of the input block this block is created from
+        self.source = source
+        # indices of the input properties to take, or None to take all of them
+        self.properties_indices = None
+        self.properties: Labels = block.properties
+        self.components: List[Labels] = block.components
+        self.gradients_components: Dict[str, List[Labels]] = {
+            parameter: gradient.components for parameter, gradient in block.gradients()
+        }
+
+        # `properties_indices` converted to the different backends/devices
+        self._indices_cache = {}
+
+    def take_properties(self, indices):
+        """Only keep the properties at ``indices``"""
+        if self.properties_indices is None:
+            self.properties_indices = indices
+        else:
+            self.properties_indices = self.properties_indices[indices]
+
+        self.properties = Labels(self.properties.names, self.properties.values[indices])
+        self._indices_cache = {}
+
+    def indices_like(self, array):
+        """Get ``properties_indices`` on the same backend and device as ``array``"""
+        if isinstance(array, TorchTensor):
+            cache_key = str(array.device)
+        else:
+            cache_key = "numpy"
+
+        indices = self._indices_cache.get(cache_key)
+        if indices is None:
+            if isinstance(array, TorchTensor):
+                indices = _dispatch.to(
+                    self.properties_indices, backend="torch", device=array.device
+                )
+            else:
+                indices = _dispatch.to(self.properties_indices, backend="numpy")
+
+            indices = _dispatch.to_index_array(indices)
+            self._indices_cache[cache_key] = indices
+
+        return indices
+
+
+def _check_plan_axis(axis: str, allowed: List[str], fname: str):
+    if axis == "samples":
+        raise ValueError(
+            f"MetadataPlan.{fname} can not act on samples, since they are different "
+            f"for each tensor. Use metatensor.{fname} directly instead"
+        )
+
+    if axis not in allowed:
+        raise ValueError(
+            f"`axis` must be one of {', '.join(repr(a) for a in allowed)} in "
+            f"MetadataPlan.{fname}, got '{axis}'"
+        )
+
+
+class MetadataPlan:
+    """
+    Sequence of operations modifying the keys, components and properties of a
+    :py:class:`TensorMap`, prepared once for a ``template`` tensor and applied to many
+    tensors with the same keys, components and properties.
+
+    All the metadata of the output (new :py:class:`Labels`, permutations of the blocks
+    and indices of the selected properties) is computed when adding operations to the
+    plan, and :py:meth:`apply` only has to gather the values and gradients of the
+    input blocks. The samples of each input tensor are passed through unchanged, which
+    means that operations acting on samples can not be part of a plan.
+
+    The operations are added by calling the corresponding methods, which return the
+    plan itself to allow chaining them:
+
+    >>> import numpy as np
+    >>> import metatensor
+    >>> from metatensor import Labels, TensorBlock, TensorMap
+    >>> def create_tensor(n_samples):
+    ...     blocks = [
+    ...         TensorBlock(
+    ...             values=np.random.rand(n_samples, 4),
+    ...             samples=Labels.range("system", n_samples),
+    ...             components=[],
+    ...             properties=Labels(
+    ...                 ["n", "l"], np.array([[1, 0], [0, 0], [1, 1], [0, 1]])
+    ...             ),
+    ...         )
+    ...         for _ in range(2)
+    ...     ]
+    ...     keys = Labels(["center_type", "species"], np.array([[8, 0], [1, 0]]))
+    ...     return TensorMap(keys, blocks)
+    >>> plan = (
+    ...     metatensor.MetadataPlan(create_tensor(10))
+    ...     .slice("properties", Labels(["l"], np.array([[0]])))
+    ...     .sort("properties")
+    ...     .sort("keys")
+    ...     .remove_dimension("keys", "species")
+    ... )
+    >>> tensor = create_tensor(3)
+    >>> result = plan.apply(tensor)
+    >>> result.keys
+    Labels(
+        center_type
+             1
+             8
+    )
+    >>> result.block(0).properties
+    Labels(
+        n  l
+        0  0
+        1  0
+    )
+    >>> bool(np.all(result.block(0).values == tensor.block(1).values[:, [1, 0]]))
+    True
+
+    :param template: :py:class:`TensorMap` with the same keys, components and
+        properties as the tensors the plan will be applied to
+    """
+
+    def __init__(self, template: TensorMap):
+        if not is_metatensor_class(template, TensorMap):
+            raise TypeError(
+                f"`template` must be a metatensor TensorMap, not {type(template)}"
+            )
+
+        self._input_keys = template.keys
+        self._input_blocks = template.blocks()
+
+        self._keys = template.keys
+        self._blocks = [
+            _BlockPlan(source=i, block=block)
+            for i, block in enumerate(template.blocks())
+        ]
+
+    def slice(self, axis: str, selection: Labels) -> "MetadataPlan":
+        """
+        Only keep the properties matching ``selection``, see
+        :py:func:`metatensor.slice`. Slicing along samples is not supported in plans.
+        """
+        _check_plan_axis(axis, ["properties"], "slice")
+
+        for block in self._blocks:
+            # keep the properties in the same order as the input, like `slice`
+            bool_array = _dispatch.bool_array_like([], block.properties.values)
+            mask = _dispatch.zeros_like(bool_array, [len(block.properties)])
+            mask[block.properties.select(selection)] = True
+            block.take_properties(_dispatch.where(mask)[0])
+
+        return self
+
+    def sort(
+        self, axes: Union[str, List[str]], descending: bool = False
+    ) -> "MetadataPlan":
+        """
+        Sort the ``"keys"`` and/or ``"properties"``, see :py:func:`metatensor.sort`.
+        Sorting samples or components is not supported in plans.
+        """
+        if isinstance(axes, str):
+            axes = [axes]
+
+        for axis in axes:
+            _check_plan_axis(axis, ["keys", "properties"], "sort")
+
+        if "keys" in axes:
+            order = _dispatch.argsort_labels_values(
+                self._keys.values, reverse=descending
+            )
+            self._keys = Labels(self._keys.names, self._keys.values[order])
+            self._blocks = [self._blocks[int(i)] for i in order]
+
+        if "properties" in axes:
+            for block in self._blocks:
+                block.take_properties(
+                    _dispatch.argsort_labels_values(
+                        block.properties.values, reverse=descending
+                    )
+                )
+
+        return self
+
+    def remove_dimension(self, axis: str, name: str) -> "MetadataPlan":
+        """
+        Remove the dimension ``name`` from the ``"keys"`` or ``"properties"``, see
+        :py:func:`metatensor.remove_dimension`.
+        """
+        _check_plan_axis(axis, ["keys", "properties"], "remove_dimension")
+
+        if axis == "keys":
+            self._keys = self._keys.remove(name)
+        else:
+            for block in self._blocks:
+                block.properties = block.properties.remove(name)
+
+        return self
+
+    def rename_dimension(self, axis: str, old: str, new: str) -> "MetadataPlan":
+        """
+        Rename the dimension ``old`` to ``new`` in the ``"keys"``, ``"components"`` or
+        ``"properties"``, see :py:func:`metatensor.rename_dimension`.
+        """
+        _check_plan_axis(axis, ["keys", "components", "properties"], "rename_dimension")
+
+        if axis == "keys":
+            self._keys = self._keys.rename(old, new)
+        elif axis == "properties":
+            for block in self._blocks:
+                block.properties = block.properties.rename(old, new)
+        else:
+            for block in self._blocks:
+                block.components = _rename_components(block.components, old, new)
+                for parameter, components in block.gradients_components.items():
+                    block.gradients_components[parameter] = _rename_components(
+                        components, old, new
+                    )
+
+        return self
+
+    def permute_dimensions(
+        self, axis: str, dimensions_indexes: List[int]
+    ) -> "MetadataPlan":
+        """
+        Permute the dimensions of the ``"keys"`` or ``"properties"``, see
+        :py:func:`metatensor.permute_dimensions`.
+        """
+        _check_plan_axis(axis, ["keys", "properties"], "permute_dimensions")
+
+        if axis == "keys":
+            self._keys = self._keys.permute(dimensions_indexes)
+        else:
+            for block in self._blocks:
+                block.properties = block.properties.permute(dimensions_indexes)
+
+        return self
+
+    def apply(self, tensor: TensorMap) -> TensorMap:
+        """
+        Apply all the operations in this plan to ``tensor``, which must have the same
+        keys, components, properties and gradients as the template used to create the
+        plan.
+        """
+        if not is_metatensor_class(tensor, TensorMap):
+            raise TypeError(
+                f"`tensor` must be a metatensor TensorMap, not {type(tensor)}"
+            )
+
+        if tensor.keys != self._input_keys:
+            raise ValueError(
+                "the keys of `tensor` are different from the keys of the template "
+                "used to create this plan"
+            )
+
+        input_blocks = tensor.blocks()
+        for i, block in enumerate(input_blocks):
+            _check_block_metadata(block, self._input_blocks[i])
+
+        blocks: List[TensorBlock] = []
+        for plan in self._blocks:
+            blocks.append(_apply_block_plan(plan, input_blocks[plan.source]))
+
+        return TensorMap(self._keys, blocks)
+
+
+def _rename_components(components: List[Labels], old: str, new: str) -> List[Labels]:
+    new_components = []
+    for component in components:
+        if old in component.names:
+            component = component.rename(old, new)
+        new_components.append(component)
+    return new_components
+
+
+def _check_block_metadata(block: TensorBlock, template: TensorBlock):
+    """Check that ``block`` has the same metadata as the ``template`` block"""
+    # all these Labels are usually shared between the tensors, making the comparison
+    # very cheap
+    if block.properties != template.properties:
+        raise ValueError(
+            "the properties of `tensor` are different from the properties of the "
+            "template used to create this plan"
+        )
+
+    if block.components != template.components:
+        raise ValueError(
+            "the components of `tensor` are different from the components of the "
+            "template used to create this plan"
+        )
+
+    if block.gradients_list() != template.gradients_list():
+        raise ValueError(
+            "the gradients of `tensor` are different from the gradients of the "
+            "template used to create this plan"
+        )
+
+
+def _take_properties(plan: _BlockPlan, values):
+    if plan.properties_indices is None:
+        return values
+    else:
+        return _dispatch.take(values, plan.indices_like(values), axis=-1)
+
+
+def _apply_block_plan(plan: _BlockPlan, block: TensorBlock) -> TensorBlock:
+    new_block = TensorBlock(
+        values=_take_properties(plan, block.values),
+        samples=block.samples,
+        components=plan.components,
+        properties=plan.properties,
+    )
+
+    for parameter, gradient in block.gradients():
+        if len(gradient.gradients_list()) != 0:
+            raise NotImplementedError("gradients of gradients are not supported")
+
+        new_block.add_gradient(
+            parameter=parameter,
+            gradient=TensorBlock(
+                values=_take_properties(plan, gradient.values),
+                samples=gradient.samples,
+                components=plan.gradients_components[parameter],
+                properties=plan.properties,
+            ),
+        )
+
+    return new_block
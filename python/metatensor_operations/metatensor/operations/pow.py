@@ -1,4 +1,4 @@
-from typing import List, Union
+from typing import List, Optional, Union
 
 from . import _dispatch
 from ._backend import (
@@ -8,6 +8,18 @@ from ._backend import (
     torch_jit_is_scripting,
     torch_jit_script,
 )
+from ._utils import _copy_into
+from .chunks import _samples_chunk_size
+from .map_blocks import _map_blocks_impl, _use_parallel_blocks
+from .pack import _from_packed_buffer, _packed_elementwise
+
+
+def _pow_gradient_values(values, gradient, constant: float):
+    """
+    Gradients of ``values ** constant``, from the values gathered for each gradient
+    sample and the corresponding gradients
+    """
+    return constant * gradient * values ** (constant - 1)
 
 
 def _pow_block_constant(block: TensorBlock, constant: float) -> TensorBlock:
@@ -34,15 +46,32 @@ def _pow_block_constant(block: TensorBlock, constant: float) -> TensorBlock:
         # of the gradients and the values and then use it to create
         # empty dimensions for broadcasting
         diff_components = len(gradient_values.shape) - len(block.values.shape)
-        gradient_samples_to_values_samples = gradient.samples.column("sample")
-        values_grad = (
-            constant
-            * gradient_values
-            * block.values[
-                _dispatch.to_index_array(gradient_samples_to_values_samples)
-            ].reshape([-1] + [1] * diff_components + _shape)
-            ** (constant - 1)
+        values_index = _dispatch.to_index_array(gradient.samples.column("sample"))
+        broadcast_shape = [-1] + [1] * diff_components + _shape
+
+        n_gradient_samples = len(gradient.samples)
+        chunk_size = n_gradient_samples
+        if not torch_jit_is_scripting():
+            chunk_size = _samples_chunk_size(n_gradient_samples)
+
+        values_grad = _pow_gradient_values(
+            block.values[values_index[:chunk_size]].reshape(broadcast_shape),
+            gradient_values[:chunk_size],
+            constant,
         )
+        if chunk_size < n_gradient_samples:
+            # compute the remaining gradient samples by chunks, and write them in a
+            # pre-allocated array
+            first_chunk = values_grad
+            values_grad = _dispatch.empty_like(first_chunk, list(gradient_values.shape))
+            values_grad[:chunk_size] = first_chunk
+            for start in range(chunk_size, n_gradient_samples, chunk_size):
+                stop = start + chunk_size
+                values_grad[start:stop] = _pow_gradient_values(
+                    block.values[values_index[start:stop]].reshape(broadcast_shape),
+                    gradient_values[start:stop],
+                    constant,
+                )
 
         result_block.add_gradient(
             parameter=parameter,
@@ -57,8 +86,64 @@ def _pow_block_constant(block: TensorBlock, constant: float) -> TensorBlock:
     return result_block
 
 
+def _pow_block_constant_inplace(block: TensorBlock, constant: float) -> None:
+    _shape: List[int] = []
+    for c in block.components:
+        _shape.append(len(c))
+    _shape.append(len(block.properties))
+
+    # the gradients are updated first, since they use the values before taking the
+    # power
+    for _, gradient in block.gradients():
+        if len(gradient.gradients_list()) != 0:
+            raise NotImplementedError("gradients of gradients are not supported")
+
+        diff_components = len(gradient.values.shape) - len(block.values.shape)
+        broadcast_shape = [-1] + [1] * diff_components + _shape
+        values_index = _dispatch.to_index_array(gradient.samples.column("sample"))
+
+        gradient_values = gradient.values
+        gradient_values *= constant * block.values[values_index].reshape(
+            broadcast_shape
+        ) ** (constant - 1)
+
+    _dispatch.pow_(block.values, constant)
+
+
+@torch_jit_script
+def pow_(A: TensorMap, B: Union[float, int]) -> TensorMap:
+    r"""In-place version of :py:func:`pow`, raising the values of ``A`` to the power
+    ``B`` and updating the gradients accordingly, and returning ``A``.
+
+    .. note::
+      Other :py:class:`TensorMap` sharing arrays with ``A`` are also modified, see
+      :py:func:`add_` for the operations sharing arrays between their input and output.
+
+    :param A: :py:class:`TensorMap` to modify.
+    :param B: The power to which we want to elevate ``A``.
+
+    :return: ``A``, after raising it to the power ``B``.
+    """
+    if not torch_jit_is_scripting():
+        if not is_metatensor_class(A, TensorMap):
+            raise TypeError(f"`A` must be a metatensor TensorMap, not {type(A)}")
+
+        if not isinstance(B, (float, int)):
+            raise TypeError(f"`B` must be a scalar value, not {type(B)}")
+
+    B = float(B)
+    for block_A in A.blocks():
+        _pow_block_constant_inplace(block=block_A, constant=B)
+
+    return A
+
+
 @torch_jit_script
-def pow(A: TensorMap, B: Union[float, int]) -> TensorMap:
+def pow(
+    A: TensorMap,
+    B: Union[float, int],
+    out: Optional[TensorMap] = None,
+) -> TensorMap:
     r"""Return a new :class:`TensorMap` with the same metadata of ``A``
     and the values being the element-wise ``B``-power of ``A.values``.
 
@@ -73,8 +158,13 @@ def pow(A: TensorMap, B: Union[float, int]) -> TensorMap:
     :param B: The power to which we want to elevate ``A``.
                Parameter can only be a scalar or something that can be converted to a
                scalar.
+    :param out: Optional :py:class:`TensorMap` with the same metadata as ``A``. If
+               given, the result is written in the existing values and gradients
+               arrays of ``out`` instead of allocating new ones. ``out`` can be
+               ``A`` itself. See also :py:func:`pow_`.
 
-    :return: New :py:class:`TensorMap` with the same metadata as ``A``.
+    :return: New :py:class:`TensorMap` with the same metadata as ``A``, or ``out``
+             if given.
     """
     if not torch_jit_is_scripting():
         if not is_metatensor_class(A, TensorMap):
@@ -83,8 +173,23 @@ def pow(A: TensorMap, B: Union[float, int]) -> TensorMap:
         if not isinstance(B, (float, int)):
             raise TypeError(f"`B` must be a scalar value, not {type(B)}")
 
+    if out is not None:
+        _copy_into(out, A, "pow")
+        return pow_(out, B)
+
     B = float(B)
 
+    if not torch_jit_is_scripting():
+        buffer = _packed_elementwise(A, gradients_too=False)
+        if buffer is not None:
+            return _from_packed_buffer(A, buffer**B)
+
+        if _use_parallel_blocks(len(A)):
+            blocks = _map_blocks_impl(
+                _pow_block_constant, [(block_A, B) for block_A in A.blocks()]
+            )
+            return TensorMap(A.keys, blocks)
+
     blocks: List[TensorBlock] = []
     for block_A in A.blocks():
         blocks.append(_pow_block_constant(block=block_A, constant=B))
@@ -52,6 +52,8 @@ from ._backend import (
     torch_jit_is_scripting,
     torch_jit_script,
 )
+from .chunks import _samples_chunk_size
+from .map_blocks import _map_blocks_impl, _use_parallel_blocks
 
 
 def _reduce_over_samples_block(
@@ -157,15 +159,7 @@ def _reduce_over_samples_block(
 
     block_values = block.values
     other_shape = block_values.shape[1:]
-    values_result = _dispatch.zeros_like(
-        block_values, shape=(new_samples.shape[0],) + other_shape
-    )
-
-    _dispatch.index_add(
-        values_result,
-        block_values,
-        index,
-    )
+    values_result = _dispatch.segment_sum(block_values, index, new_samples.shape[0])
 
     # define values_mean for torchscript (won't be used unless there are gradients)
     values_mean = _dispatch.empty_like(values_result, [0])
@@ -176,14 +170,25 @@ def _reduce_over_samples_block(
             (-1,) + (1,) * len(other_shape)
         )
         if reduction == "std" or reduction == "var":
-            values_result2 = _dispatch.zeros_like(
-                block_values, shape=(new_samples.shape[0],) + other_shape
-            )
-            _dispatch.index_add(
-                values_result2,
-                block_values**2,
-                index,
+            n_samples = block_values.shape[0]
+            chunk_size = n_samples
+            if not torch_jit_is_scripting():
+                chunk_size = _samples_chunk_size(n_samples)
+
+            # accumulate the sum of squares by chunks of samples, to only create
+            # the squared values for a single chunk at once
+            values_result2 = _dispatch.segment_sum(
+                block_values[:chunk_size] ** 2,
+                index[:chunk_size],
+                new_samples.shape[0],
             )
+            for start in range(chunk_size, n_samples, chunk_size):
+                stop = start + chunk_size
+                values_result2 = values_result2 + _dispatch.segment_sum(
+                    block_values[start:stop] ** 2,
+                    index[start:stop],
+                    new_samples.shape[0],
+                )
             values_result2 = values_result2 / bincount.reshape(
                 (-1,) + (1,) * len(other_shape)
             )
@@ -251,11 +256,10 @@ def _reduce_over_samples_block(
 
         gradient_values = gradient.values
         other_shape = gradient_values.shape[1:]
-        gradient_values_result = _dispatch.zeros_like(
-            gradient_values,
-            shape=(new_gradient_samples.shape[0],) + other_shape,
+        n_gradient_samples = new_gradient_samples.shape[0]
+        gradient_values_result = _dispatch.segment_sum(
+            gradient_values, index_gradient, n_gradient_samples
         )
-        _dispatch.index_add(gradient_values_result, gradient_values, index_gradient)
 
         if reduction == "mean" or reduction == "var" or reduction == "std":
             bincount = _dispatch.bincount(index_gradient)
@@ -263,54 +267,69 @@ def _reduce_over_samples_block(
                 (-1,) + (1,) * len(other_shape)
             )
             if reduction == "std" or reduction == "var":
-                values_times_gradient_values = _dispatch.zeros_like(gradient_values)
-
-                for i in range(gradient.samples.values.shape[0]):
-                    s = gradient.samples.entry(i)
-                    values_times_gradient_values[i] = (
-                        gradient_values[i] * block_values[int(s[0])]
-                    )
-
-                values_grad_result = _dispatch.zeros_like(
-                    gradient_values,
-                    shape=(new_gradient_samples.shape[0],) + other_shape,
+                # sample in the block values and in the reduced values for each
+                # gradient sample, before and after the reduction
+                values_index = _dispatch.to_index_array(gradient_samples.values[:, 0])
+                reduced_index = _dispatch.to_index_array(new_gradient_samples[:, 0])
+
+                # add axes for the gradient-specific components to broadcast the
+                # values against the gradients
+                n_gradient_components = len(gradient_values.shape) - len(
+                    block_values.shape
                 )
-                _dispatch.index_add(
-                    values_grad_result,
-                    values_times_gradient_values,
-                    index_gradient,
+                broadcast_shape: List[int] = [-1]
+                for _ in range(n_gradient_components):
+                    broadcast_shape.append(1)
+                for size in other_shape[n_gradient_components:]:
+                    broadcast_shape.append(size)
+
+                n_samples = gradient_values.shape[0]
+                chunk_size = n_samples
+                if not torch_jit_is_scripting():
+                    chunk_size = _samples_chunk_size(n_samples)
+
+                values_grad_result = _dispatch.segment_sum(
+                    gradient_values[:chunk_size]
+                    * block_values[values_index[:chunk_size]].reshape(broadcast_shape),
+                    index_gradient[:chunk_size],
+                    n_gradient_samples,
                 )
-
+                for start in range(chunk_size, n_samples, chunk_size):
+                    stop = start + chunk_size
+                    values_grad_result = values_grad_result + _dispatch.segment_sum(
+                        gradient_values[start:stop]
+                        * block_values[values_index[start:stop]].reshape(
+                            broadcast_shape
+                        ),
+                        index_gradient[start:stop],
+                        n_gradient_samples,
+                    )
                 values_grad_result = values_grad_result / bincount.reshape(
                     (-1,) + (1,) * len(other_shape)
                 )
+
+                mean_times_gradient = gradient_values_result * values_mean[
+                    reduced_index
+                ].reshape(broadcast_shape)
                 if reduction == "var":
-                    for i, s in enumerate(new_gradient_samples):
-                        gradient_values_result[i] = (
-                            gradient_values_result[i] * values_mean[int(s[0])]
-                        )
                     gradient_values_result = 2 * (
-                        values_grad_result - gradient_values_result
+                        values_grad_result - mean_times_gradient
                     )
                 else:  # std
-                    for i, s in enumerate(new_gradient_samples):
-                        sample = int(s[0])
-                        if torch_jit_is_scripting():
-                            gradient_values_result[i] = (
-                                values_grad_result[i]
-                                - (gradient_values_result[i] * values_mean[sample])
-                            ) / values_result[sample]
-                        else:
-                            # only numpy raise a warning for division by zero
-                            with np.errstate(divide="ignore", invalid="ignore"):
-                                gradient_values_result[i] = (
-                                    values_grad_result[i]
-                                    - (gradient_values_result[i] * values_mean[sample])
-                                ) / values_result[sample]
-
-                        gradient_values_result[i] = _dispatch.nan_to_num(
-                            gradient_values_result[i], nan=0.0, posinf=0.0, neginf=0.0
-                        )
+                    if torch_jit_is_scripting():
+                        gradient_values_result = (
+                            values_grad_result - mean_times_gradient
+                        ) / values_result[reduced_index].reshape(broadcast_shape)
+                    else:
+                        # only numpy raise a warning for division by zero
+                        with np.errstate(divide="ignore", invalid="ignore"):
+                            gradient_values_result = (
+                                values_grad_result - mean_times_gradient
+                            ) / values_result[reduced_index].reshape(broadcast_shape)
+
+                    gradient_values_result = _dispatch.nan_to_num(
+                        gradient_values_result, nan=0.0, posinf=0.0, neginf=0.0
+                    )
 
         # no check for the len of the gradient sample is needed because there
         # always will be at least one sample in the gradient
@@ -361,6 +380,15 @@ def _reduce_over_samples(
             continue
         remaining_samples.append(s_name)
 
+    if not torch_jit_is_scripting():
+        if _use_parallel_blocks(len(tensor)):
+            arguments = [
+                (block, sample_names_list, reduction, remaining_samples)
+                for block in tensor.blocks()
+            ]
+            blocks = _map_blocks_impl(_reduce_over_samples_block, arguments)
+            return TensorMap(tensor.keys, blocks)
+
     blocks: List[TensorBlock] = []
     for block in tensor.blocks():
         blocks.append(
@@ -11,28 +11,63 @@ from ._backend import (
     torch_jit_script,
 )
 from ._dispatch import TorchTensor
+from .map_blocks import _map_blocks_impl, _use_parallel_blocks
 
 
 SliceSelection = Union[List[int], LabelsValues, Labels]
 
 
-def _slice_block(
-    block: TensorBlock, axis: str, selection: SliceSelection
-) -> TensorBlock:
+def _selected_indices(block: TensorBlock, axis: str, selection: SliceSelection):
+    """Get the indices of the samples/properties of ``block`` in ``selection``"""
     if isinstance(selection, list):
-        selected = _dispatch.int_array_like(selection, block.samples.values)
+        return _dispatch.int_array_like(selection, block.samples.values)
     elif isinstance(selection, LabelsValues):
-        selected = selection
+        return selection
     else:
         if not torch_jit_is_scripting():
             # This should already have been checked
             assert is_metatensor_class(selection, Labels)
 
         if axis == "samples":
-            selected = block.samples.select(selection)
+            labels = block.samples
         else:
             assert axis == "properties"
-            selected = block.properties.select(selection)
+            labels = block.properties
+
+        if isinstance(labels.values, TorchTensor):
+            return _select_on_device(labels, selection)
+        else:
+            return labels.select(selection)
+
+
+def _select_on_device(labels: Labels, selection: Labels):
+    """
+    Same as ``labels.select(selection)``, but running on the device of the labels
+    values with sort-based kernels, instead of copying the labels to the CPU.
+    """
+    if selection.names == labels.names:
+        # entries in the same order as `selection`, like `Labels.select`
+        positions = _dispatch.rows_positions(labels.values, selection.values)
+        return positions[positions >= 0]
+
+    columns: List[int] = []
+    for name in selection.names:
+        if name not in labels.names:
+            # let the labels produce the error
+            return labels.select(selection)
+        columns.append(labels.names.index(name))
+
+    projected = _dispatch.take(
+        labels.values, _dispatch.int_array_like(columns, labels.values), axis=1
+    )
+    selected = _dispatch.rows_isin(projected, selection.values)
+    return _dispatch.where(selected)[0]
+
+
+def _slice_block(
+    block: TensorBlock, axis: str, selection: SliceSelection
+) -> TensorBlock:
+    selected = _selected_indices(block, axis, selection)
 
     if axis == "samples":
         bool_array = _dispatch.bool_array_like([], block.properties.values)
@@ -50,15 +85,11 @@ def _slice_block(
         # to update the gradient samples
 
         # sample_map contains at position `old_sample` the index of the
-        # corresponding `new_sample`
-        sample_map = _dispatch.int_array_like(
-            int_list=[-1] * len(block.samples),
-            like=block.samples.values,
-        )
-
-        sample_map[selected] = _dispatch.int_array_like(
-            list(range(len(selected))),
-            like=block.samples.values,
+        # corresponding `new_sample`. Only the selected samples are ever used.
+        sample_map = _dispatch.empty_like(block.samples.values, [len(block.samples)])
+        sample_map[selected] = _dispatch.make_like(
+            _dispatch.indices_like([len(selected)], selected).reshape(-1),
+            block.samples.values,
         )
 
         for parameter, gradient in block.gradients():
@@ -230,6 +261,11 @@ def slice(tensor: TensorMap, axis: str, selection: Labels) -> TensorMap:
 
     _check_slice_args(tensor.block(0), axis=axis, selection=selection)
 
+    if not torch_jit_is_scripting():
+        if _use_parallel_blocks(len(tensor)):
+            arguments = [(block, axis, selection) for block in tensor.blocks()]
+            return TensorMap(tensor.keys, _map_blocks_impl(_slice_block, arguments))
+
     return TensorMap(
         keys=tensor.keys,
         blocks=[
@@ -1,22 +1,28 @@
-from typing import List
+from typing import List, Tuple
 
 from . import _dispatch
 from ._backend import (
+    Array,
     Labels,
     TensorBlock,
     TensorMap,
     torch_jit_annotate,
+    torch_jit_is_scripting,
     torch_jit_script,
 )
-from ._utils import _check_same_gradients_raise, _check_same_keys_raise
+from ._utils import (
+    _check_same_gradients_raise,
+    _check_same_keys_raise,
+    _group_same_shapes,
+    _matching_blocks,
+)
+from .map_blocks import _map_blocks_impl, _use_parallel_blocks
 
 
-@torch_jit_script
-def _solve_block(X: TensorBlock, Y: TensorBlock) -> TensorBlock:
+def _solve_arrays(X: TensorBlock, Y: TensorBlock, alpha: float) -> Tuple[Array, Array]:
     """
-    Solve a linear system among two :py:class:`TensorBlock`.
-    Solve the linear equation set X * w = Y for the unknown w.
-    Where X , w, Y are all :py:class:`TensorBlock`
+    Get the 2-dimensional arrays defining the linear system for the blocks ``X`` and
+    ``Y``, including gradients and regularization.
     """
     # TODO handle properties and samples not in the same order?
 
@@ -49,6 +55,20 @@ def _solve_block(X: TensorBlock, Y: TensorBlock) -> TensorBlock:
         Y_gradient_values = Y_gradient.values.reshape(-1, Y_n_properties)
         Y_values = _dispatch.concatenate((Y_values, Y_gradient_values), axis=0)
 
+    if alpha != 0.0:
+        X_values = X_values + alpha * _dispatch.eye_like(X_values, X_n_properties)
+
+    return X_values, Y_values
+
+
+@torch_jit_script
+def _solve_block(X: TensorBlock, Y: TensorBlock, alpha: float = 0.0) -> TensorBlock:
+    """
+    Solve a linear system among two :py:class:`TensorBlock`.
+    Solve the linear equation set X * w = Y for the unknown w.
+    Where X , w, Y are all :py:class:`TensorBlock`
+    """
+    X_values, Y_values = _solve_arrays(X, Y, alpha)
     weights = _dispatch.solve(X_values, Y_values)
 
     return TensorBlock(
@@ -60,7 +80,7 @@ def _solve_block(X: TensorBlock, Y: TensorBlock) -> TensorBlock:
 
 
 @torch_jit_script
-def solve(X: TensorMap, Y: TensorMap) -> TensorMap:
+def solve(X: TensorMap, Y: TensorMap, alpha: float = 0.0) -> TensorMap:
     """Solve a linear system among two :py:class:`TensorMap`.
 
     Solve the linear equation set
@@ -68,9 +88,14 @@ def solve(X: TensorMap, Y: TensorMap) -> TensorMap:
     Where ``Y``, ``X`` and ``w`` are all :py:class:`TensorMap`.
     ``Y`` and ``X`` must have the same ``keys`` and
     all their :py:class:`TensorBlock` must be 2D-square array.
+    Blocks with the same shapes are solved together, with a single batched call
+    to numpy or torch.
 
     :param X: a :py:class:`TensorMap` containing the "coefficient" matrices.
     :param Y: a :py:class:`TensorMap` containing the "dependent variable" values.
+    :param alpha: regularization added to the diagonal of ``X``, solving
+            ``Y = (X + alpha * I) * w`` instead. When ``X`` contains covariance
+            matrices, this gives the solution of ridge regression. Defaults to 0.
 
     :return: a :py:class:`TensorMap` with the same keys of ``Y`` and ``X``,
             and where each :py:class:`TensorBlock` has: the ``sample``
@@ -132,9 +157,50 @@ def solve(X: TensorMap, Y: TensorMap) -> TensorMap:
                 "the values in each block of X should be a square 2D array"
             )
 
+    if alpha < 0.0:
+        raise ValueError(f"`alpha` must be positive or zero, got {alpha}")
+
+    Y_blocks = _matching_blocks(X, Y)
+
+    if not torch_jit_is_scripting():
+        if _use_parallel_blocks(len(X)):
+            arguments = [
+                (X_block, Y_blocks[i], alpha) for i, X_block in enumerate(X.blocks())
+            ]
+            return TensorMap(X.keys, _map_blocks_impl(_solve_block, arguments))
+
+    X_blocks = X.blocks()
+    X_arrays: List[Array] = []
+    Y_arrays: List[Array] = []
+    for i, X_block in enumerate(X_blocks):
+        X_values, Y_values = _solve_arrays(X_block, Y_blocks[i], alpha)
+
+        X_arrays.append(X_values)
+        Y_arrays.append(Y_values)
+
+    # placeholder values, all the entries are overwritten below
+    weights: List[Array] = [array for array in X_arrays]
+    for group in _group_same_shapes(X_arrays, Y_arrays):
+        if len(group) == 1:
+            i = group[0]
+            weights[i] = _dispatch.solve(X_arrays[i], Y_arrays[i])
+        else:
+            group_weights = _dispatch.solve(
+                _dispatch.stack([X_arrays[i] for i in group], 0),
+                _dispatch.stack([Y_arrays[i] for i in group], 0),
+            )
+            for group_i, i in enumerate(group):
+                weights[i] = group_weights[group_i]
+
     blocks: List[TensorBlock] = []
-    for key, X_block in X.items():
-        Y_block = Y.block(key)
-        blocks.append(_solve_block(X_block, Y_block))
+    for i in range(len(weights)):
+        blocks.append(
+            TensorBlock(
+                values=weights[i].T,
+                samples=Y_blocks[i].properties,
+                components=torch_jit_annotate(List[Labels], []),
+                properties=X_blocks[i].properties,
+            )
+        )
 
     return TensorMap(X.keys, blocks)
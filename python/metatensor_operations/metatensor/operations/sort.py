@@ -9,6 +9,7 @@ from ._backend import (
     torch_jit_is_scripting,
     torch_jit_script,
 )
+from .map_blocks import _map_blocks_impl, _use_parallel_blocks
 from .zeros_like import zeros_like_block
 
 
@@ -361,6 +362,14 @@ def sort(
         )
 
     # Do any required sorting on the blocks
+    if not torch_jit_is_scripting():
+        if _use_parallel_blocks(len(new_keys)):
+            arguments = [
+                (tensor.block(tensor.keys[int(i)]), axes_list, descending)
+                for i in sorted_idx
+            ]
+            return TensorMap(new_keys, _map_blocks_impl(sort_block, arguments))
+
     new_blocks: List[TensorBlock] = []
     for i in sorted_idx:
         new_blocks.append(
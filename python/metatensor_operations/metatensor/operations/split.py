@@ -1,13 +1,209 @@
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 
+from . import _dispatch
 from ._backend import (
+    Array,
+    Labels,
+    LabelsValues,
     TensorBlock,
     TensorMap,
     is_metatensor_class,
     torch_jit_is_scripting,
     torch_jit_script,
 )
-from .slice import SliceSelection, _check_slice_args, _slice_block
+from .slice import (
+    SliceSelection,
+    _check_slice_args,
+    _selected_indices,
+    _slice_block,
+)
+
+
+def _group_samples_by_labels(
+    block: TensorBlock, selections: List[SliceSelection]
+) -> Optional[Tuple[Array, List[Array]]]:
+    """
+    Find the group of each sample in ``block`` (or -1 if the sample is not selected),
+    and the indices of the selected samples in each group, for ``selections`` only
+    containing disjoint :py:class:`Labels` with the same names. This matches all the
+    selections with the samples at once, instead of calling ``Labels.select`` for
+    each one of them. Returns :py:obj:`None` if this is not possible.
+
+    The selected samples in each group are kept in the same order as in the block,
+    which is the order used by ``Labels.select`` when the selections only contain
+    some of the samples dimensions. When the selections contain all of them,
+    ``Labels.select`` uses the order of the selection instead, and this function
+    returns :py:obj:`None`.
+    """
+    if len(selections) == 0:
+        return None
+
+    names: List[str] = []
+    selections_values: List[Array] = []
+    entries_groups: List[Array] = []
+    for i_group, selection in enumerate(selections):
+        if isinstance(selection, list):
+            return None
+        elif isinstance(selection, LabelsValues):
+            return None
+        else:
+            if i_group == 0:
+                names = selection.names
+            elif selection.names != names:
+                return None
+
+            selections_values.append(selection.values)
+            entries_groups.append(
+                _dispatch.zeros_like(selection.values, [len(selection)]) + i_group
+            )
+
+    if len(names) == len(block.samples.names):
+        return None
+
+    all_entries = _dispatch.concatenate(selections_values, axis=0)
+    if _dispatch.unique(all_entries, axis=0).shape[0] != all_entries.shape[0]:
+        # overlapping selections
+        return None
+
+    entries_groups_array = _dispatch.concatenate(entries_groups, axis=0)
+
+    # match the selected entries with the samples, staying on the samples device
+    samples_ids, entries_ids, n_unique = _dispatch.rows_ids(
+        block.samples.view(names).values, all_entries
+    )
+    ids_groups = _dispatch.zeros_like(entries_groups_array, [n_unique]) - 1
+    ids_groups[entries_ids] = entries_groups_array
+    groups = ids_groups[samples_ids]
+
+    # stable partition of the samples by group, the samples in each group stay in the
+    # same order as in the block
+    order = _dispatch.argsort_labels_values(groups.reshape(-1, 1))
+    counts = _dispatch.bincount(
+        _dispatch.to_index_array(groups + 1), minlength=len(selections) + 1
+    )
+
+    all_selected: List[Array] = []
+    start = int(counts[0])
+    for i_group in range(len(selections)):
+        end = start + int(counts[i_group + 1])
+        all_selected.append(order[start:end])
+        start = end
+
+    return groups, all_selected
+
+
+def _group_samples_by_indices(
+    block: TensorBlock, selections: List[SliceSelection]
+) -> Optional[Tuple[Array, List[Array]]]:
+    """
+    Same as :py:func:`_group_samples_by_labels`, for any kind of selection. Returns
+    :py:obj:`None` if the selections overlap or contain duplicated entries.
+    """
+    samples_values = block.samples.values
+    groups = _dispatch.zeros_like(samples_values, [len(block.samples)]) - 1
+
+    all_selected: List[Array] = []
+    for i_group, selection in enumerate(selections):
+        selected = _selected_indices(block, "samples", selection)
+        if not bool(_dispatch.all(groups[selected] == -1)):
+            # overlapping selections
+            return None
+
+        groups[selected] = i_group
+        if int(_dispatch.unique(selected).shape[0]) != len(selected):
+            # duplicated entries in the selection
+            return None
+
+        all_selected.append(selected)
+
+    return groups, all_selected
+
+
+def _split_samples_block(
+    block: TensorBlock,
+    selections: List[SliceSelection],
+) -> Optional[List[TensorBlock]]:
+    """
+    Split ``block`` along the samples, computing the group and new position of every
+    sample once, and partitioning all the gradient samples at once with a single
+    stable sort. This is only possible if the selections are disjoint and do not
+    contain duplicated entries, otherwise this function returns :py:obj:`None`.
+    """
+    grouping = _group_samples_by_labels(block, selections)
+    if grouping is None:
+        grouping = _group_samples_by_indices(block, selections)
+
+    if grouping is None:
+        return None
+
+    groups, all_selected = grouping
+
+    # get the metadata and arrays once, and not for every group
+    samples_names = block.samples.names
+    samples_values = block.samples.values
+    values = block.values
+    components = block.components
+    properties = block.properties
+
+    # position of each sample in its group
+    positions = _dispatch.zeros_like(samples_values, [len(block.samples)])
+
+    new_blocks: List[TensorBlock] = []
+    for selected in all_selected:
+        positions[selected] = _dispatch.make_like(
+            _dispatch.indices_like([len(selected)], selected).reshape(-1),
+            samples_values,
+        )
+
+        new_blocks.append(
+            TensorBlock(
+                values=values[selected],
+                samples=Labels(samples_names, samples_values[selected]),
+                components=components,
+                properties=properties,
+            )
+        )
+
+    n_groups = len(selections)
+    for parameter, gradient in block.gradients():
+        if len(gradient.gradients_list()) != 0:
+            raise NotImplementedError("gradients of gradients are not supported")
+
+        gradient_samples_names = gradient.samples.names
+        gradient_samples = gradient.samples.values
+        gradient_values = gradient.values
+        gradient_components = gradient.components
+        gradient_groups = groups[_dispatch.to_index_array(gradient_samples[:, 0])]
+
+        # stable partition of the gradient samples by group, keeping the original
+        # order inside each group. Gradient samples without a group come first.
+        order = _dispatch.argsort_labels_values(gradient_groups.reshape(-1, 1))
+        counts = _dispatch.bincount(
+            _dispatch.to_index_array(gradient_groups + 1), minlength=n_groups + 1
+        )
+
+        start = int(counts[0])
+        for i_group in range(n_groups):
+            end = start + int(counts[i_group + 1])
+            rows = order[start:end]
+            start = end
+
+            new_gradient_samples = gradient_samples[rows]
+            new_gradient_samples[:, 0] = positions[
+                _dispatch.to_index_array(new_gradient_samples[:, 0])
+            ]
+
+            new_blocks[i_group].add_gradient(
+                parameter=parameter,
+                gradient=TensorBlock(
+                    values=gradient_values[rows],
+                    samples=Labels(gradient_samples_names, new_gradient_samples),
+                    components=gradient_components,
+                    properties=properties,
+                ),
+            )
+
+    return new_blocks
 
 
 def _split_block(
@@ -19,10 +215,14 @@ def _split_block(
     Splits a TensorBlock into multiple blocks, as in the public function
     :py:func:`split_block` but with no input checks.
 
-    Note that the block is currently split into N new blocks by performing N number of
-    slice operations. There may be a more efficient way of doing it, but this is not yet
-    implemented.
+    When splitting disjoint groups of samples, all the groups are created together.
+    Otherwise, the block is split into N new blocks by performing N slice operations.
     """
+    if axis == "samples":
+        split_blocks = _split_samples_block(block, selections)
+        if split_blocks is not None:
+            return split_blocks
+
     new_blocks: List[TensorBlock] = []
     for selection in selections:
         # perform the slice either along the samples or properties axis
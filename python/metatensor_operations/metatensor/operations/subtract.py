@@ -1,17 +1,91 @@
-from typing import Union
+from typing import Optional, Union
 
 from ._backend import (
+    TensorBlock,
     TensorMap,
     is_metatensor_class,
     torch_jit_is_scripting,
     torch_jit_script,
 )
-from .add import add
+from ._utils import (
+    _check_blocks_raise,
+    _check_same_gradients_raise,
+    _check_same_keys_raise,
+    _copy_into,
+    _matching_blocks,
+    _shares_arrays,
+)
+from .add import add, add_
 from .multiply import multiply
 
 
+def _subtract_block_block_inplace(block_1: TensorBlock, block_2: TensorBlock) -> None:
+    values = block_1.values
+    values -= block_2.values
+
+    for parameter, gradient_1 in block_1.gradients():
+        if len(gradient_1.gradients_list()) != 0:
+            raise NotImplementedError("gradients of gradients are not supported")
+
+        gradient_values = gradient_1.values
+        gradient_values -= block_2.gradient(parameter).values
+
+
 @torch_jit_script
-def subtract(A: TensorMap, B: Union[float, int, TensorMap]) -> TensorMap:
+def subtract_(A: TensorMap, B: Union[float, int, TensorMap]) -> TensorMap:
+    r"""In-place version of :py:func:`subtract`, subtracting ``B`` from the values and
+    gradients of ``A``, and returning ``A``.
+
+    The metadata of ``B`` is checked against ``A`` in the same way as in
+    :py:func:`subtract`, and the existing arrays of ``A`` are then modified, without
+    allocating new arrays or :py:class:`Labels`.
+
+    .. note::
+      Other :py:class:`TensorMap` sharing arrays with ``A`` are also modified, see
+      :py:func:`add_` for the operations sharing arrays between their input and output.
+
+    :param A: :py:class:`TensorMap` to modify.
+    :param B: Scalar or :py:class:`TensorMap` with the same metadata as ``A`` to
+              subtract from ``A``.
+
+    :return: ``A``, after subtracting ``B`` from it.
+    """
+    if not torch_jit_is_scripting():
+        if not is_metatensor_class(A, TensorMap):
+            raise TypeError(f"`A` must be a metatensor TensorMap, not {type(A)}")
+
+    if torch_jit_is_scripting():
+        is_tensor_map = isinstance(B, TensorMap)
+    else:
+        is_tensor_map = is_metatensor_class(B, TensorMap)
+
+    if isinstance(B, (float, int)):
+        return add_(A, -float(B))
+    elif is_tensor_map:
+        _check_same_keys_raise(A, B, "subtract_")
+        blocks_B = _matching_blocks(A, B)
+        for i, block_A in enumerate(A.blocks()):
+            block_B = blocks_B[i]
+            _check_blocks_raise(block_A, block_B, fname="subtract_")
+            _check_same_gradients_raise(block_A, block_B, fname="subtract_")
+            _subtract_block_block_inplace(block_1=block_A, block_2=block_B)
+    else:
+        if torch_jit_is_scripting():
+            extra = ""
+        else:
+            extra = f", not {type(B)}"
+
+        raise TypeError("`B` must be a metatensor TensorMap or a scalar value" + extra)
+
+    return A
+
+
+@torch_jit_script
+def subtract(
+    A: TensorMap,
+    B: Union[float, int, TensorMap],
+    out: Optional[TensorMap] = None,
+) -> TensorMap:
     r"""Return a new :class:`TensorMap` with the values being the subtract
     of ``A`` and ``B``.
 
@@ -24,6 +98,9 @@ def subtract(A: TensorMap, B: Union[float, int, TensorMap]) -> TensorMap:
        .. math::
             \nabla(A - B) = \nabla A
 
+       and the gradients arrays of ``A`` are re-used in the output, without copying
+       them.
+
     * ``B`` is a :py:class:`TensorMap` with the same metadata of ``A``:
 
        .. math::
@@ -33,13 +110,32 @@ def subtract(A: TensorMap, B: Union[float, int, TensorMap]) -> TensorMap:
     :param B: Second instance for the subtraction. Parameter can be a scalar or a
               :py:class:`TensorMap`. In the latter case ``B`` must have the same
               metadata of ``A``.
+    :param out: Optional :py:class:`TensorMap` with the same metadata as ``A``. If
+              given, the result is written in the existing values and gradients
+              arrays of ``out`` instead of allocating new ones. ``out`` can be ``A``
+              itself or ``B``. See also :py:func:`subtract_`.
 
-    :return: New :py:class:`TensorMap` with the same metadata as ``A``.
+    :return: New :py:class:`TensorMap` with the same metadata as ``A``, or ``out``
+             if given.
     """
     if not torch_jit_is_scripting():
         if not is_metatensor_class(A, TensorMap):
             raise TypeError(f"`A` must be a metatensor TensorMap, not {type(A)}")
 
+    if out is not None:
+        # the arrays of `B` would be overwritten when copying `A` to `out`
+        if torch_jit_is_scripting():
+            if isinstance(B, TensorMap):
+                if _shares_arrays(out, B):
+                    B = B.copy()
+        else:
+            if is_metatensor_class(B, TensorMap):
+                if _shares_arrays(out, B):
+                    B = B.copy()
+
+        _copy_into(out, A, "subtract")
+        return subtract_(out, B)
+
     if torch_jit_is_scripting():
         is_tensor_map = isinstance(B, TensorMap)
     else:
@@ -23,16 +23,35 @@ def _unique_from_blocks(
     """
     Finds the unique metadata of a list of blocks along the given ``axis`` and for the
     specified ``names``.
+
+    The unique entries are first found separately in each block, and only these
+    (usually much smaller) sets are merged together at the end. This avoids creating
+    a copy of the metadata of all blocks, and Labels shared between consecutive blocks
+    are only processed once.
     """
-    all_values = []
+    all_unique = []
+    previous: Optional[Labels] = None
     for block in blocks:
         if axis == "samples":
-            all_values.append(block.samples.view(names).values)
+            labels = block.samples
         else:
             assert axis == "properties"
-            all_values.append(block.properties.view(names).values)
+            labels = block.properties
+
+        if previous is not None:
+            if labels == previous:
+                continue
+        previous = labels
+
+        all_unique.append(_dispatch.unique(labels.view(names).values, axis=0))
+
+    if len(all_unique) == 1:
+        unique_values = all_unique[0]
+    else:
+        unique_values = _dispatch.unique(
+            _dispatch.concatenate(all_unique, axis=0), axis=0
+        )
 
-    unique_values = _dispatch.unique(_dispatch.concatenate(all_values, axis=0), axis=0)
     return Labels(names=names, values=unique_values)
 
 
@@ -1,8 +1,9 @@
 from typing import List, Optional, Union
 
 from . import _dispatch
-from ._backend import TensorBlock, TensorMap, torch_jit_script
+from ._backend import TensorBlock, TensorMap, torch_jit_is_scripting, torch_jit_script
 from ._utils import _check_gradient_presence_raise
+from .pack import _allocate_like
 
 
 @torch_jit_script
@@ -161,6 +162,20 @@ def zeros_like(
     ['alpha']
     """
 
+    if not torch_jit_is_scripting():
+        if not requires_grad:
+            # allocate the arrays of all blocks at once, sharing the Labels with
+            # `tensor`. This is not used with `requires_grad=True`, since the
+            # arrays could then be views and not leaf tensors for autograd
+            result = _allocate_like(
+                tensor,
+                gradients,
+                fill="zeros",
+                fname="zeros_like",
+            )
+            if result is not None:
+                return result
+
     blocks: List[TensorBlock] = []  # this must be declared as a list of TensorBlocks
     for block in tensor.blocks():
         blocks.append(
@@ -82,3 +82,15 @@ def test_abs(gradients):
 
     # Check the tensors haven't be modified in place
     assert not metatensor.equal(tensor_abs, tensor)
+
+
+def test_abs_out_inplace():
+    tensor = tensor_complex()
+    expected = tensor_complex_result()
+
+    out = metatensor.zeros_like(tensor)
+    assert metatensor.abs(tensor, out=out) is out
+    metatensor.allclose_raise(out, expected)
+
+    assert metatensor.abs_(tensor) is tensor
+    metatensor.allclose_raise(tensor, expected)
@@ -248,6 +248,89 @@ def test_self_add_scalar_gradient(tensor_A, tensor_res_2):
     metatensor.equal_raise(tensor_A, tensor_A_copy)
 
 
+def test_add_different_keys_order():
+    keys = Labels(["key"], np.arange(20).reshape(-1, 1))
+    blocks = [
+        TensorBlock(
+            values=np.full((3, 2), float(i)),
+            samples=Labels.range("s", 3),
+            components=[],
+            properties=Labels.range("p", 2),
+        )
+        for i in range(20)
+    ]
+    A = TensorMap(keys, blocks)
+
+    order = np.random.default_rng(0x5EED).permutation(20)
+    B = TensorMap(
+        Labels(["key"], keys.values[order]),
+        [A.block(int(i)).copy() for i in order],
+    )
+
+    result = metatensor.add(A, B)
+    for i in range(20):
+        assert np.all(result.block(i).values == 2.0 * i)
+
+
+def test_add_out_inplace(tensor_A, tensor_B, tensor_res_1, tensor_res_2):
+    out = metatensor.zeros_like(tensor_A)
+    values = out.block(0).values
+
+    result = metatensor.add(tensor_A, tensor_B, out=out)
+    assert result is out
+    metatensor.allclose_raise(out, tensor_res_1)
+    # the existing arrays are re-used
+    assert np.shares_memory(out.block(0).values, values)
+
+    tensor_A_copy = tensor_A.copy()
+    result = metatensor.add_(tensor_A_copy, tensor_B)
+    assert result is tensor_A_copy
+    metatensor.allclose_raise(tensor_A_copy, tensor_res_1)
+
+    tensor_A_copy = tensor_A.copy()
+    metatensor.add_(tensor_A_copy, 5.1)
+    metatensor.allclose_raise(tensor_A_copy, tensor_res_2)
+
+    message = "inputs to 'add' should have the same gradient parameters"
+    with pytest.raises(metatensor.NotEqualError, match=message):
+        metatensor.add(tensor_A, tensor_B, out=metatensor.remove_gradients(out))
+
+
+def test_add_out_is_B(tensor_A, tensor_B, tensor_res_1):
+    # `out` can be `B`, or share arrays with it
+    B = tensor_B.copy()
+    result = metatensor.add(tensor_A, B, out=B)
+    assert result is B
+    metatensor.allclose_raise(B, tensor_res_1)
+
+    B = tensor_B.copy()
+    out = metatensor.rename_dimension(B, "keys", "key_1", "other")
+    out = metatensor.rename_dimension(out, "keys", "other", "key_1")
+    metatensor.add(tensor_A, B, out=out)
+    metatensor.allclose_raise(out, tensor_res_1)
+
+
+def test_add_scalar_shared_gradients(tensor_A, tensor_B):
+    # the output of `add` with a scalar shares the gradients arrays with its input
+    result = metatensor.add(tensor_A, 1.0)
+    for i, block in enumerate(result):
+        gradient = block.gradient("g")
+        assert np.shares_memory(gradient.values, tensor_A.block(i).gradient("g").values)
+
+    # using `out` writes the result in separate arrays, which can then be modified
+    # in-place without changing the input
+    tensor_A_copy = tensor_A.copy()
+    out = metatensor.zeros_like(tensor_A)
+    metatensor.add(tensor_A, 1.0, out=out)
+    metatensor.add_(out, tensor_B)
+    metatensor.multiply_(out, 3.0)
+    metatensor.equal_raise(tensor_A, tensor_A_copy)
+
+    metatensor.subtract(tensor_A, 2.0, out=out)
+    metatensor.multiply_(out, 3.0)
+    metatensor.equal_raise(tensor_A, tensor_A_copy)
+
+
 def test_self_add_error():
     block = TensorBlock(
         values=np.array([[1, 2], [3, 5]]),
@@ -142,10 +142,23 @@ def test_self_allclose_grad():
     with pytest.raises(NotEqualError, match=message):
         metatensor.allclose_raise(tensor1, tensor1_e6)
 
-    message = "values are not allclose"
+    message = r"values are not allclose \(largest absolute difference is 1\.0+\d*e-06\)"
     with pytest.raises(NotEqualError, match=message):
         metatensor.allclose_block_raise(tensor1.block(0), tensor1_e6.block(0))
 
+    # comparisons can be used from functions running in the parallel_blocks pool
+    def compare(block):
+        assert metatensor.allclose(tensor1, tensor1_copy)
+        assert not metatensor.allclose(tensor1, tensor1_e6)
+        assert metatensor.equal(tensor1, tensor1_copy)
+        assert not metatensor.equal(tensor1, tensor1_e6)
+        return block.copy()
+
+    with metatensor.parallel_blocks(max_workers=2, min_blocks=2):
+        assert metatensor.allclose(tensor1, tensor1_copy)
+        assert not metatensor.allclose(tensor1, tensor1_e6)
+        metatensor.map_blocks(compare, tensor1)
+
 
 def test_self_allclose_exceptions():
     block_1 = TensorBlock(
@@ -0,0 +1,135 @@
+import os
+
+import numpy as np
+import pytest
+
+import metatensor
+from metatensor import Labels, TensorBlock, TensorMap
+
+
+try:
+    import torch
+
+    HAS_TORCH = True
+except ImportError:
+    HAS_TORCH = False
+
+
+DATA_ROOT = os.path.join(os.path.dirname(__file__), "data")
+
+
+def _weights_like(tensor, n_out):
+    np.random.seed(0xDEADBEEF)
+    blocks = []
+    for block in tensor:
+        blocks.append(
+            TensorBlock(
+                values=np.random.rand(n_out, len(block.properties)),
+                samples=Labels.range("out", n_out),
+                components=[],
+                properties=block.properties,
+            )
+        )
+
+    return TensorMap(tensor.keys, blocks)
+
+
+@pytest.mark.parametrize(
+    "filename", ["qm7-power-spectrum.mts", "qm7-spherical-expansion.mts"]
+)
+def test_batched_dot(filename):
+    tensor = metatensor.load(os.path.join(DATA_ROOT, filename))
+    weights = _weights_like(tensor, 5)
+
+    result = metatensor.batched_dot(tensor, weights)
+    expected = metatensor.dot(tensor, weights)
+
+    assert metatensor.equal_metadata(result, expected)
+    assert metatensor.allclose(result, expected, rtol=1e-12)
+
+
+def test_different_shapes():
+    # blocks with different number of properties end up in different groups, and
+    # blocks with very different number of samples in different batches
+    blocks = []
+    weights = []
+    for n_samples, n_properties in [(3, 2), (4, 2), (100, 2), (0, 2), (3, 4)]:
+        block = TensorBlock(
+            values=np.random.rand(n_samples, 2, n_properties),
+            samples=Labels.range("s", n_samples),
+            components=[Labels.range("c", 2)],
+            properties=Labels.range("p", n_properties),
+        )
+        block.add_gradient(
+            "g",
+            TensorBlock(
+                values=np.random.rand(2 * n_samples, 3, 2, n_properties),
+                samples=Labels(
+                    ["sample", "g"],
+                    np.array([[i // 2, i % 2] for i in range(2 * n_samples)]).reshape(
+                        -1, 2
+                    ),
+                ),
+                components=[Labels.range("xyz", 3), Labels.range("c", 2)],
+                properties=block.properties,
+            ),
+        )
+        blocks.append(block)
+
+        weights.append(
+            TensorBlock(
+                values=np.random.rand(3, n_properties),
+                samples=Labels.range("out", 3),
+                components=[],
+                properties=block.properties,
+            )
+        )
+
+    keys = Labels.range("key", len(blocks))
+    tensor = TensorMap(keys, blocks)
+    weights = TensorMap(keys, weights)
+
+    result = metatensor.batched_dot(tensor, weights)
+    expected = metatensor.dot(tensor, weights)
+
+    assert metatensor.equal_metadata(result, expected)
+    assert metatensor.allclose(result, expected, rtol=1e-12)
+
+
+@pytest.mark.skipif(not HAS_TORCH, reason="requires torch")
+def test_batched_dot_autograd():
+    tensor = metatensor.load(os.path.join(DATA_ROOT, "qm7-power-spectrum.mts"))
+    tensor = tensor.to(arrays="torch")
+    weights = _weights_like(tensor, 4).to(arrays="torch")
+    weights = metatensor.requires_grad(weights)
+
+    def total(tensor):
+        return sum(
+            block.values.sum() + block.gradient("positions").values.sum()
+            for block in tensor
+        )
+
+    expected = total(metatensor.dot(tensor, weights))
+    expected_grad = torch.autograd.grad(expected, weights.block(0).values)
+
+    result = total(metatensor.batched_dot(tensor, weights))
+    result_grad = torch.autograd.grad(result, weights.block(0).values)
+
+    assert torch.allclose(result, expected)
+    assert torch.allclose(result_grad[0], expected_grad[0])
+
+
+def test_errors():
+    tensor = metatensor.load(os.path.join(DATA_ROOT, "qm7-power-spectrum.mts"))
+
+    message = "the second TensorMap in `batched_dot` should not have gradients"
+    with pytest.raises(ValueError, match=message):
+        metatensor.batched_dot(tensor, tensor)
+
+    weights = _weights_like(tensor, 3)
+    weights = metatensor.slice(
+        weights, "properties", Labels(["l"], np.array([[0]], dtype=np.int32))
+    )
+    message = "TensorBlocks in `batched_dot` should have the same properties"
+    with pytest.raises(ValueError, match=message):
+        metatensor.batched_dot(tensor, weights)
@@ -0,0 +1,86 @@
+import os
+
+import numpy as np
+import pytest
+
+import metatensor
+
+
+try:
+    import torch
+
+    HAS_TORCH = True
+except ImportError:
+    HAS_TORCH = False
+
+
+DATA_ROOT = os.path.join(os.path.dirname(__file__), "data")
+
+
+@pytest.fixture
+def tensors():
+    tensor = metatensor.load(os.path.join(DATA_ROOT, "qm7-power-spectrum.mts"))
+    np.random.seed(0xDEADBEEF)
+    # shift the values away from 0 to be able to take non-integer powers
+    return [metatensor.add(metatensor.random_uniform_like(tensor), 0.5) for _ in "ab"]
+
+
+def _operations(a, b):
+    return [
+        lambda: metatensor.multiply(a, b),
+        lambda: metatensor.pow(a, 1.5),
+        lambda: metatensor.abs(metatensor.subtract(a, b)),
+        lambda: metatensor.var_over_samples(a, "atom"),
+        lambda: metatensor.std_over_samples(a, "atom"),
+    ]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1000])
+def test_sample_chunks(tensors, chunk_size):
+    a, b = tensors
+
+    expected = [operation() for operation in _operations(a, b)]
+    with metatensor.sample_chunks(chunk_size):
+        results = [operation() for operation in _operations(a, b)]
+
+    for i, result in enumerate(results):
+        assert metatensor.allclose(result, expected[i], rtol=1e-12, atol=1e-14)
+
+
+@pytest.mark.skipif(not HAS_TORCH, reason="requires torch")
+def test_sample_chunks_autograd(tensors):
+    a, b = [tensor.to(arrays="torch") for tensor in tensors]
+    a = metatensor.requires_grad(a)
+
+    def total(tensor):
+        # `multiply` computes the gradients by chunks of samples
+        return sum(block.gradient("positions").values.sum() for block in tensor)
+
+    expected = total(metatensor.multiply(a, b))
+    (expected_grad,) = torch.autograd.grad(expected, a.block(0).values)
+
+    with metatensor.sample_chunks(5):
+        result = total(metatensor.multiply(a, b))
+    (result_grad,) = torch.autograd.grad(result, a.block(0).values)
+
+    assert torch.allclose(result, expected)
+    assert torch.allclose(result_grad, expected_grad)
+
+
+def test_nested():
+    with metatensor.sample_chunks(10):
+        with metatensor.sample_chunks(3):
+            assert metatensor.operations.chunks._SAMPLES_CHUNK_SIZE == 3
+        assert metatensor.operations.chunks._SAMPLES_CHUNK_SIZE == 10
+
+    assert metatensor.operations.chunks._SAMPLES_CHUNK_SIZE is None
+
+
+def test_errors():
+    message = "`chunk_size` must be an integer, not <class 'float'>"
+    with pytest.raises(TypeError, match=message):
+        metatensor.sample_chunks(3.0)
+
+    message = "`chunk_size` must be positive, got 0"
+    with pytest.raises(ValueError, match=message):
+        metatensor.sample_chunks(0)
@@ -0,0 +1,115 @@
+import numpy as np
+import pytest
+
+import metatensor
+from metatensor import Labels, TensorBlock, TensorMap
+
+
+@pytest.fixture
+def tensor():
+    rng = np.random.default_rng(0x12345)
+
+    properties = Labels(["n", "l"], np.array([[0, 0], [0, 1], [1, 0]]))
+    components = [Labels.range("a", 3), Labels.range("b", 2)]
+
+    block = TensorBlock(
+        values=rng.random((4, 3, 2, 3)),
+        samples=Labels.range("s", 4),
+        components=components,
+        properties=properties,
+    )
+    block.add_gradient(
+        "g",
+        TensorBlock(
+            values=rng.random((5, 2, 3, 2, 3)),
+            samples=Labels(
+                ["sample", "atom"], np.array([[i // 2, i] for i in range(5)])
+            ),
+            components=[Labels.range("xyz", 2)] + components,
+            properties=properties,
+        ),
+    )
+
+    return TensorMap(Labels.range("key", 1), [block])
+
+
+@pytest.mark.parametrize("dimension", ["a", "b"])
+def test_components_to_properties(tensor, dimension):
+    result = metatensor.components_to_properties(tensor, dimension)
+    expected = tensor.components_to_properties(dimension)
+    assert metatensor.equal(result, expected)
+
+    block = result.block()
+    assert block.properties.names == [dimension, "n", "l"]
+    assert len(block.components) == 1
+    assert block.gradient("g").components[0].names == ["xyz"]
+
+
+def test_components_to_properties_no_copy(tensor):
+    # moving the last component only reshapes the values
+    result = metatensor.components_to_properties(tensor, ["b"])
+    assert np.shares_memory(result.block().values, tensor.block().values)
+    assert np.shares_memory(
+        result.block().gradient("g").values, tensor.block().gradient("g").values
+    )
+
+
+def test_properties_to_components(tensor):
+    moved = metatensor.components_to_properties(tensor, "b")
+    result = metatensor.properties_to_components(moved, "b")
+    assert metatensor.equal(result, tensor)
+
+    # properties are already in the right order, only a reshape is needed
+    assert np.shares_memory(result.block().values, tensor.block().values)
+
+    # shuffling the properties requires re-ordering the values
+    permutation = np.array([4, 1, 5, 0, 3, 2])
+    block = moved.block()
+    shuffled_block = TensorBlock(
+        values=block.values[..., permutation],
+        samples=block.samples,
+        components=block.components,
+        properties=Labels(block.properties.names, block.properties.values[permutation]),
+    )
+    gradient = block.gradient("g")
+    shuffled_block.add_gradient(
+        "g",
+        TensorBlock(
+            values=gradient.values[..., permutation],
+            samples=gradient.samples,
+            components=gradient.components,
+            properties=shuffled_block.properties,
+        ),
+    )
+    shuffled = TensorMap(moved.keys, [shuffled_block])
+
+    result = metatensor.properties_to_components(shuffled, "b")
+    assert metatensor.equal(result, tensor)
+
+
+def test_errors(tensor):
+    message = "unable to find \\[c\\] in the components of the block"
+    with pytest.raises(ValueError, match=message):
+        metatensor.components_to_properties(tensor, "c")
+
+    message = "'c' is not part of the properties of the block"
+    with pytest.raises(ValueError, match=message):
+        metatensor.properties_to_components(tensor, "c")
+
+    message = "can not move the only properties dimension to a component"
+    with pytest.raises(ValueError, match=message):
+        metatensor.properties_to_components(
+            TensorMap(Labels.single(), [metatensor.block_from_array(np.zeros((3, 2)))]),
+            "property",
+        )
+
+    message = (
+        "the properties must contain all the combinations of 'n' and the "
+        "remaining dimensions to be able to move it to a component"
+    )
+    with pytest.raises(ValueError, match=message):
+        metatensor.properties_to_components(tensor, "n")
+
+    message = "`tensor` must be a metatensor TensorMap, not <class 'numpy.ndarray'>"
+    with pytest.raises(TypeError, match=message):
+        metatensor.components_to_properties(np.zeros(3), "a")
@@ -27,3 +27,163 @@ def test_all(create_array_function):
     assert not metatensor.operations._dispatch.all(
         create_array_function(all_false_array)
     )
+
+
+@pytest.mark.parametrize("create_array_function", create_array_functions)
+def test_rows_positions(create_array_function):
+    reference = np.array([[0, 1], [2, 3], [1, 1], [-4, 2]], dtype=np.int32)
+    entries = np.array([[1, 1], [5, 5], [0, 1], [-4, 2], [1, 1]], dtype=np.int32)
+
+    _dispatch = metatensor.operations._dispatch
+    positions = _dispatch.rows_positions(
+        create_array_function(reference), create_array_function(entries)
+    )
+    np.testing.assert_equal(np.asarray(positions), [2, -1, 0, 3, 2])
+
+    isin = _dispatch.rows_isin(
+        create_array_function(reference), create_array_function(entries)
+    )
+    np.testing.assert_equal(np.asarray(isin), [True, False, True, True])
+
+    empty = create_array_function(np.zeros((0, 2), dtype=np.int32))
+    assert len(_dispatch.rows_positions(create_array_function(reference), empty)) == 0
+    np.testing.assert_equal(
+        np.asarray(_dispatch.rows_positions(empty, create_array_function(entries))),
+        [-1, -1, -1, -1, -1],
+    )
+    assert not np.any(
+        np.asarray(_dispatch.rows_isin(create_array_function(reference), empty))
+    )
+
+
+@pytest.mark.parametrize("create_array_function", create_array_functions)
+def test_chunked_comparisons(create_array_function):
+    # large enough to be compared in multiple chunks
+    values = np.zeros((3000, 1000))
+    other = values.copy()
+    other[-1, -1] = 1e-3
+
+    values = create_array_function(values)
+    other = create_array_function(other)
+
+    _dispatch = metatensor.operations._dispatch
+    assert _dispatch.array_equal(values, values)
+    assert not _dispatch.array_equal(values, other)
+    assert _dispatch.allclose(values, other, rtol=0.0, atol=1e-2)
+    assert not _dispatch.allclose(values, other, rtol=0.0, atol=1e-4)
+    assert _dispatch.max_abs_difference(values, other) == 1e-3
+
+    empty = create_array_function(np.zeros((0, 3)))
+    assert _dispatch.array_equal(empty, empty)
+    assert _dispatch.allclose(empty, empty, rtol=0.0, atol=0.0)
+
+    scalar = create_array_function(np.array(2.0))
+    assert _dispatch.array_equal(scalar, scalar)
+    assert _dispatch.allclose(scalar, scalar, rtol=0.0, atol=0.0)
+
+
+@pytest.mark.parametrize("create_array_function", create_array_functions)
+@pytest.mark.parametrize("n_columns", [0, 1, 3, 12])
+@pytest.mark.parametrize("reverse", [False, True])
+def test_argsort_labels_values(create_array_function, n_columns, reverse):
+    rng = np.random.default_rng(0x5EED)
+    values = rng.integers(-3, 3, size=(50, n_columns), dtype=np.int32)
+
+    rows = [tuple(row) + (i,) for i, row in enumerate(values.tolist())]
+    if reverse:
+        # descending order is the reverse of the (stable) ascending order
+        expected = [row[-1] for row in sorted(rows)][::-1]
+    else:
+        expected = [row[-1] for row in sorted(rows)]
+
+    indices = metatensor.operations._dispatch.argsort_labels_values(
+        create_array_function(values), reverse=reverse
+    )
+    assert list(indices.tolist()) == expected
+
+
+@pytest.mark.parametrize("create_array_function", create_array_functions)
+def test_searchsorted(create_array_function):
+    sorted_array = np.array([1, 3, 3, 6, 8], dtype=np.int32)
+    values = np.array([0, 3, 5, 8, 9, 1], dtype=np.int32)
+
+    result = metatensor.operations._dispatch.searchsorted(
+        create_array_function(sorted_array), create_array_function(values)
+    )
+    np.testing.assert_equal(np.asarray(result), np.searchsorted(sorted_array, values))
+
+
+@pytest.mark.parametrize("create_array_function", create_array_functions)
+@pytest.mark.parametrize("n_segments", [1, 7, 300])
+def test_segment_sum(create_array_function, n_segments):
+    rng = np.random.default_rng(0x5EED)
+    values = rng.random((500, 3, 2))
+    # some segments are left empty
+    index = rng.integers(0, n_segments, size=500) // 2 * 2
+
+    expected = np.zeros((n_segments, 3, 2))
+    np.add.at(expected, index, values)
+
+    result = metatensor.operations._dispatch.segment_sum(
+        create_array_function(values), create_array_function(index), n_segments
+    )
+    assert result.shape == (n_segments, 3, 2)
+    # the values can be added in a different order than np.add.at
+    np.testing.assert_allclose(np.asarray(result), expected, rtol=1e-14)
+
+    result = metatensor.operations._dispatch.segment_sum(
+        create_array_function(values[:0]), create_array_function(index[:0]), n_segments
+    )
+    np.testing.assert_equal(np.asarray(result), np.zeros((n_segments, 3, 2)))
+
+    # all segments with the same size
+    index = rng.permutation(np.repeat(np.arange(n_segments), 500 // n_segments))
+
+    expected = np.zeros((n_segments, 3, 2))
+    np.add.at(expected, index, values[: len(index)])
+
+    result = metatensor.operations._dispatch.segment_sum(
+        create_array_function(values[: len(index)]),
+        create_array_function(index),
+        n_segments,
+    )
+    np.testing.assert_allclose(np.asarray(result), expected, rtol=1e-14)
+
+
+def test_unique_rows():
+    rng = np.random.default_rng(0x5EED)
+    values = rng.integers(-4, 4, size=(200, 3), dtype=np.int32)
+
+    expected, expected_inverse = np.unique(values, axis=0, return_inverse=True)
+    unique, inverse = metatensor.operations._dispatch.unique_with_inverse(
+        values, axis=0
+    )
+    np.testing.assert_equal(unique, expected)
+    np.testing.assert_equal(inverse.reshape(-1), expected_inverse.reshape(-1))
+
+    unique = metatensor.operations._dispatch.unique(values, axis=0)
+    np.testing.assert_equal(unique, expected)
+
+
+@pytest.mark.parametrize("create_array_function", create_array_functions)
+def test_batched_dot(create_array_function):
+    A = np.random.rand(3, 4, 5)
+    B = np.random.rand(3, 2, 5)
+    expected = np.stack([A[i] @ B[i].T for i in range(3)])
+
+    result = metatensor.operations._dispatch.batched_dot(
+        create_array_function(A), create_array_function(B)
+    )
+    assert np.allclose(np.asarray(result), expected)
+
+
+@pytest.mark.parametrize("create_array_function", create_array_functions)
+def test_may_share_memory(create_array_function):
+    _dispatch = metatensor.operations._dispatch
+    array = create_array_function(np.arange(12.0).reshape(3, 4))
+
+    assert _dispatch.may_share_memory(array, array)
+    assert _dispatch.may_share_memory(array[1:], array[:2])
+    assert _dispatch.may_share_memory(array[:, 1], array)
+    assert not _dispatch.may_share_memory(array[:1], array[2:])
+    assert not _dispatch.may_share_memory(array, create_array_function(np.ones(3)))
@@ -245,6 +245,20 @@ def test_key_order(test_tensor_map_1):
     assert metatensor.equal_metadata(test_tensor_map_1, new_tensor)
 
 
+def test_different_keys(test_tensor_map_1):
+    """check keys with the same names and length but different values"""
+    keys = test_tensor_map_1.keys
+    new_values = keys.values.copy()
+    new_values[0, 0] = 1000
+    new_keys = Labels(keys.names, new_values)
+    new_tensor = TensorMap(new_keys, [block.copy() for block in test_tensor_map_1])
+    assert not metatensor.equal_metadata(test_tensor_map_1, new_tensor)
+
+    error_message = "inputs to 'equal_metadata_raise' should have the same keys"
+    with pytest.raises(NotEqualError, match=error_message):
+        metatensor.equal_metadata_raise(test_tensor_map_1, new_tensor)
+
+
 def test_samples_order(test_tensor_map_1):
     """Test changing the order of the values of the samples should yield False"""
     new_blocks = []
@@ -276,6 +276,74 @@ def test_split_join_samples(tensor):
     assert joined_tensor == tensor
 
 
+def _join_samples_reference(tensors, sort_samples, remove_tensor_name):
+    """Join along samples by moving a "tensor" key dimension to the samples"""
+    keys = tensors[0].keys
+    blocks = []
+    keys_values = []
+    for i_tensor, tensor in enumerate(tensors):
+        for key in keys:
+            blocks.append(tensor.block(key).copy())
+            keys_values.append([i_tensor] + list(key.values))
+
+    tensor = TensorMap(Labels(["tensor"] + keys.names, np.array(keys_values)), blocks)
+    joined = tensor.keys_to_samples("tensor", sort_samples=sort_samples)
+    if remove_tensor_name:
+        joined = metatensor.remove_dimension(joined, "samples", "tensor")
+
+    return joined
+
+
+@pytest.mark.parametrize("sort_samples", [True, False])
+def test_join_samples_reference(tensor, sort_samples):
+    # use overlapping systems and different keys order in the tensors
+    selections = [
+        Labels("system", np.array([[3], [1], [4]])),
+        Labels("system", np.array([[0], [2], [3]])),
+        Labels("system", np.array([[5], [9], [7], [8]])),
+    ]
+    tensors = metatensor.split(tensor, "samples", selections)
+    tensors[1] = TensorMap(
+        Labels(tensor.keys.names, tensor.keys.values[::-1]),
+        [block.copy() for block in tensors[1].blocks()[::-1]],
+    )
+
+    joined = metatensor.join(tensors, axis="samples", sort_samples=sort_samples)
+    expected = _join_samples_reference(tensors, sort_samples, False)
+    assert metatensor.equal(joined, expected)
+
+    # disjoint samples
+    del tensors[1]
+    joined = metatensor.join(
+        tensors, axis="samples", sort_samples=sort_samples, remove_tensor_name=True
+    )
+    assert joined.sample_names == ["system", "atom"]
+    expected = _join_samples_reference(tensors, sort_samples, True)
+    assert metatensor.equal(joined, expected)
+
+
+def test_join_samples_different_metadata(tensor):
+    block = tensor.block(0)
+    other = TensorMap(
+        Labels(tensor.keys.names, tensor.keys.values[:1]),
+        [
+            TensorBlock(
+                values=block.values[:, :3],
+                samples=block.samples,
+                components=block.components,
+                properties=Labels(block.properties.names, block.properties.values[:3]),
+            )
+        ],
+    )
+
+    message = (
+        "all blocks with the same key must have the same properties to be joined "
+        "along samples"
+    )
+    with pytest.raises(ValueError, match=message):
+        metatensor.join([tensor, other], axis="samples", different_keys="union")
+
+
 def test_split_join_properties(tensor):
     """Test if split and joining along `properties` results in the same TensorMap."""
     properties = tensor[0].properties
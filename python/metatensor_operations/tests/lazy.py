@@ -0,0 +1,127 @@
+import os
+
+import numpy as np
+import pytest
+
+import metatensor
+from metatensor import Labels, NotEqualError, TensorMap
+
+
+try:
+    import torch
+
+    HAS_TORCH = True
+except ImportError:
+    HAS_TORCH = False
+
+
+DATA_ROOT = os.path.join(os.path.dirname(__file__), "data")
+
+
+@pytest.fixture
+def tensors():
+    tensor = metatensor.load(os.path.join(DATA_ROOT, "qm7-power-spectrum.mts"))
+    np.random.seed(0xDEADBEEF)
+    # shift the values away from 0 to be able to divide by them
+    return [metatensor.add(metatensor.random_uniform_like(tensor), 1.0) for _ in "abc"]
+
+
+def test_expression(tensors):
+    a, b, c = tensors
+
+    result = ((metatensor.lazy(a) - b) ** 2 * c + 1.5).evaluate()
+    expected = metatensor.add(
+        metatensor.multiply(metatensor.pow(metatensor.subtract(a, b), 2), c), 1.5
+    )
+    assert metatensor.allclose(result, expected, rtol=1e-12)
+
+
+def test_operators(tensors):
+    a, b, _ = tensors
+    lazy_a = metatensor.lazy(a)
+
+    expressions = [
+        (lazy_a + b, metatensor.add(a, b)),
+        (3 + lazy_a, metatensor.add(a, 3)),
+        (lazy_a - b, metatensor.subtract(a, b)),
+        (1 - lazy_a, metatensor.add(metatensor.multiply(a, -1), 1)),
+        (-lazy_a, metatensor.multiply(a, -1)),
+        (lazy_a * b, metatensor.multiply(a, b)),
+        (2 * lazy_a, metatensor.multiply(a, 2)),
+        (lazy_a * lazy_a, metatensor.multiply(a, a)),
+        (lazy_a / b, metatensor.divide(a, b)),
+        (lazy_a / 4, metatensor.divide(a, 4)),
+        (2 / lazy_a, metatensor.multiply(metatensor.pow(a, -1), 2)),
+        (lazy_a**0.5, metatensor.pow(a, 0.5)),
+    ]
+
+    for expression, expected in expressions:
+        assert metatensor.allclose(expression.evaluate(), expected, rtol=1e-12)
+
+
+def test_tensor_map_first(tensors):
+    # the operators of TensorMap defer to LazyTensorMap
+    a, b, c = tensors
+    lazy_a = metatensor.lazy(a)
+
+    expressions = [
+        (b + lazy_a, metatensor.add(b, a)),
+        (b - lazy_a, metatensor.subtract(b, a)),
+        (b * lazy_a, metatensor.multiply(b, a)),
+        (b / lazy_a, metatensor.divide(b, a)),
+        (c - b * lazy_a, metatensor.subtract(c, metatensor.multiply(b, a))),
+    ]
+
+    for expression, expected in expressions:
+        assert isinstance(expression, metatensor.LazyTensorMap)
+        assert metatensor.allclose(expression.evaluate(), expected, rtol=1e-12)
+
+    # operations between TensorMap are not affected
+    assert metatensor.allclose(b - a, metatensor.subtract(b, a))
+
+
+def test_repr(tensors):
+    a, b, _ = tensors
+    expression = -(metatensor.lazy(a) / b) + 2
+    assert repr(expression) == "LazyTensorMap(-(TensorMap / TensorMap) + 2.0)"
+
+
+@pytest.mark.skipif(not HAS_TORCH, reason="requires torch")
+def test_expression_torch(tensors):
+    a, b, c = [tensor.to(arrays="torch") for tensor in tensors]
+
+    result = (metatensor.lazy(a) * b - c / a).evaluate()
+    assert isinstance(result.block(0).values, torch.Tensor)
+
+    expected = metatensor.subtract(metatensor.multiply(a, b), metatensor.divide(c, a))
+    assert metatensor.allclose(result, expected, rtol=1e-12)
+
+
+def test_errors(tensors):
+    a, b, _ = tensors
+
+    message = "`tensor` must be a metatensor TensorMap, not <class 'numpy.ndarray'>"
+    with pytest.raises(TypeError, match=message):
+        metatensor.lazy(np.zeros(3))
+
+    message = "the exponent of a LazyTensorMap must be a scalar"
+    with pytest.raises(TypeError, match=message):
+        metatensor.lazy(a) ** b
+
+    with pytest.raises(TypeError, match="unsupported operand type"):
+        metatensor.lazy(a) + "not a tensor"
+
+    other = TensorMap(Labels.range("key", 1), [a.block(0).copy()])
+    message = "inputs to 'lazy' should have the same keys names"
+    with pytest.raises(NotEqualError, match=message):
+        (metatensor.lazy(a) + other).evaluate()
+
+    block = b.block(0)
+    selection = Labels(block.properties.names, block.properties.values[:3])
+    other_blocks = [metatensor.slice_block(block, "properties", selection)]
+    other_blocks += [b.block(i).copy() for i in range(1, len(b))]
+    other = TensorMap(b.keys, other_blocks)
+
+    message = "inputs to 'lazy' should have the same properties"
+    with pytest.raises(NotEqualError, match=message):
+        (metatensor.lazy(a) * other).evaluate()
@@ -110,6 +110,9 @@ def test_self_lstsq_gradients():
     Ydot = metatensor.dot(X, w)
     assert metatensor.allclose(Ydot, Y)
 
+    w = metatensor.lstsq(X, Y, rcond=1e-13, normal_equations=True)
+    assert np.allclose(w.block(0).values, np.array([1.0, 3.0]), rtol=1e-10)
+
 
 def test_self_lstsq_gradients_components():
     x, x_grad, y, y_grad = get_value_linear_solve()
@@ -229,3 +232,86 @@ def get_value_linear_solve():
     y_grad = np.dot(x_grad, w)
 
     return x, x_grad, y, y_grad
+
+
+def _random_linear_system(n_samples, n_properties_X, n_properties_Y):
+    X = TensorBlock(
+        values=np.random.rand(n_samples, n_properties_X),
+        samples=Labels.range("s", n_samples),
+        components=[],
+        properties=Labels.range("p", n_properties_X),
+    )
+    Y = TensorBlock(
+        values=np.random.rand(n_samples, n_properties_Y),
+        samples=Labels.range("s", n_samples),
+        components=[],
+        properties=Labels.range("q", n_properties_Y),
+    )
+    return X, Y
+
+
+@pytest.mark.parametrize("rcond", [1e-13, None])
+def test_lstsq_batched(rcond):
+    np.random.seed(0xDEADBEEF)
+    shapes = [(10, 4, 2), (7, 4, 2), (10, 4, 2), (5, 3, 1), (10, 4, 2), (7, 4, 2)]
+    systems = [_random_linear_system(*shape) for shape in shapes]
+    # a rank-deficient system, where rcond matters
+    systems[2][0].values[:, 3] = systems[2][0].values[:, 2]
+
+    keys = Labels.range("key", len(systems))
+    X = TensorMap(keys, [X_block for X_block, _ in systems])
+    Y = TensorMap(keys, [Y_block for _, Y_block in systems])
+
+    if rcond is None:
+        with pytest.warns(UserWarning, match="rcond is set to None"):
+            w = metatensor.lstsq(X, Y, rcond=rcond)
+    else:
+        w = metatensor.lstsq(X, Y, rcond=rcond)
+
+    for i in range(len(keys)):
+        X_values = X.block(i).values
+        Y_values = Y.block(i).values
+        expected = np.linalg.lstsq(X_values, Y_values, rcond=rcond)[0]
+        assert np.allclose(w.block(i).values, expected.T, rtol=1e-10, atol=1e-12)
+
+
+def test_lstsq_regularization():
+    np.random.seed(0xDEADBEEF)
+    systems = [_random_linear_system(10, 4, 2) for _ in range(3)]
+    keys = Labels.range("key", len(systems))
+    X = TensorMap(keys, [X_block for X_block, _ in systems])
+    Y = TensorMap(keys, [Y_block for _, Y_block in systems])
+
+    alpha = 0.5
+    w = metatensor.lstsq(X, Y, rcond=1e-13, alpha=alpha)
+    for i in range(len(keys)):
+        X_values = X.block(i).values
+        Y_values = Y.block(i).values
+        expected = np.linalg.solve(
+            X_values.T @ X_values + alpha * np.eye(4), X_values.T @ Y_values
+        )
+        assert np.allclose(w.block(i).values, expected.T, rtol=1e-10)
+
+    message = "`alpha` must be positive or zero, got -1.0"
+    with pytest.raises(ValueError, match=message):
+        metatensor.lstsq(X, Y, rcond=1e-13, alpha=-1.0)
+
+
+def test_lstsq_normal_equations():
+    tensor = metatensor.load(os.path.join(DATA_ROOT, "qm7-power-spectrum.mts"))
+    np.random.seed(0xDEADBEEF)
+    Y = metatensor.random_uniform_like(tensor)
+    Y = metatensor.slice(Y, "properties", Labels.range("n_1", 1))
+
+    # some blocks are rank-deficient or under-determined, where the normal equations
+    # are only accurate with some regularization
+    for X in [metatensor.random_uniform_like(tensor), tensor]:
+        expected = metatensor.lstsq(X, Y, rcond=1e-10, alpha=1e-3)
+        w = metatensor.lstsq(X, Y, rcond=1e-10, alpha=1e-3, normal_equations=True)
+
+        assert w.keys == expected.keys
+        for key, block in w.items():
+            assert block.samples == Y.block(key).properties
+            assert block.properties == X.block(key).properties
+
+        assert metatensor.allclose(w, expected, rtol=1e-6, atol=1e-8)
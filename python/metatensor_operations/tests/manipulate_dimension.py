@@ -331,3 +331,39 @@ def test_insert_dimension_wrong_size(tensor):
         values=0,
         index=0,
     )
+
+
+def test_shared_labels():
+    """Labels shared between blocks are only transformed once"""
+    properties = Labels.range("properties", 3)
+    blocks = [
+        TensorBlock(
+            values=np.full((2, 3), i, dtype=np.float64),
+            samples=Labels.range("sample", 2),
+            components=[],
+            properties=properties,
+        )
+        for i in range(3)
+    ]
+    tensor = TensorMap(Labels.range("key", 3), blocks)
+
+    results = [
+        metatensor.insert_dimension(tensor, "properties", 1, "new", 4),
+        metatensor.permute_dimensions(
+            metatensor.append_dimension(tensor, "properties", "new", 4),
+            "properties",
+            [1, 0],
+        ),
+        metatensor.rename_dimension(tensor, "properties", "properties", "new"),
+    ]
+
+    for result in results:
+        first = result.block(0).properties
+        for block in result.blocks():
+            assert block.properties == first
+            assert block.properties._labels.internal_ptr_ == first._labels.internal_ptr_
+
+    assert results[0].block(2).properties.names == ["properties", "new"]
+    assert_equal(results[0].block(2).properties.column("new"), [4, 4, 4])
+    assert results[1].block(2).properties.names == ["new", "properties"]
+    assert results[2].block(2).properties.names == ["new"]
@@ -0,0 +1,228 @@
+import concurrent.futures
+import os
+
+import numpy as np
+import pytest
+
+import metatensor
+from metatensor import Labels, TensorBlock, TensorMap
+from metatensor.operations.map_blocks import _use_parallel_blocks
+
+
+DATA_ROOT = os.path.join(os.path.dirname(__file__), "data")
+
+
+@pytest.fixture
+def tensor():
+    tensor = metatensor.load(os.path.join(DATA_ROOT, "qm7-power-spectrum.mts"))
+    assert len(tensor) > 1
+    return tensor
+
+
+def _negate_block(block):
+    result = TensorBlock(
+        values=-block.values,
+        samples=block.samples,
+        components=block.components,
+        properties=block.properties,
+    )
+    for parameter, gradient in block.gradients():
+        result.add_gradient(
+            parameter,
+            TensorBlock(
+                values=-gradient.values,
+                samples=gradient.samples,
+                components=gradient.components,
+                properties=gradient.properties,
+            ),
+        )
+    return result
+
+
+def test_map_blocks(tensor):
+    result = metatensor.map_blocks(_negate_block, tensor)
+    assert metatensor.equal(result, metatensor.multiply(tensor, -1))
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=3) as executor:
+        result = metatensor.map_blocks(_negate_block, tensor, executor=executor)
+    assert metatensor.equal(result, metatensor.multiply(tensor, -1))
+
+
+def test_map_blocks_multiple_tensors(tensor):
+    def add_values(block_1, block_2):
+        return TensorBlock(
+            values=block_1.values + block_2.values,
+            samples=block_1.samples,
+            components=block_1.components,
+            properties=block_1.properties,
+        )
+
+    # use the keys in a different order in the second tensor
+    reversed_tensor = metatensor.sort(tensor, axes="keys", descending=True)
+    with metatensor.parallel_blocks(max_workers=2):
+        result = metatensor.map_blocks(add_values, tensor, reversed_tensor)
+
+    expected = metatensor.remove_gradients(metatensor.multiply(tensor, 2))
+    assert metatensor.equal(result, expected)
+
+
+def test_map_blocks_errors(tensor):
+    message = "`map_blocks` requires at least one TensorMap"
+    with pytest.raises(ValueError, match=message):
+        metatensor.map_blocks(_negate_block)
+
+    message = "`tensors` must be metatensor TensorMap, not <class 'int'>"
+    with pytest.raises(TypeError, match=message):
+        metatensor.map_blocks(_negate_block, tensor, 3)
+
+    message = "`function` in `map_blocks` must return a metatensor TensorBlock"
+    with pytest.raises(TypeError, match=message):
+        metatensor.map_blocks(lambda block: block.values, tensor)
+
+    other = metatensor.drop_blocks(
+        tensor, Labels(tensor.keys.names, tensor.keys.values[:1])
+    )
+    message = "inputs to 'map_blocks' should have the same number of blocks"
+    with pytest.raises(metatensor.NotEqualError, match=message):
+        metatensor.map_blocks(_negate_block, tensor, other)
+
+
+def test_parallel_blocks_errors():
+    with concurrent.futures.ThreadPoolExecutor() as executor:
+        message = "can not give both `executor` and `max_workers`"
+        with pytest.raises(ValueError, match=message):
+            metatensor.parallel_blocks(executor=executor, max_workers=2)
+
+
+def test_parallel_operations(tensor):
+    tensor_no_grad = metatensor.remove_gradients(tensor)
+
+    expected = {
+        "add": metatensor.add(tensor, tensor),
+        "add_constant": metatensor.add(tensor, 3.0),
+        "subtract": metatensor.subtract(tensor, tensor),
+        "multiply": metatensor.multiply(tensor, tensor),
+        "divide": metatensor.divide(tensor, 4.0),
+        "abs": metatensor.abs(tensor),
+        "pow": metatensor.pow(tensor, 2),
+        "dot": metatensor.dot(tensor, tensor_no_grad),
+        "sum": metatensor.sum_over_samples(tensor, "atom"),
+        "std": metatensor.std_over_samples(tensor, "atom"),
+        "sort": metatensor.sort(tensor, descending=True),
+        "slice": metatensor.slice(
+            tensor, "samples", Labels(["system"], np.array([[0], [3]]))
+        ),
+    }
+
+    with metatensor.parallel_blocks(max_workers=4, min_blocks=2):
+        assert _use_parallel_blocks(len(tensor))
+
+        results = {
+            "add": metatensor.add(tensor, tensor),
+            "add_constant": metatensor.add(tensor, 3.0),
+            "subtract": metatensor.subtract(tensor, tensor),
+            "multiply": metatensor.multiply(tensor, tensor),
+            "divide": metatensor.divide(tensor, 4.0),
+            "abs": metatensor.abs(tensor),
+            "pow": metatensor.pow(tensor, 2),
+            "dot": metatensor.dot(tensor, tensor_no_grad),
+            "sum": metatensor.sum_over_samples(tensor, "atom"),
+            "std": metatensor.std_over_samples(tensor, "atom"),
+            "sort": metatensor.sort(tensor, descending=True),
+            "slice": metatensor.slice(
+                tensor, "samples", Labels(["system"], np.array([[0], [3]]))
+            ),
+        }
+
+    assert not _use_parallel_blocks(len(tensor))
+
+    for name, result in results.items():
+        assert metatensor.equal(result, expected[name]), name
+
+
+def test_parallel_linear_algebra():
+    blocks_X = []
+    blocks_Y = []
+    rng = np.random.default_rng(0xDEADBEEF)
+    for _ in range(6):
+        X = rng.random((5, 5)) + 5 * np.eye(5)
+        blocks_X.append(
+            TensorBlock(
+                values=X,
+                samples=Labels.range("s", 5),
+                components=[],
+                properties=Labels.range("p", 5),
+            )
+        )
+        blocks_Y.append(
+            TensorBlock(
+                values=rng.random((5, 2)),
+                samples=Labels.range("s", 5),
+                components=[],
+                properties=Labels.range("y", 2),
+            )
+        )
+
+    X = TensorMap(Labels.range("key", 6), blocks_X)
+    Y = TensorMap(Labels.range("key", 6), blocks_Y)
+
+    expected_solve = metatensor.solve(X, Y)
+    expected_lstsq = metatensor.lstsq(X, Y, rcond=1e-13)
+
+    with metatensor.parallel_blocks(max_workers=3, min_blocks=2):
+        assert metatensor.allclose(metatensor.solve(X, Y), expected_solve)
+        assert metatensor.allclose(metatensor.lstsq(X, Y, rcond=1e-13), expected_lstsq)
+
+
+def test_parallel_min_blocks(tensor):
+    # the executor is not used if there are not enough blocks
+    class FailingExecutor(concurrent.futures.Executor):
+        def submit(self, fn, *args, **kwargs):
+            raise AssertionError("this executor should not be used")
+
+    with metatensor.parallel_blocks(FailingExecutor(), min_blocks=len(tensor) + 1):
+        metatensor.multiply(tensor, 2)
+
+    with metatensor.parallel_blocks(FailingExecutor(), min_blocks=len(tensor)):
+        with pytest.raises(AssertionError, match="this executor should not be used"):
+            metatensor.multiply(tensor, 2)
+
+
+def test_nested_parallel_blocks(tensor):
+    # operations called from a function already running in the pool process their
+    # blocks sequentially instead of waiting on the pool from one of its workers
+    small = metatensor.drop_blocks(
+        tensor, Labels(tensor.keys.names, tensor.keys.values[2:])
+    )
+    assert len(small) == 2
+
+    def multiply_small(block):
+        assert not _use_parallel_blocks(len(small))
+        product = metatensor.multiply(small, small)
+        assert metatensor.equal(product, metatensor.multiply(small, small))
+        return _negate_block(block)
+
+    expected = metatensor.multiply(tensor, -1)
+    with metatensor.parallel_blocks(max_workers=2, min_blocks=2):
+        result = metatensor.map_blocks(multiply_small, tensor)
+    assert metatensor.equal(result, expected)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+
+        def nested_map_blocks(block):
+            result = metatensor.map_blocks(_negate_block, small, executor=executor)
+            assert metatensor.equal(result, metatensor.multiply(small, -1))
+            return _negate_block(block)
+
+        result = metatensor.map_blocks(nested_map_blocks, tensor, executor=executor)
+    assert metatensor.equal(result, expected)
+
+
+def test_parallel_blocks_thread_local(tensor):
+    # the executor set by `parallel_blocks` is only used in the current thread
+    with metatensor.parallel_blocks(max_workers=2, min_blocks=2):
+        assert _use_parallel_blocks(len(tensor))
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            other_thread = executor.submit(_use_parallel_blocks, len(tensor))
+            assert not other_thread.result()
@@ -322,6 +322,35 @@ def test_self_multiply_scalar_gradient():
         assert metatensor.equal(tensor_result, product_tensor)
 
 
+def test_multiply_out_inplace():
+    tensor = metatensor.load(os.path.join(DATA_ROOT, "qm7-power-spectrum.mts"))
+    A = metatensor.random_uniform_like(tensor)
+    B = metatensor.random_uniform_like(tensor)
+    expected = metatensor.multiply(A, B)
+
+    out = metatensor.empty_like(tensor)
+    assert metatensor.multiply(A, B, out=out) is out
+    assert metatensor.allclose(out, expected)
+
+    A_copy = A.copy()
+    assert metatensor.multiply_(A_copy, B) is A_copy
+    assert metatensor.allclose(A_copy, expected)
+
+    # multiplying a tensor by itself
+    A_copy = A.copy()
+    metatensor.multiply_(A_copy, A_copy)
+    assert metatensor.allclose(A_copy, metatensor.multiply(A, A))
+
+    A_copy = A.copy()
+    metatensor.multiply_(A_copy, 3)
+    assert metatensor.allclose(A_copy, metatensor.multiply(A, 3))
+
+    # `out` can be `B`
+    expected = metatensor.multiply(A, B)
+    assert metatensor.multiply(A, B, out=B) is B
+    assert metatensor.allclose(B, expected)
+
+
 def test_self_multiply_error():
     block = TensorBlock(
         values=np.array([[1, 2], [3, 5]]),
@@ -88,3 +88,39 @@ def test_missing_value():
     message = "type=6 is present in the labels, but was not found in the dimension"
     with pytest.raises(ValueError, match=message):
         metatensor.one_hot(original_labels, possible_labels)
+
+
+@pytest.mark.parametrize("missing", [0, 7, 20])
+def test_missing_value_outside_range(missing):
+    """Test missing values smaller, in the middle and larger than the dimension"""
+    original_labels = Labels(
+        names=["atom", "type"],
+        values=np.array([[0, 6], [1, 1], [2, missing], [3, 8]]),
+    )
+    possible_labels = Labels(names=["type"], values=np.array([[8], [1], [6]]))
+
+    message = f"type={missing} is present in the labels, but was not found"
+    with pytest.raises(ValueError, match=message):
+        metatensor.one_hot(original_labels, possible_labels)
+
+    empty_labels = Labels(names=["type"], values=np.zeros((0, 1), dtype=np.int32))
+    message = "type=6 is present in the labels, but was not found"
+    with pytest.raises(ValueError, match=message):
+        metatensor.one_hot(original_labels, empty_labels)
+
+
+def test_many_values():
+    """Test one-hot encoding of many entries, with unsorted dimension values"""
+    rng = np.random.default_rng(0x5EED)
+    types = np.array([8, 1, 6, 7, 16])
+    values = np.stack([np.arange(1000), rng.choice(types, size=1000)], axis=1)
+    original_labels = Labels(names=["atom", "type"], values=values)
+    possible_labels = Labels(names=["type"], values=types.reshape(-1, 1))
+
+    expected = (values[:, 1:] == types[None, :]).astype(np.int32)
+    one_hot_encoding = metatensor.one_hot(original_labels, possible_labels)
+    np.testing.assert_equal(one_hot_encoding, expected)
+
+    empty = Labels(names=["atom", "type"], values=np.zeros((0, 2), dtype=np.int32))
+    one_hot_encoding = metatensor.one_hot(empty, possible_labels)
+    assert one_hot_encoding.shape == (0, 5)
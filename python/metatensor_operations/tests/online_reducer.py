@@ -0,0 +1,192 @@
+import os
+import pickle
+
+import numpy as np
+import pytest
+
+import metatensor
+from metatensor import Labels, TensorBlock, TensorMap
+
+
+try:
+    import torch
+
+    HAS_TORCH = True
+except ImportError:
+    HAS_TORCH = False
+
+
+DATA_ROOT = os.path.join(os.path.dirname(__file__), "data")
+
+REDUCTIONS = {
+    "sum": metatensor.sum_over_samples,
+    "mean": metatensor.mean_over_samples,
+    "var": metatensor.var_over_samples,
+    "std": metatensor.std_over_samples,
+}
+
+
+@pytest.fixture
+def tensor():
+    tensor = metatensor.load(os.path.join(DATA_ROOT, "qm7-power-spectrum.mts"))
+    # the power spectrum contains samples with (almost) zero variance, where the
+    # reference implementation is not accurate enough for the std gradients
+    np.random.seed(0xDEADBEEF)
+    return metatensor.random_uniform_like(tensor)
+
+
+def _batches(tensor, n_batches):
+    systems = np.unique(tensor.block(0).samples.column("system"))
+    selections = [
+        Labels("system", systems[i::n_batches].reshape(-1, 1)) for i in range(n_batches)
+    ]
+    return metatensor.split(tensor, "samples", selections)
+
+
+@pytest.mark.parametrize("reduction", ["sum", "mean", "var", "std"])
+@pytest.mark.parametrize("sample_names", ["atom", "system", ["system", "atom"]])
+def test_online_reducer(tensor, reduction, sample_names):
+    reducer = metatensor.OnlineReducer(sample_names, reduction=reduction)
+    for batch in _batches(tensor, 3):
+        reducer.update(batch)
+
+    result = metatensor.sort(reducer.finalize(), axes="samples")
+    expected = metatensor.sort(REDUCTIONS[reduction](tensor, sample_names))
+    assert metatensor.allclose(result, expected, rtol=1e-7, atol=1e-10)
+
+
+@pytest.mark.parametrize("reduction", ["sum", "mean", "var", "std"])
+def test_merge(tensor, reduction):
+    batches = _batches(tensor, 4)
+
+    first = metatensor.OnlineReducer("atom", reduction=reduction)
+    first.update(batches[0])
+    first.update(batches[1])
+
+    second = metatensor.OnlineReducer("atom", reduction=reduction)
+    second.update(batches[2])
+    second.update(batches[3])
+
+    # reducers can be sent to other processes
+    second = pickle.loads(pickle.dumps(second))
+
+    first.merge(second)
+    result = metatensor.sort(first.finalize(), axes="samples")
+    expected = metatensor.sort(REDUCTIONS[reduction](tensor, "atom"))
+    assert metatensor.allclose(result, expected, rtol=1e-7, atol=1e-10)
+
+    # merging does not modify the other reducer
+    second.update(batches[0])
+    result = metatensor.sort(first.finalize(), axes="samples")
+    assert metatensor.allclose(result, expected, rtol=1e-7, atol=1e-10)
+
+    # merging in an empty reducer
+    empty = metatensor.OnlineReducer("atom", reduction=reduction)
+    empty.merge(first)
+    assert metatensor.equal(empty.finalize(), first.finalize())
+
+
+def test_different_keys(tensor):
+    batches = _batches(tensor, 2)
+    first = metatensor.drop_blocks(
+        batches[0], Labels(tensor.keys.names, tensor.keys.values[:3])
+    )
+    second = metatensor.drop_blocks(
+        batches[1], Labels(tensor.keys.names, tensor.keys.values[3:])
+    )
+
+    reducer = metatensor.OnlineReducer("atom", reduction="sum")
+    reducer.update(first)
+    reducer.update(second)
+    result = reducer.finalize()
+
+    assert len(result) == len(tensor)
+    for key, block in result.items():
+        if key in first.keys:
+            expected = metatensor.sum_over_samples_block(first.block(key), "atom")
+        else:
+            expected = metatensor.sum_over_samples_block(second.block(key), "atom")
+        assert metatensor.allclose_block(block, expected)
+
+
+def test_empty_blocks(tensor):
+    tensor = metatensor.remove_gradients(tensor)
+    empty = metatensor.slice(tensor, "samples", Labels("system", np.zeros((0, 1))))
+
+    reducer = metatensor.OnlineReducer("atom", reduction="mean")
+    reducer.update(empty)
+    result = reducer.finalize()
+    assert len(result) == len(tensor)
+    for block in result.blocks():
+        assert block.samples.names == ["system"]
+        assert len(block.samples) == 0
+        assert block.values.shape[1:] == tensor.block(0).values.shape[1:]
+
+    reducer.update(tensor)
+    result = metatensor.sort(reducer.finalize(), axes="samples")
+    expected = metatensor.sort(metatensor.mean_over_samples(tensor, "atom"))
+    assert metatensor.allclose(result, expected)
+
+
+@pytest.mark.skipif(not HAS_TORCH, reason="requires torch")
+def test_online_reducer_torch(tensor):
+    reducer = metatensor.OnlineReducer("atom", reduction="std")
+    for batch in _batches(tensor, 3):
+        reducer.update(batch.to(arrays="torch"))
+
+    result = reducer.finalize()
+    assert isinstance(result.block(0).values, torch.Tensor)
+
+    result = metatensor.sort(result.to(arrays="numpy"), axes="samples")
+    expected = metatensor.sort(metatensor.std_over_samples(tensor, "atom"))
+    assert metatensor.allclose(result, expected, rtol=1e-7, atol=1e-10)
+
+
+def test_online_reducer_errors(tensor):
+    message = "invalid reduction 'max', expected one of 'sum', 'mean', 'var' or 'std'"
+    with pytest.raises(ValueError, match=message):
+        metatensor.OnlineReducer("atom", reduction="max")
+
+    reducer = metatensor.OnlineReducer("atom")
+
+    message = "no data was given to this OnlineReducer"
+    with pytest.raises(ValueError, match=message):
+        reducer.finalize()
+
+    message = "`tensor` must be a metatensor TensorMap, not <class 'numpy.ndarray'>"
+    with pytest.raises(TypeError, match=message):
+        reducer.update(np.zeros(3))
+
+    message = "one of the requested sample name \\(not-there\\) is not part of"
+    with pytest.raises(ValueError, match=message):
+        metatensor.OnlineReducer("not-there").update(tensor)
+
+    reducer.update(tensor)
+
+    renamed = metatensor.rename_dimension(tensor, "samples", "system", "structure")
+    message = (
+        "inconsistent samples names: expected the remaining samples to be "
+        "\\['system'\\], got \\['structure'\\]"
+    )
+    with pytest.raises(ValueError, match=message):
+        reducer.update(renamed)
+
+    block = tensor.block(0)
+    other = TensorMap(
+        Labels(tensor.keys.names, tensor.keys.values[:1]),
+        [
+            TensorBlock(
+                values=block.values[:, :3],
+                samples=block.samples,
+                components=block.components,
+                properties=Labels(block.properties.names, block.properties.values[:3]),
+            )
+        ],
+    )
+    message = "all blocks with the same key must have the same properties"
+    with pytest.raises(ValueError, match=message):
+        reducer.update(other)
+
+    message = "can not merge OnlineReducer with different sample names or reduction"
+    with pytest.raises(ValueError, match=message):
+        reducer.merge(metatensor.OnlineReducer("atom", reduction="sum"))
@@ -0,0 +1,179 @@
+import os
+
+import numpy as np
+import pytest
+
+import metatensor
+from metatensor import Labels, TensorBlock, TensorMap
+
+
+try:
+    import torch
+
+    HAS_TORCH = True
+except ImportError:
+    HAS_TORCH = False
+
+
+DATA_ROOT = os.path.join(os.path.dirname(__file__), "data")
+
+
+@pytest.fixture
+def tensor():
+    return metatensor.load(os.path.join(DATA_ROOT, "qm7-power-spectrum.mts"))
+
+
+def test_pack(tensor):
+    assert not metatensor.is_packed(tensor)
+
+    packed = metatensor.pack(tensor)
+    assert metatensor.is_packed(packed)
+    assert metatensor.equal(packed, tensor)
+
+    # all arrays are views inside the same buffer
+    buffer = packed.block(0).values.base
+    size = 0
+    for block in packed.blocks():
+        assert block.values.base is buffer
+        size += block.values.size
+        for _, gradient in block.gradients():
+            assert gradient.values.base is buffer
+            size += gradient.values.size
+    assert buffer.shape == (size,)
+
+    # modifying the values in place keeps the tensor packed
+    packed.block(2).values[:] = 3.0
+    assert metatensor.is_packed(packed)
+    block_0 = tensor.block(0)
+    assert np.all(buffer[: block_0.values.size] == block_0.values.reshape(-1))
+
+
+@pytest.mark.skipif(not HAS_TORCH, reason="requires torch")
+def test_pack_torch(tensor):
+    tensor = tensor.to(arrays="torch")
+    packed = metatensor.pack(tensor)
+
+    assert metatensor.is_packed(packed)
+    assert metatensor.equal(packed, tensor)
+
+    buffer = packed.block(0).values._base
+    assert isinstance(buffer, torch.Tensor)
+    for block in packed.blocks():
+        assert block.values._base is buffer
+
+
+def test_not_packed(tensor):
+    packed = metatensor.pack(tensor)
+
+    # changing the order of blocks
+    sorted_tensor = metatensor.sort(packed, axes="keys", descending=True)
+    assert not metatensor.is_packed(sorted_tensor)
+
+    # using a subset of the buffer
+    dropped = metatensor.drop_blocks(
+        packed, Labels(packed.keys.names, packed.keys.values[:1])
+    )
+    assert not metatensor.is_packed(dropped)
+
+    # arrays that are views of a non-packed array
+    block = TensorBlock(
+        values=np.zeros((4, 3))[::2],
+        samples=Labels.range("s", 2),
+        components=[],
+        properties=Labels.range("p", 3),
+    )
+    assert not metatensor.is_packed(TensorMap(Labels.range("_", 1), [block]))
+
+
+def test_packed_operations(tensor):
+    packed = metatensor.pack(tensor)
+
+    result = metatensor.multiply(packed, 3.0)
+    assert metatensor.is_packed(result)
+    assert metatensor.allclose(result, metatensor.multiply(tensor, 3.0))
+
+    result = metatensor.divide(packed, 3.0)
+    assert metatensor.is_packed(result)
+    assert metatensor.allclose(result, metatensor.divide(tensor, 3.0))
+
+    # these are not using the buffer for tensors with gradients
+    result = metatensor.add(packed, 3.0)
+    assert not metatensor.is_packed(result)
+    assert metatensor.allclose(result, metatensor.add(tensor, 3.0))
+
+    result = metatensor.pow(packed, 2.0)
+    assert not metatensor.is_packed(result)
+    assert metatensor.allclose(result, metatensor.pow(tensor, 2.0))
+
+    tensor = metatensor.remove_gradients(tensor)
+    packed = metatensor.pack(tensor)
+
+    result = metatensor.add(packed, 3.0)
+    assert metatensor.is_packed(result)
+    assert metatensor.allclose(result, metatensor.add(tensor, 3.0))
+
+    result = metatensor.subtract(packed, 3.0)
+    assert metatensor.is_packed(result)
+    assert metatensor.allclose(result, metatensor.subtract(tensor, 3.0))
+
+    result = metatensor.pow(packed, 2.0)
+    assert metatensor.is_packed(result)
+    assert metatensor.allclose(result, metatensor.pow(tensor, 2.0))
+
+    result = metatensor.abs(metatensor.multiply(packed, -1.0))
+    assert metatensor.is_packed(result)
+    assert metatensor.allclose(result, metatensor.abs(tensor))
+
+
+def test_pack_errors():
+    message = "`tensor` must be a metatensor TensorMap, not <class 'numpy.ndarray'>"
+    with pytest.raises(TypeError, match=message):
+        metatensor.pack(np.zeros(3))
+
+
+def test_packed_to(tensor):
+    moved = metatensor.packed_to(tensor, dtype=np.float32)
+    assert metatensor.is_packed(moved)
+    assert moved.dtype == np.float32
+    assert metatensor.allclose(moved, tensor.to(dtype=np.float32))
+
+    # already packed tensors re-use the existing buffer
+    packed = metatensor.pack(tensor)
+    moved = metatensor.packed_to(packed, device="cpu", dtype=np.float32)
+    assert metatensor.is_packed(moved)
+    assert metatensor.allclose(moved, tensor.to(dtype=np.float32))
+
+    message = "can not move numpy array to non-cpu device: cuda"
+    with pytest.raises(ValueError, match=message):
+        metatensor.packed_to(tensor, device="cuda")
+
+
+@pytest.mark.skipif(not HAS_TORCH, reason="requires torch")
+def test_packed_to_torch(tensor):
+    tensor = tensor.to(arrays="torch")
+
+    # pin_memory is ignored when moving to the CPU
+    moved = metatensor.packed_to(
+        tensor,
+        device="cpu",
+        dtype=torch.float32,
+        non_blocking=True,
+        pin_memory=True,
+    )
+    assert metatensor.is_packed(moved)
+    assert moved.dtype == torch.float32
+    assert moved.device.type == "cpu"
+    assert metatensor.allclose(moved, tensor.to(dtype=torch.float32))
+
+    # the "meta" device checks the packing logic without moving any data
+    with pytest.warns(metatensor.DeviceWarning):
+        moved = metatensor.packed_to(tensor, device="meta")
+    assert moved.device.type == "meta"
+    for key, block in tensor.items():
+        moved_block = moved.block(key)
+        assert moved_block.values.shape == block.values.shape
+        assert moved_block.samples == block.samples
+        for parameter, gradient in block.gradients():
+            moved_gradient = moved_block.gradient(parameter)
+            assert moved_gradient.values.shape == gradient.values.shape
+            assert moved_gradient.samples == gradient.samples
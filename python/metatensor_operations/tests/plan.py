@@ -0,0 +1,102 @@
+import os
+
+import numpy as np
+import pytest
+
+import metatensor
+from metatensor import Labels, TensorMap
+
+
+try:
+    import torch
+
+    HAS_TORCH = True
+except ImportError:
+    HAS_TORCH = False
+
+
+DATA_ROOT = os.path.join(os.path.dirname(__file__), "data")
+
+
+@pytest.fixture
+def tensor():
+    return metatensor.load(os.path.join(DATA_ROOT, "qm7-spherical-expansion.mts"))
+
+
+def test_plan(tensor):
+    selection = Labels(["n"], np.array([[3], [0], [2]]))
+
+    plan = (
+        metatensor.MetadataPlan(tensor)
+        .slice("properties", selection)
+        .sort("properties", descending=True)
+        .sort("keys", descending=True)
+        .rename_dimension("components", "o3_mu", "mu")
+        .rename_dimension("properties", "n", "radial")
+        .permute_dimensions("keys", [3, 2, 1, 0])
+        .remove_dimension("keys", "o3_sigma")
+    )
+
+    # applying the plan to a different tensor with the same metadata
+    tensor = metatensor.random_uniform_like(tensor)
+    expected = metatensor.slice(tensor, "properties", selection)
+    expected = metatensor.sort(expected, "properties", descending=True)
+    expected = metatensor.sort(expected, "keys", descending=True)
+    expected = metatensor.rename_dimension(expected, "components", "o3_mu", "mu")
+    expected = metatensor.rename_dimension(expected, "properties", "n", "radial")
+    expected = metatensor.permute_dimensions(expected, "keys", [3, 2, 1, 0])
+    expected = metatensor.remove_dimension(expected, "keys", "o3_sigma")
+
+    result = plan.apply(tensor)
+    assert metatensor.equal(result, expected)
+    assert result.block(0).gradient("positions").components[1].names == ["mu"]
+
+    # the plan can be applied multiple times
+    assert metatensor.equal(plan.apply(tensor), expected)
+
+
+@pytest.mark.skipif(not HAS_TORCH, reason="requires torch")
+def test_plan_torch(tensor):
+    selection = Labels(["n"], np.array([[1], [0]]))
+    plan = metatensor.MetadataPlan(tensor).slice("properties", selection)
+
+    expected = metatensor.slice(tensor, "properties", selection).to(arrays="torch")
+
+    result = plan.apply(tensor.to(arrays="torch"))
+    assert isinstance(result.block(0).values, torch.Tensor)
+    assert metatensor.equal(result, expected)
+
+
+def test_errors(tensor):
+    plan = metatensor.MetadataPlan(tensor)
+
+    message = "`template` must be a metatensor TensorMap, not <class 'numpy.ndarray'>"
+    with pytest.raises(TypeError, match=message):
+        metatensor.MetadataPlan(np.zeros(3))
+
+    message = "MetadataPlan.slice can not act on samples"
+    with pytest.raises(ValueError, match=message):
+        plan.slice("samples", Labels(["system"], np.array([[0]])))
+
+    message = (
+        "`axis` must be one of 'keys', 'properties' in MetadataPlan.sort, "
+        "got 'components'"
+    )
+    with pytest.raises(ValueError, match=message):
+        plan.sort("components")
+
+    keys = Labels(tensor.keys.names, tensor.keys.values[:2])
+    other = TensorMap(keys, [tensor.block(0).copy(), tensor.block(1).copy()])
+    message = "the keys of `tensor` are different from the keys of the template"
+    with pytest.raises(ValueError, match=message):
+        plan.apply(other)
+
+    other = metatensor.slice(tensor, "properties", Labels(["n"], np.array([[0], [1]])))
+    message = "the properties of `tensor` are different from the properties"
+    with pytest.raises(ValueError, match=message):
+        plan.apply(other)
+
+    other = metatensor.remove_gradients(tensor, ["strain"])
+    message = "the gradients of `tensor` are different from the gradients"
+    with pytest.raises(ValueError, match=message):
+        plan.apply(other)
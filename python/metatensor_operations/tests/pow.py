@@ -341,6 +341,19 @@ def test_self_pow_scalar_sqrt_gradient():
     assert metatensor.allclose(tensor_result, tensor_sum)
 
 
+def test_pow_out_inplace():
+    tensor = metatensor.load(os.path.join(DATA_ROOT, "qm7-power-spectrum.mts"))
+    A = metatensor.random_uniform_like(tensor)
+    expected = metatensor.pow(A, 1.5)
+
+    out = metatensor.empty_like(tensor)
+    assert metatensor.pow(A, 1.5, out=out) is out
+    assert metatensor.allclose(out, expected)
+
+    assert metatensor.pow_(A, 1.5) is A
+    assert metatensor.allclose(A, expected)
+
+
 def test_self_pow_error():
     block = TensorBlock(
         values=np.array([[1.0, 2], [3, 5]]),
@@ -4,6 +4,7 @@ import numpy as np
 import pytest
 
 import metatensor
+from metatensor import Labels, TensorBlock, TensorMap
 
 
 DATA_ROOT = os.path.join(os.path.dirname(__file__), "data")
@@ -31,6 +32,29 @@ def test_random_uniform_like():
             assert np.all(random_gradient.values < 1)
 
 
+@pytest.mark.parametrize("n_blocks", [2, 100])
+def test_random_uniform_like_seed(n_blocks):
+    # the random values are the same as when creating each block separately
+    blocks = [
+        TensorBlock(
+            values=np.zeros((3, 2)),
+            samples=Labels.range("s", 3),
+            components=[],
+            properties=Labels.range("p", 2),
+        )
+        for _ in range(n_blocks)
+    ]
+    tensor = TensorMap(Labels.range("key", n_blocks), blocks)
+
+    np.random.seed(0xDEADBEEF)
+    random_tensor = metatensor.random_uniform_like(tensor)
+
+    np.random.seed(0xDEADBEEF)
+    for i, block in enumerate(tensor):
+        expected = metatensor.random_uniform_like_block(block)
+        assert np.all(random_tensor.block(i).values == expected.values)
+
+
 def test_random_uniform_like_error():
     tensor = metatensor.load(os.path.join(DATA_ROOT, "qm7-spherical-expansion.mts"))
 
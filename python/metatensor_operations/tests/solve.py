@@ -1,6 +1,7 @@
 import os
 
 import numpy as np
+import pytest
 
 import metatensor
 from metatensor import Labels, TensorBlock, TensorMap
@@ -48,3 +49,43 @@ def test_self_solve_no_gradients():
 
     Ydot = metatensor.dot(X, w)
     assert metatensor.allclose(Ydot, Y)
+
+
+def test_solve_regularization():
+    np.random.seed(0xDEADBEEF)
+    X_blocks = []
+    Y_blocks = []
+    for n_properties in [3, 3, 2, 3]:
+        X_blocks.append(
+            TensorBlock(
+                values=np.random.rand(n_properties, n_properties),
+                samples=Labels.range("s", n_properties),
+                components=[],
+                properties=Labels.range("p", n_properties),
+            )
+        )
+        Y_blocks.append(
+            TensorBlock(
+                values=np.random.rand(n_properties, 2),
+                samples=Labels.range("s", n_properties),
+                components=[],
+                properties=Labels.range("q", 2),
+            )
+        )
+
+    keys = Labels.range("key", len(X_blocks))
+    X = TensorMap(keys, X_blocks)
+    Y = TensorMap(keys, Y_blocks)
+
+    for alpha in [0.0, 0.5]:
+        w = metatensor.solve(X, Y, alpha=alpha)
+        for i in range(len(keys)):
+            X_values = X.block(i).values
+            expected = np.linalg.solve(
+                X_values + alpha * np.eye(len(X_values)), Y.block(i).values
+            )
+            assert np.allclose(w.block(i).values, expected.T, rtol=1e-10)
+
+    message = "`alpha` must be positive or zero, got -1.0"
+    with pytest.raises(ValueError, match=message):
+        metatensor.solve(X, Y, alpha=-1.0)
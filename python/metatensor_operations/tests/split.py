@@ -122,6 +122,44 @@ def test_split_samples():
     assert metatensor.split(tensor, axis="samples", selections=[]) == []
 
 
+@pytest.mark.parametrize(
+    "selections",
+    [
+        # disjoint selections, split together
+        [
+            Labels(names=["system"], values=np.array([[7], [0], [6]])),
+            Labels(names=["system"], values=np.array([[2], [3], [4]])),
+            Labels(names=["system"], values=np.array([[1], [5], [8], [9]])),
+        ],
+        [[5, 1, 3], np.array([0, 2]), []],
+        # selections with all the samples dimensions, not in the same order as the
+        # samples. The output follows the order of the selections, like `slice`
+        [
+            Labels(
+                names=["system", "atom"],
+                values=np.array([[4, 1], [1, 1], [4, 0], [0, 0]]),
+            ),
+            Labels(names=["system", "atom"], values=np.array([[3, 1], [2, 0]])),
+        ],
+        # overlapping selections, split one by one
+        [
+            Labels(names=["system"], values=np.array([[0], [6], [7]])),
+            Labels(names=["system"], values=np.array([[2], [6]])),
+        ],
+        [[0, 1, 2], [2, 3]],
+    ],
+)
+def test_split_block_samples_same_as_slice(selections):
+    tensor = metatensor.load(os.path.join(DATA_ROOT, "qm7-spherical-expansion.mts"))
+    block = tensor.block(o3_lambda=2, center_type=6, neighbor_type=6)
+
+    splitted = metatensor.split_block(block, axis="samples", selections=selections)
+    assert len(splitted) == len(selections)
+    for i, selection in enumerate(selections):
+        expected = metatensor.slice_block(block, axis="samples", selection=selection)
+        assert metatensor.equal_block(splitted[i], expected)
+
+
 def test_split_block_properties():
     # TensorMap with multiple properties
     tensor = metatensor.load(os.path.join(DATA_ROOT, "qm7-power-spectrum.mts"))
@@ -270,6 +270,31 @@ def test_self_subtract_scalar_gradient():
     assert metatensor.allclose(tensor_result, tensor_sum)
 
 
+def test_subtract_out_inplace():
+    tensor = metatensor.load(os.path.join(DATA_ROOT, "qm7-power-spectrum.mts"))
+    A = metatensor.random_uniform_like(tensor)
+    B = metatensor.random_uniform_like(tensor)
+    expected = metatensor.subtract(A, B)
+
+    out = metatensor.empty_like(tensor)
+    assert metatensor.subtract(A, B, out=out) is out
+    assert metatensor.allclose(out, expected)
+
+    A_copy = A.copy()
+    assert metatensor.subtract_(A_copy, B) is A_copy
+    assert metatensor.allclose(A_copy, expected)
+
+    # `out` can be `A`
+    expected = metatensor.subtract(A, 2.5)
+    metatensor.subtract(A, 2.5, out=A)
+    assert metatensor.allclose(A, expected)
+
+    # `out` can be `B`
+    expected = metatensor.subtract(A, B)
+    assert metatensor.subtract(A, B, out=B) is B
+    assert metatensor.allclose(B, expected)
+
+
 def test_self_subtract_error():
     block = TensorBlock(
         values=np.array([[1, 2], [3, 5]]),
@@ -158,6 +158,29 @@ def test_unique_metadata(tensor, large_tensor):
     assert target_properties == actual_properties
 
 
+def test_unique_metadata_many_blocks(real_tensor):
+    # compare with the unique entries of all the concatenated metadata
+    for names in [["system"], ["atom", "system"]]:
+        all_samples = np.concatenate(
+            [block.samples.view(names).values for block in real_tensor.blocks()]
+        )
+        expected = Labels(names, np.unique(all_samples, axis=0))
+        actual = metatensor.unique_metadata(real_tensor, "samples", names)
+        assert actual == expected
+
+        all_samples = np.concatenate(
+            [
+                block.gradient("positions").samples.view(names).values
+                for block in real_tensor.blocks()
+            ]
+        )
+        expected = Labels(names, np.unique(all_samples, axis=0))
+        actual = metatensor.unique_metadata(
+            real_tensor, "samples", names, gradient="positions"
+        )
+        assert actual == expected
+
+
 def test_unique_metadata_block_errors(real_tensor):
     message = (
         "`block` must be a metatensor TensorBlock, "
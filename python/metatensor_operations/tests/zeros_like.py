@@ -4,6 +4,15 @@ import numpy as np
 import pytest
 
 import metatensor
+from metatensor import Labels, TensorBlock, TensorMap
+
+
+try:
+    import torch
+
+    HAS_TORCH = True
+except ImportError:
+    HAS_TORCH = False
 
 
 DATA_ROOT = os.path.join(os.path.dirname(__file__), "data")
@@ -30,6 +39,76 @@ def test_zeros_like():
             assert np.all(zeros_gradient.values == np.zeros_like(gradient.values))
 
 
+def test_zeros_like_many_blocks():
+    blocks = []
+    for i in range(100):
+        block = TensorBlock(
+            values=np.full((3, 2), float(i + 1)),
+            samples=Labels.range("s", 3),
+            components=[],
+            properties=Labels.range("p", 2),
+        )
+        block.add_gradient(
+            "g",
+            TensorBlock(
+                values=np.full((3, 4, 2), float(i + 1)),
+                samples=Labels.range("sample", 3),
+                components=[Labels.range("c", 4)],
+                properties=block.properties,
+            ),
+        )
+        blocks.append(block)
+    tensor = TensorMap(Labels.range("key", 100), blocks)
+
+    for gradients in [None, [], "g"]:
+        zeros_tensor = metatensor.zeros_like(tensor, gradients=gradients)
+        assert zeros_tensor.keys == tensor.keys
+
+        for i, block in enumerate(zeros_tensor):
+            assert block.samples == tensor.block(i).samples
+            assert np.all(block.values == 0)
+            if gradients == []:
+                assert block.gradients_list() == []
+            else:
+                assert np.all(block.gradient("g").values == 0)
+
+    # the input is not modified
+    assert np.all(tensor.block(3).values == 4.0)
+
+
+@pytest.mark.skipif(not HAS_TORCH, reason="requires torch")
+def test_like_many_blocks_requires_grad():
+    blocks = []
+    for _ in range(100):
+        blocks.append(
+            TensorBlock(
+                values=torch.rand(3, 2, dtype=torch.float64, requires_grad=True),
+                samples=Labels.range("s", 3),
+                components=[],
+                properties=Labels.range("p", 2),
+            )
+        )
+    tensor = TensorMap(Labels.range("key", 100), blocks)
+
+    functions = [
+        metatensor.zeros_like,
+        metatensor.ones_like,
+        metatensor.empty_like,
+        metatensor.random_uniform_like,
+    ]
+    for function in functions:
+        result = function(tensor)
+        for block in result:
+            # the new arrays are not part of the computational graph of the input
+            assert block.values.grad_fn is None
+            assert not block.values.requires_grad
+
+        result = function(tensor, requires_grad=True)
+        for block in result:
+            assert block.values.grad_fn is None
+            assert block.values.requires_grad
+
+
 def test_zeros_like_error():
     tensor = metatensor.load(os.path.join(DATA_ROOT, "qm7-spherical-expansion.mts"))
 
@@ -48,8 +48,38 @@ def test_add(tensor_path):
     assert metatensor.torch.allclose(sum_tensor, metatensor.torch.multiply(tensor, 2))
 
 
+def test_add_inplace(tensor_path):
+    tensor = metatensor.torch.load(tensor_path)
+    expected = metatensor.torch.add(tensor, tensor)
+
+    out = metatensor.torch.empty_like(tensor)
+    assert metatensor.torch.equal(metatensor.torch.add(tensor, tensor, out=out), out)
+    assert metatensor.torch.allclose(out, expected)
+
+    values = tensor.block(0).values
+    metatensor.torch.add_(tensor, tensor)
+    assert metatensor.torch.allclose(tensor, expected)
+    assert tensor.block(0).values.data_ptr() == values.data_ptr()
+
+
+def test_add_out_is_B(tensor_path):
+    tensor = metatensor.torch.load(tensor_path)
+    A = metatensor.torch.random_uniform_like(tensor)
+    B = metatensor.torch.random_uniform_like(tensor)
+    expected = metatensor.torch.add(A, B)
+
+    result = metatensor.torch.add(A, B, out=B)
+    assert metatensor.torch.allclose(result, expected)
+    assert metatensor.torch.allclose(B, expected)
+
+
 def test_save_load():
     with io.BytesIO() as buffer:
         torch.jit.save(metatensor.torch.add, buffer)
         buffer.seek(0)
         torch.jit.load(buffer)
+
+    with io.BytesIO() as buffer:
+        torch.jit.save(metatensor.torch.add_, buffer)
+        buffer.seek(0)
+        torch.jit.load(buffer)
@@ -0,0 +1,35 @@
+import io
+
+import torch
+
+import metatensor.torch
+from metatensor.torch import Labels, TensorBlock, TensorMap
+
+
+def test_components_to_properties():
+    block = TensorBlock(
+        values=torch.arange(24, dtype=torch.float64).reshape(2, 3, 4),
+        samples=Labels.range("s", 2),
+        components=[Labels.range("c", 3)],
+        properties=Labels.range("p", 4),
+    )
+    tensor = TensorMap(Labels.range("key", 1), [block])
+
+    moved = metatensor.torch.components_to_properties(tensor, "c")
+    assert metatensor.torch.equal(moved, tensor.components_to_properties("c"))
+    assert moved.block().properties.names == ["c", "p"]
+
+    result = metatensor.torch.properties_to_components(moved, "c")
+    assert metatensor.torch.equal(result, tensor)
+
+
+def test_save():
+    with io.BytesIO() as buffer:
+        torch.jit.save(metatensor.torch.components_to_properties, buffer)
+        buffer.seek(0)
+        torch.jit.load(buffer)
+
+    with io.BytesIO() as buffer:
+        torch.jit.save(metatensor.torch.properties_to_components, buffer)
+        buffer.seek(0)
+        torch.jit.load(buffer)
@@ -24,6 +24,33 @@ def test_multiply():
     assert torch.allclose(product_tensor.block(0).values, tensor.block(0).values ** 2)
 
 
+def test_multiply_inplace_autograd():
+    tensor = metatensor.torch.load(
+        os.path.join(
+            os.path.dirname(__file__),
+            "..",
+            "..",
+            "..",
+            "metatensor_operations",
+            "tests",
+            "data",
+            "qm7-power-spectrum.mts",
+        )
+    )
+    tensor = metatensor.torch.requires_grad(tensor)
+    expected = metatensor.torch.multiply(tensor, tensor)
+    (expected_grad,) = torch.autograd.grad(
+        expected.block(0).values.sum(), tensor.block(0).values
+    )
+
+    out = metatensor.torch.zeros_like(tensor)
+    metatensor.torch.multiply(tensor, tensor, out=out)
+    (grad,) = torch.autograd.grad(out.block(0).values.sum(), tensor.block(0).values)
+
+    assert metatensor.torch.allclose(out, expected)
+    assert torch.allclose(grad, expected_grad)
+
+
 def test_save():
     with io.BytesIO() as buffer:
         torch.jit.save(metatensor.torch.multiply, buffer)
@@ -62,6 +62,38 @@ def test_slice_block():
     assert torch.equal(sliced_block_properties.values, torch.tensor([[1], [4]]))
 
 
+def test_slice_labels_selection():
+    samples = Labels(
+        names=["system", "atom"],
+        values=torch.tensor([[0, 0], [0, 1], [1, 0], [1, 2], [2, 1], [3, 0]]),
+    )
+    block = metatensor.torch.block_from_array(torch.arange(12.0).reshape(6, 2))
+    block = metatensor.torch.TensorBlock(
+        values=block.values,
+        samples=samples,
+        components=[],
+        properties=block.properties,
+    )
+
+    selections = [
+        # all dimensions, in a different order and with missing entries
+        Labels(["system", "atom"], torch.tensor([[2, 1], [5, 5], [0, 0]])),
+        # a subset of the dimensions
+        Labels(["atom"], torch.tensor([[0], [2]])),
+        Labels(["atom", "system"], torch.tensor([[0, 1], [1, 0]])),
+        # nothing selected
+        Labels(["system"], torch.tensor([[8]])),
+        Labels(["system"], torch.zeros((0, 1), dtype=torch.int32)),
+    ]
+
+    for selection in selections:
+        expected = samples.select(selection)
+        sliced = metatensor.torch.slice_block(block, "samples", selection)
+
+        assert torch.equal(sliced.samples.values, samples.values[expected])
+        assert torch.equal(sliced.values, block.values[expected])
+
+
 def test_save_load():
     with io.BytesIO() as buffer:
         torch.jit.save(metatensor.torch.slice, buffer)